@@ -0,0 +1,162 @@
+# ================================
+# batch_pipeline/pipeline.py
+# ================================
+# Headless scrape -> dedupe -> match -> cover letter -> export run.
+#
+#   python -m batch_pipeline.pipeline --config batch_pipeline/config.example.json
+#
+# Jobs flow through generators and every result is handed to a streaming
+# writer (JSONL, CSV, XLSX or Parquet) as soon as it is scored, so memory
+# stays flat however many pages are pulled.
+import os
+import sys
+import json
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from job_scraper.description_enricher import enrich_descriptions
+from job_scraper.job_scraper import iter_adzuna_pages
+from job_scraper.near_duplicates import NearDuplicateIndex
+from resume_matcher.match_resume import (
+    build_match_row, compose_job_text, extract_key_requirements, extract_name, extract_strengths,
+)
+from resume_matcher.resume_extractor import extract_resume_text
+from resume_matcher.resume_profile import ResumeProfile, as_profile
+from cover_letter_generator.cover_letter import generate_cover_letter
+from excel_exporter.stream_export import export_rows
+from optimization_utils import metrics
+
+DEFAULT_CONFIG = {
+    "role": "",
+    "location": "All",
+    "job_type": "All",
+    "salary_min": 0,
+    "salary_max": 0,
+    "max_pages": 10,
+    "resume": "",
+    "output": "job_matches.jsonl",
+    "format": None,  # inferred from the output extension when not set
+    "near_duplicate_threshold": None,  # e.g. 0.8 to also drop reposts with reworded ads
+    "min_score": 0.0,
+    "full_descriptions": False,  # follow Apply Links for the untruncated job ads
+    "cover_letters": True,
+    "metrics_report": None,  # JSON run report path; a .prom file is written next to it
+}
+
+ENRICH_BATCH_SIZE = 50
+
+RESULT_COLUMNS = [
+    "Job Title", "Company", "Location", "Date Published", "Published By", "Link",
+    "Key Requirements", "Score (ATS)", "Resume Strengths", "Improvement Areas",
+    "Summary", "Applicant", "Cover Letter",
+]
+
+
+# --- Stages ---
+def iter_jobs(config):
+    for page_jobs in iter_adzuna_pages(
+        config["role"], config["location"], config["job_type"],
+        config["salary_min"], config["salary_max"], max_pages=config["max_pages"],
+    ):
+        yield from page_jobs
+
+
+def iter_unique_jobs(jobs, near_duplicate_threshold=None):
+    seen = set()
+    near_index = NearDuplicateIndex(near_duplicate_threshold) if near_duplicate_threshold else None
+    for job in jobs:
+        key = (job["Job Title"].lower(), job["Company"].lower(), job["Apply Link"])
+        if key in seen:
+            continue
+        seen.add(key)
+        if near_index is not None and near_index.add(job) is not None:
+            continue
+        yield job
+
+
+def iter_enriched_jobs(jobs, batch_size=ENRICH_BATCH_SIZE):
+    """Full descriptions, fetched concurrently batch_size jobs at a time."""
+    batch = []
+    for job in jobs:
+        batch.append(job)
+        if len(batch) >= batch_size:
+            yield from enrich_descriptions(batch)
+            batch = []
+    if batch:
+        yield from enrich_descriptions(batch)
+
+
+def iter_matches(resume, jobs, min_score=0.0, cover_letters=True):
+    profile = as_profile(resume)
+    applicant_name = extract_name(profile)
+    for job in jobs:
+        with metrics.span("batch_pipeline.match_job"):
+            key_reqs = extract_key_requirements(compose_job_text(job))
+            strengths = extract_strengths(profile, key_reqs)
+            row = build_match_row(job, profile, key_reqs, strengths, applicant_name)
+        if float(row["Score (ATS)"].rstrip("%")) < min_score:
+            continue
+        if cover_letters:
+            row["Cover Letter"] = generate_cover_letter(profile, job)
+        yield row
+
+
+# --- Run ---
+def run_pipeline(config):
+    """Run every stage as a stream; returns the number of rows written."""
+    report_path = config.get("metrics_report")
+    recorder = metrics.Recorder() if report_path else None
+
+    with metrics.recording(recorder), metrics.span("batch_pipeline.run"):
+        profile = ResumeProfile(extract_resume_text(config["resume"]))
+        jobs = iter_unique_jobs(iter_jobs(config), config["near_duplicate_threshold"])
+        if config.get("full_descriptions"):
+            jobs = iter_enriched_jobs(jobs)
+        rows = iter_matches(profile, jobs, config["min_score"], config["cover_letters"])
+        written = export_rows(rows, config["output"], RESULT_COLUMNS, config.get("format"))
+
+    if report_path:
+        report = metrics.write_json_report(report_path, metrics.run_report(recorder))
+        metrics.write_prometheus(os.path.splitext(report_path)[0] + ".prom", report)
+    return written
+
+
+def load_config(path=None, overrides=None):
+    config = dict(DEFAULT_CONFIG)
+    if path:
+        with open(path, encoding="utf-8") as fh:
+            config.update(json.load(fh))
+    config.update({k: v for k, v in (overrides or {}).items() if v is not None})
+    return config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless JobHunt batch run.")
+    parser.add_argument("--config", help="JSON config file; see DEFAULT_CONFIG for keys")
+    parser.add_argument("--role")
+    parser.add_argument("--location")
+    parser.add_argument("--job-type", dest="job_type")
+    parser.add_argument("--resume", help="Path to a .pdf or .docx resume")
+    parser.add_argument("--output", help="Output path (.jsonl, .csv, .xlsx or .parquet)")
+    parser.add_argument("--max-pages", dest="max_pages", type=int)
+    parser.add_argument("--min-score", dest="min_score", type=float)
+    parser.add_argument("--full-descriptions", dest="full_descriptions", action="store_true", default=None,
+                        help="Fetch each job's full ad from its Apply Link (slower)")
+    parser.add_argument("--no-cover-letters", dest="cover_letters", action="store_false", default=None)
+    parser.add_argument("--metrics-report", dest="metrics_report",
+                        help="Write per-stage timings to this JSON file (and a .prom file next to it)")
+    args = parser.parse_args(argv)
+
+    overrides = vars(args)
+    config = load_config(overrides.pop("config"), overrides)
+    if not config["role"] or not config["resume"]:
+        parser.error("role and resume are required (via --config or the command line)")
+
+    written = run_pipeline(config)
+    print(f"Wrote {written} matches to {config['output']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
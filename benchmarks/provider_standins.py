@@ -0,0 +1,245 @@
+# ================================
+# benchmarks/provider_standins.py
+# ================================
+# Local stand-in HTTP servers for every job provider (Adzuna, ScraperAPI's
+# Indeed pages and Browse AI), serving seeded synthetic jobs with a set
+# latency and failure rate, plus a load test of the provider fan-out:
+#
+#   python -m benchmarks.provider_standins --searches 200 --concurrency 20
+#   python -m benchmarks.provider_standins --failure-rate 0.3 --latency 0.2
+import os
+import sys
+import json
+import html
+import time
+import random
+import asyncio
+import argparse
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import generate_adzuna_jobs
+
+KINDS = ("adzuna", "indeed", "browseai")
+
+
+def _fresh(jobs, rng):
+    """Synthetic jobs re-dated into the last few days, so the age cutoff keeps them."""
+    now = datetime.utcnow()
+    for job in jobs:
+        created = now - timedelta(hours=rng.randrange(1, 24 * 7))
+        job["created"] = created.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return jobs
+
+
+def render_indeed_page(jobs):
+    """Indeed-shaped results markup (the parts parse_indeed_html reads)."""
+    cards = []
+    for job in jobs:
+        days = (datetime.utcnow() - datetime.strptime(job["created"][:10], "%Y-%m-%d")).days
+        salary = (f'<div data-testid="attribute_snippet_testid">${job["salary_min"]:,} – '
+                  f'${job["salary_max"]:,} a year</div>' if job["salary_min"] else "")
+        bullets = "".join(f"<li>{html.escape(line.lstrip('• '))}</li>"
+                          for line in job["description"].splitlines()[2:5])
+        cards.append(f"""
+<div class="cardOutline"><div class="job_seen_beacon">
+  <h2 class="jobTitle"><a class="jcs-JobTitle" href="/rc/clk?jk={job['id']}">
+    <span title="{html.escape(job['title'])}">{html.escape(job['title'])}</span></a></h2>
+  <span data-testid="company-name">{html.escape(job['company']['display_name'])}</span>
+  <div data-testid="text-location">{html.escape(job['location']['display_name'])}</div>
+  {salary}
+  <div data-testid="attribute_snippet_testid">{job['contract_time'].replace('_', ' ').title()}</div>
+  <div class="job-snippet"><ul>{bullets}</ul></div>
+  <span data-testid="myJobsStateDate">Posted {days} days ago</span>
+</div></div>""")
+    return f"<html><body><script>var jobs = [];</script><div id='mosaic'>{''.join(cards)}</div></body></html>"
+
+
+def browse_ai_task(jobs, task_id):
+    rows = [{
+        "Position": job["title"],
+        "Company": job["company"]["display_name"],
+        "Location": job["location"]["display_name"],
+        "Posted": job["created"][:10],
+        "Summary": job["description"],
+        "Link": job["redirect_url"].replace("adzuna.com.au", "example.org"),
+    } for job in jobs]
+    return {"statusCode": 200, "result": {"id": task_id, "status": "successful", "capturedLists": {"Jobs": rows}}}
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type):
+        body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _jobs_for(self, query):
+        # Each distinct search gets its own (seeded) corpus
+        seed = sum(map(ord, json.dumps(query, sort_keys=True))) + KINDS.index(self.server.kind)
+        rng = random.Random(seed)
+        return _fresh(generate_adzuna_jobs(self.server.jobs, seed=seed), rng)
+
+    def _handle(self):
+        server = self.server
+        time.sleep(server.latency)
+        server.count()
+        if server.rng.random() < server.failure_rate:
+            return self._send(503, "unavailable", "text/plain")
+
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        if server.kind == "adzuna":
+            body = json.dumps({"results": self._jobs_for(query)})
+            return self._send(200, body, "application/json")
+        if server.kind == "indeed":
+            target = parse_qs(urlsplit(query.get("url", [""])[0]).query)
+            return self._send(200, render_indeed_page(self._jobs_for(target)), "text/html; charset=utf-8")
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        task_id = parts.path.rstrip("/").rsplit("/", 1)[-1]
+        body = json.dumps(browse_ai_task(self._jobs_for(payload.get("inputParameters") or task_id), task_id))
+        return self._send(200, body, "application/json")
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class StandinServer(ThreadingHTTPServer):
+    """One provider's stand-in on a free local port, served from a daemon thread."""
+
+    daemon_threads = True
+
+    def __init__(self, kind, jobs=50, latency=0.05, failure_rate=0.0, seed=0, port=0):
+        super().__init__(("127.0.0.1", port), StandinHandler)
+        self.kind = kind
+        self.jobs = jobs
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self):
+        with self._lock:
+            self.requests += 1
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+        return False
+
+
+def standin_providers(servers, rate=1000.0, timeout=10.0, max_failures=3, reset_after=5.0):
+    """Provider instances pointed at the stand-in servers ({kind: server})."""
+    from job_scraper.providers import AdzunaProvider, BrowseAIProvider, IndeedProvider
+
+    guards = dict(rate=rate, burst=max(int(rate), 1), timeout=timeout, max_failures=max_failures,
+                  reset_after=reset_after)
+    return [
+        AdzunaProvider(search_url=servers["adzuna"].url + "/v1/api/jobs/au/search/{page}", **guards),
+        IndeedProvider(api_key="standin", api_url=servers["indeed"].url + "/", **guards),
+        BrowseAIProvider(api_key="standin", robot_id="jobs", api_url=servers["browseai"].url + "/v2",
+                         poll_interval=0.0, **guards),
+    ]
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))] if values else 0.0
+
+
+async def load_test(providers, searches=100, concurrency=10):
+    """Run `searches` fan-outs, `concurrency` at a time; per-provider latency and error stats."""
+    from job_scraper.providers import stream_provider_jobs
+
+    limit = asyncio.Semaphore(concurrency)
+    stats = {provider.name: {"latencies": [], "jobs": 0, "errors": 0} for provider in providers}
+    merged = []
+
+    async def one_search(i):
+        async with limit:
+            start = time.perf_counter()
+            total = 0
+            async for name, fresh, error in stream_provider_jobs(providers, f"Data Engineer {i}", "Sydney",
+                                                                  "Full-time", 0, 0):
+                stats[name]["latencies"].append(time.perf_counter() - start)
+                stats[name]["jobs"] += len(fresh)
+                stats[name]["errors"] += error is not None
+                total += len(fresh)
+            merged.append((time.perf_counter() - start, total))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_search(i) for i in range(searches)))
+    elapsed = time.perf_counter() - start
+    return {
+        "searches": searches,
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "searches_per_second": round(searches / elapsed, 1),
+        "merged_p50_seconds": round(_percentile([m[0] for m in merged], 50), 4),
+        "merged_p95_seconds": round(_percentile([m[0] for m in merged], 95), 4),
+        "jobs": sum(m[1] for m in merged),
+        "providers": {
+            name: {
+                "p50_seconds": round(_percentile(s["latencies"], 50), 4),
+                "p95_seconds": round(_percentile(s["latencies"], 95), 4),
+                "jobs": s["jobs"],
+                "errors": s["errors"],
+                "breaker": next(p.breaker.state for p in providers if p.name == name),
+            }
+            for name, s in stats.items()
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the provider fan-out against local stand-ins.")
+    parser.add_argument("--searches", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--jobs", type=int, default=50, help="Jobs returned per provider per search")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds each stand-in waits per request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Per-provider rate limit (calls/second)")
+    args = parser.parse_args(argv)
+
+    # Every search is distinct, so the response cache would only fill up the user's cache file
+    os.environ["JOBHUNT_HTTP_CACHE"] = "0"
+    os.environ.setdefault("JOBHUNT_COMPANY_CACHE", "0")
+
+    servers = {kind: StandinServer(kind, args.jobs, args.latency, args.failure_rate, seed=i)
+               for i, kind in enumerate(KINDS)}
+    for server in servers.values():
+        server.__enter__()
+    try:
+        providers = standin_providers(servers, rate=args.rate)
+        report = asyncio.run(load_test(providers, args.searches, args.concurrency))
+        report["requests_served"] = {kind: server.requests for kind, server in servers.items()}
+    finally:
+        for server in servers.values():
+            server.__exit__(None, None, None)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
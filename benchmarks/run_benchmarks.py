@@ -0,0 +1,268 @@
+# ================================
+# benchmarks/run_benchmarks.py
+# ================================
+# Times the hot paths on seeded synthetic corpora and compares the results
+# with a stored baseline.
+#
+#   python -m benchmarks.run_benchmarks                      # 10 / 1k / 50k jobs
+#   python -m benchmarks.run_benchmarks --sizes 10,1000      # quicker run
+#   python -m benchmarks.run_benchmarks --update-baseline    # accept current timings
+#
+# Exit status is 1 when any case is slower than baseline * (1 + tolerance).
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import platform
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_jobs, generate_resume
+
+DEFAULT_SIZES = [10, 1000, 50000]
+DEFAULT_RESUME_LINES = [40, 400]
+DEFAULT_TOLERANCE = 0.25
+# Timings this small are mostly noise; they are reported but never fail the run
+MIN_COMPARABLE_SECONDS = 0.005
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results", "latest.json")
+
+
+# --- Cases: name -> setup(corpus) returning the zero-argument callable to time ---
+def _parse_resume(corpus):
+    from resume_matcher.resume_parser import parse_resume
+    return lambda: parse_resume(corpus["resume"])
+
+
+def _extract_key_requirements(corpus):
+    from resume_matcher.job_parser import extract_key_requirements
+    descriptions = [job["Description"] for job in corpus["jobs"]]
+    return lambda: [extract_key_requirements(text) for text in descriptions]
+
+
+def _match_resume_to_jobs(corpus):
+    from resume_matcher.match_resume import match_resume_to_jobs
+    return lambda: match_resume_to_jobs(corpus["profile"], corpus["jobs_df"])
+
+
+def _match_resume_to_jobs_memoized(corpus):
+    # Every pair already scored: the cost of re-ranking an unchanged list
+    from resume_matcher.match_resume import SCORING_VERSION, match_resume_to_jobs
+    from resume_matcher.score_cache import ScoreCache
+    cache = ScoreCache(SCORING_VERSION, ":memory:")
+    match_resume_to_jobs(corpus["profile"], corpus["jobs_df"], score_cache=cache)
+    return lambda: match_resume_to_jobs(corpus["profile"], corpus["jobs_df"], score_cache=cache)
+
+
+def _generate_cover_letter(corpus):
+    from cover_letter_generator.cover_letter import generate_cover_letter
+    return lambda: [generate_cover_letter(corpus["profile"], job) for job in corpus["jobs"]]
+
+
+def _deduplicate_jobs(corpus):
+    from job_scraper.job_scraper import deduplicate_jobs
+    from job_scraper.near_duplicates import NEAR_DUPLICATE_THRESHOLD
+    return lambda: deduplicate_jobs(corpus["jobs"], near_duplicate_threshold=NEAR_DUPLICATE_THRESHOLD)
+
+
+def _job_index_search(corpus):
+    from job_scraper.job_index import JobSearchIndex, candidate_jobs
+    index = JobSearchIndex()
+    index.add_many(corpus["jobs"])
+    return lambda: candidate_jobs(index, corpus["profile"], "data architect", top_k=500)
+
+
+def _job_table(corpus):
+    from job_scraper.job_table import JobTable
+    return lambda: JobTable(corpus["jobs"])
+
+
+def _export_to_excel(corpus):
+    from excel_exporter.export_excel import export_to_excel
+    return lambda: export_to_excel(corpus["jobs_df"], sheet_name="Matched Jobs")
+
+
+def _cold_import(corpus):
+    from optimization_utils.startup import cold_import
+    return lambda: cold_import(corpus["modules"])
+
+
+# Cases sized by resume length rather than job count
+RESUME_CASES = {
+    "parse_resume": _parse_resume,
+}
+JOB_CASES = {
+    "job_parser.extract_key_requirements": _extract_key_requirements,
+    "match_resume_to_jobs": _match_resume_to_jobs,
+    "match_resume_to_jobs.memoized": _match_resume_to_jobs_memoized,
+    "generate_cover_letter": _generate_cover_letter,
+    "deduplicate_jobs": _deduplicate_jobs,
+    "job_index.candidate_jobs": _job_index_search,
+    "job_table.build": _job_table,
+    "export_to_excel": _export_to_excel,
+}
+# Sized by module count; each run is a fresh interpreter (see optimization_utils.startup)
+STARTUP_CASES = {
+    "startup.cold_import": _cold_import,
+}
+
+
+def time_call(fn, repeat):
+    """Best wall time of repeat runs (the least noisy estimate of the cost)."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_case(name, setup, corpus, size, repeat):
+    seconds = time_call(setup(corpus), repeat)
+    return {
+        "case": name,
+        "size": size,
+        "seconds": round(seconds, 6),
+        "per_item_ms": round(seconds / max(size, 1) * 1000, 6),
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, resume_lines=DEFAULT_RESUME_LINES, cases=None, repeat=3, seed=0, log=print):
+    """Run every selected case; returns the results document."""
+    from optimization_utils.startup import PIPELINE_MODULES
+    from resume_matcher.resume_profile import ResumeProfile
+
+    results = []
+    corpus = {"modules": PIPELINE_MODULES}
+    for name, setup in STARTUP_CASES.items():
+        if cases is None or name in cases:
+            results.append(run_case(name, setup, corpus, len(PIPELINE_MODULES), repeat))
+            log(f"{name:<40} {len(PIPELINE_MODULES):>7} modules{results[-1]['seconds']:>10.4f}s")
+
+    # Built once per run, as the app does, so per-job cases time only per-job work
+    profile = ResumeProfile(generate_resume(seed))
+
+    for lines in resume_lines:
+        corpus = {"resume": generate_resume(seed, lines=lines)}
+        for name, setup in RESUME_CASES.items():
+            if cases is None or name in cases:
+                results.append(run_case(name, setup, corpus, lines, repeat))
+                log(f"{name:<40} {lines:>7} lines  {results[-1]['seconds']:>10.4f}s")
+
+    for size in sizes:
+        jobs = generate_jobs(size, seed)
+        corpus = {"profile": profile, "jobs": jobs, "jobs_df": pd.DataFrame(jobs)}
+        # The biggest corpora are timed once; a single run already takes seconds
+        case_repeat = repeat if size < 10000 else 1
+        for name, setup in JOB_CASES.items():
+            if cases is None or name in cases:
+                results.append(run_case(name, setup, corpus, size, case_repeat))
+                log(f"{name:<40} {size:>7} jobs   {results[-1]['seconds']:>10.4f}s")
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+# --- Baseline comparison ---
+def result_key(result):
+    return f"{result['case']}@{result['size']}"
+
+
+def compare_to_baseline(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Per-case comparison rows; a baseline entry may carry its own "tolerance"."""
+    baseline_by_key = {result_key(r): r for r in baseline.get("results", [])}
+    rows = []
+    for result in report["results"]:
+        base = baseline_by_key.get(result_key(result))
+        if base is None:
+            rows.append({"key": result_key(result), "status": "new", "seconds": result["seconds"]})
+            continue
+        limit = base["seconds"] * (1 + base.get("tolerance", tolerance))
+        regressed = result["seconds"] > limit and result["seconds"] >= MIN_COMPARABLE_SECONDS
+        rows.append({
+            "key": result_key(result),
+            "status": "regressed" if regressed else "ok",
+            "seconds": result["seconds"],
+            "baseline": base["seconds"],
+            "limit": round(limit, 6),
+            "ratio": round(result["seconds"] / base["seconds"], 3) if base["seconds"] else None,
+        })
+    return rows
+
+
+def load_json(path):
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_json(doc, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(doc, fh, indent=2)
+        fh.write("\n")
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JobHunt performance benchmarks.")
+    parser.add_argument("--sizes", type=_int_list, default=DEFAULT_SIZES, help="Job counts, e.g. 10,1000,50000")
+    parser.add_argument("--resume-lines", dest="resume_lines", type=_int_list, default=DEFAULT_RESUME_LINES)
+    parser.add_argument("--case", dest="cases", action="append", help="Only run this case (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown over baseline, e.g. 0.25 for +25%%")
+    parser.add_argument("--update-baseline", dest="update_baseline", action="store_true",
+                        help="Write these results as the new baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    # Cases time the scoring itself, and must not fill the user's score memo
+    os.environ["JOBHUNT_SCORE_CACHE"] = "0"
+    report = run_benchmarks(args.sizes, args.resume_lines, args.cases, args.repeat, args.seed)
+    save_json(report, args.output)
+    print(f"Results written to {args.output}")
+
+    if args.update_baseline:
+        save_json(report, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against; run with --update-baseline to create one.")
+        return 0
+
+    rows = compare_to_baseline(report, load_json(args.baseline), args.tolerance)
+    for row in rows:
+        if row["status"] == "new":
+            print(f"  new        {row['key']:<48} {row['seconds']:.4f}s")
+        else:
+            print(f"  {row['status']:<10} {row['key']:<48} {row['seconds']:.4f}s "
+                  f"(baseline {row['baseline']:.4f}s, x{row['ratio']})")
+    regressions = [row for row in rows if row["status"] == "regressed"]
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than baseline by more than the tolerance.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# ================================
+# benchmarks/synthetic.py
+# ================================
+# Seeded generators for Adzuna-shaped job postings and plain-text resumes.
+# The same seed always yields the same corpus, so timings are comparable
+# across commits and machines.
+import random
+from datetime import datetime, timedelta
+
+from resume_matcher.resume_parser import (
+    CERTIFICATION_KEYWORDS, EDUCATION_KEYWORDS, FUNCTIONAL_KEYWORDS, SOFT_SKILL_KEYWORDS, TECHNICAL_KEYWORDS,
+)
+
+KEYWORD_POOL = sorted(set(
+    FUNCTIONAL_KEYWORDS + TECHNICAL_KEYWORDS + SOFT_SKILL_KEYWORDS + EDUCATION_KEYWORDS + CERTIFICATION_KEYWORDS
+))
+FILLER_WORDS = (
+    "the team will deliver across our business with a focus on outcomes and quality for clients "
+    "you will work closely alongside partners to design build support and improve platforms "
+    "experience in a fast paced environment is highly regarded along with strong ownership"
+).split()
+TITLES = [
+    "Data Architect", "Data Engineer", "Business Analyst", "Solution Architect", "Project Manager",
+    "Data Scientist", "Cloud Engineer", "Product Owner", "BI Developer", "Governance Lead",
+]
+COMPANIES = [
+    "Acme Bank", "Northwind Recruitment", "Globex Consulting", "Initech Pty Ltd", "Umbrella Health",
+    "Hays Talent", "Stark Industries", "Wayne Financial Services", "Cyberdyne Systems", "Tyrell Corp",
+]
+CATEGORIES = ["IT Jobs", "Accounting & Finance Jobs", "Consultancy Jobs", "Healthcare & Nursing Jobs", "Admin Jobs"]
+LOCATIONS = ["Sydney NSW", "Melbourne VIC", "Brisbane QLD", "Perth WA", "Adelaide SA", "Canberra ACT"]
+BASE_DATE = datetime(2025, 1, 15)
+
+
+def _sentence(rng, keyword_density, words=12):
+    """Filler sentence where each slot is a taxonomy keyword with probability keyword_density."""
+    parts = [
+        rng.choice(KEYWORD_POOL) if rng.random() < keyword_density else rng.choice(FILLER_WORDS)
+        for _ in range(words)
+    ]
+    return " ".join(parts).capitalize()
+
+
+def make_description(rng, keyword_density=0.3, bullets=8, words=12):
+    lines = ["About the role", _sentence(rng, keyword_density, words * 2) + "."]
+    lines += [f"• {_sentence(rng, keyword_density, words)}" for _ in range(bullets)]
+    return "\n".join(lines)
+
+
+def generate_adzuna_jobs(n, seed=0, keyword_density=0.3, bullets=8, duplicate_rate=0.05, max_age_days=10):
+    """n raw Adzuna results; duplicate_rate of them are reposts with a different link."""
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n):
+        if jobs and rng.random() < duplicate_rate:
+            job = dict(rng.choice(jobs))
+            job["redirect_url"] = f"https://www.adzuna.com.au/details/{seed}-{i}"
+            jobs.append(job)
+            continue
+        created = BASE_DATE - timedelta(days=rng.randrange(max_age_days), seconds=rng.randrange(86400))
+        location = rng.choice(LOCATIONS)
+        salary_min = rng.choice([None, 70000, 90000, 110000, 130000, 150000])
+        jobs.append({
+            "id": f"{seed}-{i}",
+            "title": f"{rng.choice(TITLES)} {i % 97}",
+            "company": {"display_name": rng.choice(COMPANIES)},
+            "location": {"display_name": location},
+            "created": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "contract_time": rng.choice(["full_time", "part_time"]),
+            "category": {"label": rng.choice(CATEGORIES)},
+            "salary_min": salary_min,
+            "salary_max": salary_min and salary_min + 20000,
+            "description": make_description(rng, keyword_density, bullets),
+            "redirect_url": f"https://www.adzuna.com.au/details/{seed}-{i}",
+        })
+    return jobs
+
+
+def generate_jobs(n, seed=0, **kwargs):
+    """n jobs in the scraper's normalized shape (what get_all_jobs returns)."""
+    from job_scraper.job_scraper import normalize_adzuna_job
+
+    return [normalize_adzuna_job(job, "All") for job in generate_adzuna_jobs(n, seed, **kwargs)]
+
+
+def generate_resume(seed=0, lines=40, keyword_density=0.3, words=14, name="Jordan Example"):
+    """Plain-text resume: a name line, a few headings and lines bullet points."""
+    rng = random.Random(seed)
+    headings = ["Summary", "Experience", "Skills", "Education", "Certifications"]
+    out = [name, "jordan@example.com | +61 400 000 000"]
+    per_section = max(1, lines // len(headings))
+    for heading in headings:
+        out.append(heading)
+        out += [f"• {_sentence(rng, keyword_density, words)}." for _ in range(per_section)]
+    return "\n".join(out)
@@ -2,6 +2,12 @@
 # cover_letter_generator/cover_letter.py
 # ================================
 import re
+import numpy as np
+from collections import Counter
+from scipy import sparse
+
+from optimization_utils import metrics
+from resume_matcher.resume_profile import ResumeProfile, as_profile, guess_name
 
 # --- Utility functions ---
 def extract_keywords(text):
@@ -9,34 +15,40 @@ def extract_keywords(text):
     stop_words = {"the", "and", "for", "with", "in", "of", "to", "a", "on", "as", "is", "an", "be", "this", "that"}
     return [word for word in words if word not in stop_words and len(word) > 3]
 
-def extract_candidate_name(resume_text):
-    lines = [line.strip() for line in resume_text.split('\n') if line.strip()]
-    for line in lines[:10]:
-        if 2 <= len(line.split()) <= 4 and all(w[0].isupper() for w in line.split() if w[0].isalpha()):
-            return line
-    return "Your Name"
+def extract_candidate_name(resume):
+    if isinstance(resume, ResumeProfile):
+        return resume.name or "Your Name"
+    lines = [line.strip() for line in resume.split('\n') if line.strip()]
+    return guess_name(lines) or "Your Name"
 
-def extract_strength_sentences(resume_text, job_description, max_points=5):
-    resume_lines = [line.strip().lstrip("• ") for line in resume_text.split('\n') if line.strip()]
-    job_keywords = extract_keywords(job_description)
-    scored_lines = []
+def extract_strength_sentences(resume, job_description, max_points=5):
+    profile = as_profile(resume)
+    # Repeated job keywords weigh more, as before
+    keyword_weights = Counter(extract_keywords(job_description))
 
-    for line in resume_lines:
-        score = sum(1 for kw in job_keywords if kw in line.lower())
-        if score > 0:
-            scored_lines.append((score, line.rstrip('.')))
+    # Walk the profile's token -> line index, so the cost follows the job's keywords
+    line_scores = {}
+    for keyword, weight in keyword_weights.items():
+        for line_id in profile.line_index.get(keyword, ()):
+            line_scores[line_id] = line_scores.get(line_id, 0) + weight
 
+    scored_lines = [(line_scores[line_id], profile.bullet_lines[line_id].rstrip('.')) for line_id in sorted(line_scores)]
     top_sentences = [line + '.' for _, line in sorted(scored_lines, key=lambda x: x[0], reverse=True)[:max_points]]
     return top_sentences
 
 # --- Main Cover Letter Generator ---
-def generate_cover_letter(resume_text, job):
+@metrics.timed("cover_letter_generator.generate_cover_letter")
+def generate_cover_letter(resume, job):
+    """Cover letter for one job; resume is raw text or a ResumeProfile."""
+    profile = as_profile(resume)
     job_title = job.get('Job Title') or job.get('title', 'the position')
     company = job.get('Company') or job.get('company', 'your organization')
     job_desc = job.get("Description") or job.get("description", "")
-    candidate_name = extract_candidate_name(resume_text)
-    strengths = extract_strength_sentences(resume_text, job_desc)
+    candidate_name = extract_candidate_name(profile)
+    strengths = extract_strength_sentences(profile, job_desc)
+    return render_cover_letter(job_title, company, candidate_name, strengths)
 
+def render_cover_letter(job_title, company, candidate_name, strengths):
     # Detect if it's a recruitment agency
     is_agency = any(word in company.lower() for word in ['recruit', 'agency', 'talent', 'staffing'])
 
@@ -68,3 +80,57 @@ Warm regards,
 """
 
     return letter
+
+# --- Batch Cover Letter Generator ---
+def score_resume_lines(profile, job_descriptions):
+    """(resume lines x jobs) matrix of keyword-weighted line scores, from one sparse product."""
+    vocab = {token: i for i, token in enumerate(profile.line_index)}
+
+    line_rows, line_cols = [], []
+    for token, line_ids in profile.line_index.items():
+        line_rows.extend(line_ids)
+        line_cols.extend([vocab[token]] * len(line_ids))
+    lines = sparse.csr_matrix(
+        (np.ones(len(line_rows), dtype=np.float32), (line_rows, line_cols)),
+        shape=(len(profile.bullet_lines), len(vocab)),
+    )
+
+    # Only keywords that occur somewhere in the resume can score
+    kw_rows, kw_cols, kw_weights = [], [], []
+    for job_id, job_desc in enumerate(job_descriptions):
+        for keyword, weight in Counter(extract_keywords(job_desc or "")).items():
+            token_id = vocab.get(keyword)
+            if token_id is not None:
+                kw_rows.append(token_id)
+                kw_cols.append(job_id)
+                kw_weights.append(weight)
+    keywords = sparse.csr_matrix(
+        (np.asarray(kw_weights, dtype=np.float32), (kw_rows, kw_cols)),
+        shape=(len(vocab), len(job_descriptions)),
+    )
+    return lines.dot(keywords).toarray()
+
+def top_lines_per_job(profile, line_scores, max_points=5):
+    """Same selection as extract_strength_sentences, for every job column at once."""
+    order = np.argsort(-line_scores, axis=0, kind="stable")[:max_points]
+    top = []
+    for job_id in range(line_scores.shape[1]):
+        line_ids = [i for i in order[:, job_id] if line_scores[i, job_id] > 0]
+        top.append([profile.bullet_lines[i].rstrip('.') + '.' for i in line_ids])
+    return top
+
+@metrics.timed("cover_letter_generator.generate_cover_letters")
+def generate_cover_letters(resume, jobs, max_points=5):
+    """Cover letters for many jobs; resume lines are scored against every job in one pass."""
+    profile = as_profile(resume)
+    jobs = list(jobs)
+    descriptions = [job.get("Description") or job.get("description", "") for job in jobs]
+    strengths_per_job = top_lines_per_job(profile, score_resume_lines(profile, descriptions), max_points)
+    candidate_name = extract_candidate_name(profile)
+
+    letters = []
+    for job, strengths in zip(jobs, strengths_per_job):
+        job_title = job.get('Job Title') or job.get('title', 'the position')
+        company = job.get('Company') or job.get('company', 'your organization')
+        letters.append(render_cover_letter(job_title, company, candidate_name, strengths))
+    return letters
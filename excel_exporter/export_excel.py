@@ -4,11 +4,19 @@
 import pandas as pd
 from io import BytesIO
 
-def export_to_excel(job_data):
-    df = pd.DataFrame(job_data)
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False)
-    output.seek(0)
-    return output
+from excel_exporter.stream_export import XlsxStreamWriter
+from optimization_utils import metrics
+
+def export_to_excel(job_data, sheet_name="Sheet1"):
+    # Rows are streamed through a write-only workbook instead of a full cell grid
+    with metrics.span("excel_exporter.export_to_excel") as span:
+        df = job_data if isinstance(job_data, pd.DataFrame) else pd.DataFrame(job_data)
+        output = BytesIO()
+        writer = XlsxStreamWriter(output, [str(col) for col in df.columns], sheet_name=sheet_name)
+        for values in df.itertuples(index=False, name=None):
+            writer.write(dict(zip(writer.columns, values)))
+        writer.close()
+        span.add(rows=len(df), bytes=output.tell())
+        output.seek(0)
+        return output
 
@@ -9,9 +9,21 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import streamlit as st
 import time
 import html
+import json
+
+from job_scraper.facets import FACETS, FacetIndex
+from optimization_utils import metrics
+from optimization_utils.startup import PIPELINE_MODULES, UI_MODULES, preload
+from frontend_ui.results_view import (
+    SORT_COLUMNS, add_sort_keys, filter_results, format_timings, page_count, page_slice, render_page_html,
+    sort_results,
+)
 
 # Set config first
 st.set_page_config(layout="wide")
+# Heavy modules load in the background while the form is filled in; with a pipeline
+# worker (JOBHUNT_WORKER, see frontend_ui.worker) this process only needs the UI ones
+preload(UI_MODULES if os.environ.get("JOBHUNT_WORKER") else PIPELINE_MODULES)
 
 # === Title and CSS ===
 st.markdown("""
@@ -77,6 +89,23 @@ with col5:
 with col6:
     max_salary = st.number_input("💲 Max Salary", value=200000, step=1000, key="max_salary")
 
+# Indeed and Browse AI are offered once their API keys are set (see job_scraper.providers)
+sources = None
+if os.environ.get("SCRAPER_API_KEY") or os.environ.get("BROWSE_AI_API_KEY"):
+    from job_scraper.providers import available_providers
+
+    sources = st.multiselect("🔌 Job Sources", available_providers(), default=["adzuna"], key="sources")
+
+col_progressive, col_full, col_letters, col_debug = st.columns(4)
+with col_progressive:
+    progressive = st.checkbox("⚡ Show matches progressively while jobs are fetched", value=False, key="progressive")
+with col_full:
+    full_descriptions = st.checkbox("📄 Fetch full job descriptions (slower)", value=False, key="full_descriptions")
+with col_letters:
+    eager_letters = st.checkbox("✉️ Write cover letters for every job up front (slower)", value=False, key="eager_letters")
+with col_debug:
+    debug_metrics = st.checkbox("🛠️ Record debug metrics", value=metrics.is_enabled(), key="debug_metrics")
+
 col_run, col_reset = st.columns([1, 1])
 with col_run:
     run_button = st.button("🚀 Run Agent")
@@ -87,84 +116,112 @@ if reset_button:
     st.session_state.clear()
     st.rerun()
 
+# Format cover letter with first 5 lines visible, rest collapsible
+def format_cover_letter(text):
+    lines = text.split("\n")
+    visible = lines[:5]
+    hidden = lines[5:]
+    visible_html = "<div style='white-space: pre-wrap; font-family: Arial; font-size: 13px;'>" + "<br>".join(html.escape(line) for line in visible) + "</div>"
+    if hidden:
+        hidden_html = "<div style='white-space: pre-wrap; font-family: Arial; font-size: 13px; margin-top: 5px;'>" + "<br>".join(html.escape(line) for line in hidden) + "</div>"
+        return f"{visible_html}<details><summary>Show full letter</summary>{hidden_html}</details>"
+    return visible_html
+
+def ensure_cover_letters(row_ids):
+    """Generate (in one batch) the cover letters of the given result rows that are not cached yet."""
+    from cover_letter_generator.cover_letter import generate_cover_letters
+
+    cache = st.session_state.setdefault("cover_letters", {})
+    missing = [i for i in row_ids if i not in cache]
+    if missing:
+        jobs = st.session_state.jobs
+        # Lazy letters count towards the metrics of the run they belong to
+        with metrics.recording(st.session_state.get("run_metrics")):
+            letters = generate_cover_letters(st.session_state.resume_profile, (jobs[i] for i in missing))
+        cache.update(zip(missing, letters))
+    return [cache[i] for i in row_ids]
+
+def build_excel(results_df):
+    from excel_exporter.export_excel import export_to_excel
+
+    export_df = results_df.drop(columns=["_score"], errors="ignore")
+    export_df["Cover Letter"] = ensure_cover_letters(list(results_df.index))
+    with metrics.recording(st.session_state.get("run_metrics")):
+        return export_to_excel(export_df)
+
 if run_button:
     if not uploaded_file:
         st.warning("⚠️ Please upload your resume before running the agent.")
     elif not role:
         st.warning("⚠️ Please enter a target role before running the agent.")
     else:
-        with st.spinner("🔍 Searching for matching jobs..."):
-            import docx2txt
-            import pdfplumber
-            import fitz
-            import pandas as pd
-
-            from job_scraper.job_scraper import get_all_jobs
-            from resume_matcher.match_resume import match_resume_to_jobs
-            from cover_letter_generator.cover_letter import generate_cover_letter
-            from excel_exporter.export_excel import export_to_excel
-
-            def extract_resume_text(file):
-                if file.name.endswith(".docx"):
-                    return docx2txt.process(file)
-                elif file.name.endswith(".pdf"):
-                    try:
-                        with pdfplumber.open(file) as pdf:
-                            return " ".join([page.extract_text() for page in pdf.pages if page.extract_text()])
-                    except:
-                        file.seek(0)
-                        with fitz.open(stream=file.read(), filetype="pdf") as doc:
-                            return " ".join([page.get_text() for page in doc])
-                return ""
-
-            resume_text = extract_resume_text(uploaded_file)
-            jobs_df = pd.DataFrame(get_all_jobs(role, location, industry, job_type, min_salary, max_salary))
-
-            if jobs_df.empty:
-                st.warning("No jobs found. Please refine your criteria.")
+        # Each run records into its own recorder, kept in the session for the debug panel
+        st.session_state.run_metrics = metrics.Recorder() if debug_metrics else None
+
+        from job_scraper.job_table import JobTable
+
+        search_error = None
+        with metrics.recording(st.session_state.run_metrics):
+            if progressive:
+                # Page-by-page redraws need this process's Streamlit session, so this mode never uses the worker
+                from frontend_ui.progressive import run_progressive_search
+                from job_scraper.prefetch import start_prefetcher
+                from resume_matcher.resume_extractor import ResumeError, extract_resume_text
+                from resume_matcher.resume_profile import ResumeProfile
+
+                stage_start = time.perf_counter()
+                try:
+                    # Built once; reused by the matcher and every cover letter
+                    resume_profile = ResumeProfile(extract_resume_text(uploaded_file))
+                except ResumeError as e:
+                    search_error = str(e)
+                else:
+                    timings = {"resume": time.perf_counter() - stage_start}
+                    # Once per process: keeps the searches users run most often warm between runs
+                    start_prefetcher()
+
+                    jobs_df, matched_jobs, timings = run_progressive_search(
+                        resume_profile, role, location, job_type, min_salary, max_salary, industry=industry,
+                        timings=timings, full_descriptions=full_descriptions, providers=sources,
+                    )
             else:
-                matched_jobs = match_resume_to_jobs(resume_text, jobs_df)
-
-                # Format cover letter with first 5 lines visible, rest collapsible
-                def format_cover_letter(text):
-                    lines = text.split("\n")
-                    visible = lines[:5]
-                    hidden = lines[5:]
-                    visible_html = "<div style='white-space: pre-wrap; font-family: Arial; font-size: 13px;'>" + "<br>".join(html.escape(line) for line in visible) + "</div>"
-                    if hidden:
-                        hidden_html = "<div style='white-space: pre-wrap; font-family: Arial; font-size: 13px; margin-top: 5px;'>" + "<br>".join(html.escape(line) for line in hidden) + "</div>"
-                        return f"{visible_html}<details><summary>Show full letter</summary>{hidden_html}</details>"
-                    return visible_html
-
-                matched_jobs["Cover Letter"] = matched_jobs.apply(
-                    lambda row: format_cover_letter(generate_cover_letter(resume_text, row.to_dict())), axis=1
-                )
-
-                # The Key Requirements, Resume Strengths, Improvement Areas, Summary are already bullet-formatted with capitals in match_resume.py, so display as HTML
-                display_cols = [
-                    "Job Title", "Company", "Location", "Date Published", "Published By",
-                    "Key Requirements", "Score (ATS)", "Resume Strengths", "Improvement Areas",
-                    "Summary", "Apply", "Cover Letter"
-                ]
-                display_cols = [col for col in display_cols if col in matched_jobs.columns]
-
-                # Apply safe HTML render for bullet fields
-                def safe_html(val):
-                    if pd.isna(val):
-                        return ""
-                    return val.replace("\n", "<br>").replace("•", "&#8226;")  # Ensure bullets render nicely
-
-                for col in ["Key Requirements", "Resume Strengths", "Improvement Areas", "Summary"]:
-                    if col in matched_jobs.columns:
-                        matched_jobs[col] = matched_jobs[col].apply(safe_html)
-
-                # Prepare "Apply" column with clickable links
-                matched_jobs["Apply"] = matched_jobs["Link"].apply(
-                    lambda link: f'<a href="{link}" target="_blank" rel="noopener noreferrer">Apply</a>' if pd.notna(link) and str(link).startswith("http") else "-"
-                )
-
-                st.session_state.matched_jobs = matched_jobs
-                st.session_state.excel_file = export_to_excel(matched_jobs)
+                from frontend_ui.worker import WorkerError, run_search
+                from resume_matcher.resume_extractor import ResumeError
+
+                try:
+                    with st.spinner("🔍 Searching for matching jobs..."):
+                        resume_profile, jobs_df, matched_jobs, timings = run_search(
+                            uploaded_file.getvalue(), uploaded_file.name, role, location, industry, job_type,
+                            min_salary, max_salary, full_descriptions=full_descriptions, providers=sources,
+                        )
+                except (ResumeError, WorkerError) as e:
+                    search_error = str(e)
+
+        if search_error:
+            st.error(f"❌ {search_error}")
+        elif jobs_df.empty:
+            st.warning("No jobs found. Please refine your criteria.")
+        else:
+            # Cover letters: all at once in one batch only when asked for, otherwise on demand below
+            st.session_state.resume_profile = resume_profile
+            # Kept for the whole session, so compactly: matched_jobs' index is the row number
+            st.session_state.jobs = JobTable(jobs_df.to_dict("records"))
+            st.session_state.facet_index = FacetIndex(st.session_state.jobs)
+            # Widget state of the last search: its row ids point into the old JobTable
+            for facet in FACETS:
+                st.session_state.pop(f"facet_{facet}", None)
+            st.session_state.pop("cover_letter_jobs", None)
+            st.session_state.results_page = 1
+            st.session_state.cover_letters = {}
+            if eager_letters:
+                stage_start = time.perf_counter()
+                ensure_cover_letters(list(matched_jobs.index))
+                timings["cover letters"] = time.perf_counter() - stage_start
+
+            # Raw text is kept; HTML is only produced for the rows on the visible page
+            st.session_state.matched_jobs = add_sort_keys(matched_jobs)
+            st.session_state.excel_file = build_excel(st.session_state.matched_jobs) if eager_letters else None
+            st.session_state.stage_timings = timings
 
 if st.session_state.get("matched_jobs") is not None:
     df = st.session_state.matched_jobs
@@ -172,31 +229,93 @@ if st.session_state.get("matched_jobs") is not None:
     col_msg, col_dl = st.columns([6, 1])
     with col_msg:
         st.success(f"✅ Found {len(df)} matching jobs!")
+        if st.session_state.get("stage_timings"):
+            st.caption("⏱️ " + format_timings(st.session_state.stage_timings))
     with col_dl:
-        st.download_button(
-            label="📅 Download Excel",
-            data=st.session_state.excel_file,
-            file_name="JobMatches.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            key="download-excel"
-        )
+        if st.session_state.get("excel_file") is None:
+            # The export carries every cover letter, so it is only built when asked for
+            if st.button("📅 Prepare Excel", key="prepare-excel"):
+                st.session_state.excel_file = build_excel(df)
+                st.rerun()
+        else:
+            st.download_button(
+                label="📅 Download Excel",
+                data=st.session_state.excel_file,
+                file_name="JobMatches.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                key="download-excel"
+            )
 
     st.markdown("### 📝 Matched Jobs")
 
-    display_cols = [
-        "Job Title", "Company", "Location", "Date Published", "Published By",
-        "Key Requirements", "Score (ATS)", "Resume Strengths", "Improvement Areas",
-        "Summary", "Apply", "Cover Letter"
-    ]
-    display_cols = [col for col in display_cols if col in df.columns]
+    # Server-side filter and sort, then render one page
+    col_q, col_min, col_sort, col_asc = st.columns([3, 2, 2, 1])
+    with col_q:
+        query = st.text_input("🔎 Filter", placeholder="Title, company or location", key="results_query")
+    with col_min:
+        min_score = st.slider("Min score (%)", 0, 100, 0, key="results_min_score")
+    with col_sort:
+        sort_by = st.selectbox("Sort by", list(SORT_COLUMNS), key="results_sort")
+    with col_asc:
+        ascending = st.checkbox("Ascending", key="results_ascending")
+
+    # Facets answer from the bitmaps built at search time; counts reflect the other facets' picks
+    facet_index = st.session_state.get("facet_index")
+    if facet_index is not None and len(facet_index):
+        selections = {facet: st.session_state.get(f"facet_{facet}", []) for facet in FACETS}
+        counts = facet_index.counts(selections)
+        with st.expander("🧭 Refine", expanded=any(selections.values())):
+            facet_cols = st.columns(len(FACETS))
+            for col, facet in zip(facet_cols, FACETS):
+                with col:
+                    st.multiselect(
+                        facet, facet_index.values(facet), key=f"facet_{facet}",
+                        format_func=lambda value, facet=facet: f"{value} ({counts[facet].get(value, 0)})",
+                    )
+        selections = {facet: st.session_state.get(f"facet_{facet}", []) for facet in FACETS}
+        df = df[facet_index.mask(selections)[df.index.to_numpy()]]
+
+    view = sort_results(filter_results(df, query, min_score), sort_by, ascending)
+
+    col_size, col_page, col_info = st.columns([1, 1, 4])
+    with col_size:
+        page_size = st.selectbox("Rows per page", [10, 25, 50, 100], key="results_page_size")
+    pages = page_count(len(view), page_size)
+    if st.session_state.get("results_page", 1) > pages:
+        st.session_state.results_page = pages
+    with col_page:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key="results_page")
+    page_df = page_slice(view, page, page_size)
+    with col_info:
+        first_row = (page - 1) * page_size + 1 if len(view) else 0
+        st.caption(f"Showing {first_row}–{first_row + len(page_df) - 1 if len(view) else 0} of {len(view)} jobs")
 
-    # Use st.write with unsafe_allow_html=True to render formatted bullets and links
-    safe_df = df[display_cols].copy()
+    letters = st.session_state.get("cover_letters", {})
+    letter_html = (lambda row_id: format_cover_letter(letters[row_id]) if row_id in letters else "") if letters else None
+    st.write(render_page_html(page_df, letter_html), unsafe_allow_html=True)
 
-    # Escape text columns except those with HTML formatting
-    html_cols = ["Key Requirements", "Resume Strengths", "Improvement Areas", "Summary", "Apply", "Cover Letter"]
-    for col in safe_df.columns:
-        if col not in html_cols:
-            safe_df[col] = safe_df[col].astype(str).apply(lambda x: html.escape(x))
+    # Cover letters are generated lazily, only for the jobs picked here
+    st.markdown("### ✉️ Cover Letters")
+    job_labels = {i: f"{df.at[i, 'Job Title']} – {df.at[i, 'Company']} ({df.at[i, 'Score (ATS)']})" for i in df.index}
+    selected_rows = st.multiselect(
+        "Write cover letters for", list(view.index), format_func=job_labels.get, key="cover_letter_jobs"
+    )
+    for row_id, letter in zip(selected_rows, ensure_cover_letters(selected_rows)):
+        with st.expander(job_labels[row_id], expanded=True):
+            st.text(letter)
 
-    st.write(safe_df.to_html(escape=False, index=False), unsafe_allow_html=True)
+    if debug_metrics and st.session_state.get("run_metrics") is not None:
+        # Spans, counters and cache hit rates of the last run (lazy letters and exports included)
+        report = metrics.run_report(st.session_state.run_metrics)
+        with st.expander("🛠️ Debug metrics"):
+            st.dataframe(
+                [{"stage": name, **stats} for name, stats in report["spans"].items()], use_container_width=True
+            )
+            st.json({"counters": report["counters"], "cache_hit_rates": report["cache_hit_rates"]})
+            col_json, col_prom = st.columns(2)
+            with col_json:
+                st.download_button("Run report (JSON)", json.dumps(report, indent=2), file_name="run_report.json",
+                                   mime="application/json", key="download-metrics-json")
+            with col_prom:
+                st.download_button("Prometheus metrics", metrics.to_prometheus(report), file_name="jobhunt.prom",
+                                   mime="text/plain", key="download-metrics-prom")
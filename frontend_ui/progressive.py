@@ -0,0 +1,92 @@
+# ================================
+# frontend_ui/progressive.py
+# ================================
+# Progressive search: every batch of jobs (an Adzuna page, or the merged
+# provider or job store results) is filtered, deduplicated and scored as soon
+# as it arrives, and a running top-k table is redrawn in place.
+import time
+import heapq
+import pandas as pd
+import streamlit as st
+
+from batch_pipeline.pipeline import iter_matches, iter_unique_jobs
+from frontend_ui.results_view import add_sort_keys, format_timings, render_page_html
+from job_scraper.description_enricher import enrich_descriptions
+from job_scraper.job_scraper import filter_industry, iter_job_batches, split_providers
+from resume_matcher.match_resume import sort_by_score
+
+PROGRESSIVE_MAX_PAGES = 10
+RUNNING_TOP_K = 10
+
+
+def _score(row):
+    return float(row["Score (ATS)"].rstrip("%"))
+
+
+def run_progressive_search(profile, role, location, job_type, salary_min, salary_max, industry=None,
+                           max_pages=PROGRESSIVE_MAX_PAGES, top_k=RUNNING_TOP_K, timings=None,
+                           full_descriptions=False, providers=None, store=None):
+    """Fetch, dedupe and score batch by batch, redrawing progress and the top_k table in place.
+
+    Jobs come from the same source collect_jobs would use for providers and
+    store, and are filtered by industry before they are enriched or scored.
+    Returns (jobs_df, matched_jobs, timings); matched_jobs' index points into jobs_df.
+    """
+    timings = dict(timings or {})
+    timings.update({"fetch": 0.0, "match": 0.0})
+    progress = st.progress(0.0, text="Fetching the first page of jobs...")
+    status = st.empty()
+    table = st.empty()
+
+    jobs = []
+    rows = []
+    pages_done = 0
+    # Adzuna answers page by page, or in one batch from the job store; other providers add one batch
+    use_adzuna, others = split_providers(providers)
+    pages_expected = (0 if not use_adzuna else 1 if store is not None else max_pages) + (1 if others else 0)
+    started = time.perf_counter()
+
+    def redraw():
+        timings["match"] = time.perf_counter() - started - timings["fetch"]
+        progress.progress(min(pages_done / pages_expected, 1.0),
+                          text=f"Scored {len(rows)} jobs from {pages_done} page(s)...")
+        status.caption(format_timings(timings))
+        top = heapq.nlargest(top_k, range(len(rows)), key=lambda i: (_score(rows[i]), -i))
+        if top:
+            top_df = add_sort_keys(pd.DataFrame([rows[i] for i in top], index=top))
+            table.write(render_page_html(top_df), unsafe_allow_html=True)
+
+    def job_stream():
+        nonlocal pages_done
+        pages = iter_job_batches(role, location, job_type, salary_min, salary_max, max_pages=max_pages,
+                                 store=store, providers=providers)
+        while True:
+            fetch_start = time.perf_counter()
+            page_jobs = next(pages, None)
+            if page_jobs is not None:
+                page_jobs = filter_industry(page_jobs, industry)
+            if page_jobs and full_descriptions:
+                page_jobs = enrich_descriptions(page_jobs)
+            timings["fetch"] += time.perf_counter() - fetch_start
+            if page_jobs is None:
+                return
+            yield from page_jobs
+            # Downstream has scored the whole page by the time control returns here
+            pages_done += 1
+            redraw()
+
+    def collect(unique_jobs):
+        for job in unique_jobs:
+            jobs.append(job)
+            yield job
+
+    for row in iter_matches(profile, collect(iter_unique_jobs(job_stream())), cover_letters=False):
+        rows.append(row)
+
+    progress.progress(1.0, text=f"Done: scored {len(rows)} jobs from {pages_done} page(s).")
+    status.caption(format_timings(timings))
+    table.empty()
+
+    if not rows:
+        return pd.DataFrame(), pd.DataFrame(), timings
+    return pd.DataFrame(jobs), sort_by_score(pd.DataFrame(rows)), timings
@@ -0,0 +1,93 @@
+# ================================
+# frontend_ui/results_view.py
+# ================================
+# Server-side filter / sort / paginate for the matched jobs table. Only the
+# rows of the visible page are escaped and turned into HTML.
+import html
+import math
+
+from optimization_utils.startup import lazy_module
+
+# Lazy: the app imports this module for its first screen, before there are any results
+pd = lazy_module("pandas")
+
+DISPLAY_COLS = [
+    "Job Title", "Company", "Location", "Date Published", "Published By",
+    "Key Requirements", "Score (ATS)", "Resume Strengths", "Improvement Areas",
+    "Summary", "Apply", "Cover Letter"
+]
+BULLET_COLS = ["Key Requirements", "Resume Strengths", "Improvement Areas", "Summary"]
+SEARCH_COLS = ["Job Title", "Company", "Location", "Published By"]
+SORT_COLUMNS = {
+    "Score (ATS)": "_score",
+    "Date Published": "Date Published",
+    "Job Title": "Job Title",
+    "Company": "Company",
+}
+
+
+def add_sort_keys(df):
+    """Numeric score column used for sorting and filtering, computed once per run."""
+    df = df.copy()
+    df["_score"] = pd.to_numeric(df["Score (ATS)"].astype(str).str.rstrip("%"), errors="coerce").fillna(0.0)
+    return df
+
+
+def filter_results(df, query="", min_score=0.0):
+    mask = df["_score"] >= min_score
+    query = (query or "").strip().lower()
+    if query:
+        text_mask = pd.Series(False, index=df.index)
+        for col in SEARCH_COLS:
+            if col in df.columns:
+                text_mask |= df[col].astype(str).str.lower().str.contains(query, regex=False)
+        mask &= text_mask
+    return df[mask]
+
+
+def sort_results(df, sort_by="Score (ATS)", ascending=False):
+    return df.sort_values(by=SORT_COLUMNS.get(sort_by, "_score"), ascending=ascending, kind="stable")
+
+
+def format_timings(timings):
+    return " · ".join(f"{stage}: {seconds:.2f}s" for stage, seconds in timings.items())
+
+
+def page_count(total_rows, page_size):
+    return max(1, math.ceil(total_rows / page_size))
+
+
+def page_slice(df, page, page_size):
+    """Rows of a 1-based page."""
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]
+
+
+# --- HTML for the visible page only ---
+def bullets_html(val):
+    if pd.isna(val):
+        return ""
+    return html.escape(str(val)).replace("\n", "<br>").replace("•", "&#8226;")  # Ensure bullets render nicely
+
+
+def apply_link_html(link):
+    if pd.notna(link) and str(link).startswith("http"):
+        return f'<a href="{html.escape(str(link), quote=True)}" target="_blank" rel="noopener noreferrer">Apply</a>'
+    return "-"
+
+
+def render_page_html(page_df, cover_letter_html=None):
+    """HTML table of one page; cover_letter_html(row_id) supplies the optional letter cells."""
+    page_df = page_df.copy()
+    page_df["Apply"] = [apply_link_html(link) for link in page_df.get("Link", pd.Series("", index=page_df.index))]
+    if cover_letter_html is not None:
+        page_df["Cover Letter"] = [cover_letter_html(row_id) for row_id in page_df.index]
+
+    cols = [col for col in DISPLAY_COLS if col in page_df.columns]
+    html_cols = {"Apply", "Cover Letter"}
+    for col in cols:
+        if col in BULLET_COLS:
+            page_df[col] = page_df[col].map(bullets_html)
+        elif col not in html_cols:
+            page_df[col] = page_df[col].map(lambda x: html.escape(str(x)))
+    return page_df[cols].to_html(escape=False, index=False)
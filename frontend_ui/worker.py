@@ -0,0 +1,235 @@
+# ================================
+# frontend_ui/worker.py
+# ================================
+# Optional pre-warmed pipeline worker. Started next to the app, e.g. from the
+# container entrypoint so it is warm before the first user connects:
+#
+#   python -m frontend_ui.worker --address 127.0.0.1:8765 &
+#   JOBHUNT_WORKER=127.0.0.1:8765 streamlit run frontend_ui/app.py
+#
+# it imports the whole pipeline up front and then runs the searches the app
+# hands over: resume extraction, job fetch and matching. Without
+# JOBHUNT_WORKER, or while the worker cannot be reached, run_search runs the
+# same pipeline in the app's own process.
+#
+# Connections are authenticated with JOBHUNT_WORKER_KEY, or else a random key
+# the worker writes to <data dir>/worker.key for the app to read. Metrics of
+# a search are recorded per call and sent back with its results.
+import os
+import sys
+import time
+import secrets
+import logging
+import argparse
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from optimization_utils import metrics
+from optimization_utils.startup import PIPELINE_MODULES, warm_up
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.environ.get("JOBHUNT_DATA_DIR", os.path.join(os.path.expanduser("~"), ".jobhunt"))
+KEY_PATH = os.path.join(DATA_DIR, "worker.key")
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+# A search with full descriptions can take minutes; past this the app gives up on the worker
+WORKER_TIMEOUT_SECONDS = 10 * 60
+
+
+class WorkerError(RuntimeError):
+    pass
+
+
+# --- Pipeline ---
+def search_pipeline(resume_bytes, filename, role, location, industry, job_type, salary_min, salary_max,
+                    full_descriptions=False, providers=None, record_metrics=False):
+    """Resume -> profile -> jobs -> matches in this process.
+
+    Returns (resume_profile, jobs_df, matched_jobs, timings, report);
+    matched_jobs is None when no jobs were found and report is the call's
+    metrics run report, or None unless record_metrics.
+    """
+    recorder = metrics.Recorder() if record_metrics else None
+    with metrics.recording(recorder):
+        result = _search(resume_bytes, filename, role, location, industry, job_type, salary_min, salary_max,
+                         full_descriptions, providers)
+    return (*result, metrics.run_report(recorder) if recorder else None)
+
+
+def _search(resume_bytes, filename, role, location, industry, job_type, salary_min, salary_max,
+            full_descriptions, providers):
+    import pandas as pd
+
+    from job_scraper.job_scraper import get_all_jobs
+    from job_scraper.prefetch import start_prefetcher
+    from resume_matcher.match_resume import match_resume_to_jobs
+    from resume_matcher.resume_extractor import extract_resume_text
+    from resume_matcher.resume_profile import ResumeProfile
+
+    stage_start = time.perf_counter()
+    # Built once; reused by the matcher and every cover letter
+    resume_profile = ResumeProfile(extract_resume_text(resume_bytes, filename=filename))
+    timings = {"resume": time.perf_counter() - stage_start}
+    # Once per process: keeps the searches users run most often warm between runs
+    start_prefetcher()
+
+    stage_start = time.perf_counter()
+    jobs_df = pd.DataFrame(get_all_jobs(role, location, industry, job_type, salary_min, salary_max,
+                                        full_descriptions=full_descriptions, providers=providers))
+    timings["fetch"] = time.perf_counter() - stage_start
+
+    stage_start = time.perf_counter()
+    matched_jobs = match_resume_to_jobs(resume_profile, jobs_df) if not jobs_df.empty else None
+    timings["match"] = time.perf_counter() - stage_start
+    return resume_profile, jobs_df, matched_jobs, timings
+
+
+COMMANDS = {"search": search_pipeline}
+
+
+# --- Keys and addresses ---
+def parse_address(address):
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def load_key(create=False):
+    """The shared authkey (bytes), or None when there is none yet and create is False."""
+    key = os.environ.get("JOBHUNT_WORKER_KEY")
+    if key:
+        return key.encode("utf-8")
+    if os.path.exists(KEY_PATH):
+        with open(KEY_PATH, encoding="utf-8") as fh:
+            return fh.read().strip().encode("utf-8")
+    if not create:
+        return None
+    os.makedirs(DATA_DIR, exist_ok=True)
+    key = secrets.token_hex(32)
+    # Readable by this user only
+    fd = os.open(KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write(key)
+    return key.encode("utf-8")
+
+
+# --- Client ---
+class WorkerClient:
+    """Hands one call at a time per connection to a running worker."""
+
+    def __init__(self, address, authkey, timeout=WORKER_TIMEOUT_SECONDS):
+        self.address = parse_address(address) if isinstance(address, str) else address
+        self.authkey = authkey
+        self.timeout = timeout
+
+    def call(self, command, **kwargs):
+        with Client(self.address, authkey=self.authkey) as conn:
+            conn.send((command, kwargs))
+            if not conn.poll(self.timeout):
+                raise WorkerError(f"Pipeline worker did not answer {command!r} within {self.timeout}s")
+            status, value = conn.recv()
+        if status != "ok":
+            raise WorkerError(value)
+        return value
+
+
+def get_worker_client():
+    """Client for the worker at JOBHUNT_WORKER, or None when no worker is configured."""
+    address = os.environ.get("JOBHUNT_WORKER")
+    if not address:
+        return None
+    key = load_key()
+    if key is None:
+        logger.warning("JOBHUNT_WORKER is set but there is no worker key yet; running searches in-process")
+        return None
+    return WorkerClient(address, key)
+
+
+def run_search(resume_bytes, filename, role, location, industry, job_type, salary_min, salary_max,
+               full_descriptions=False, providers=None):
+    """search_pipeline on the worker when one is configured and reachable, else in this process.
+
+    Returns (resume_profile, jobs_df, matched_jobs, timings); the search's
+    metrics are added to the caller's recorder, if it has one. Raises
+    WorkerError when the worker took the search but failed or timed out.
+    """
+    kwargs = dict(resume_bytes=resume_bytes, filename=filename, role=role, location=location, industry=industry,
+                  job_type=job_type, salary_min=salary_min, salary_max=salary_max,
+                  full_descriptions=full_descriptions, providers=providers,
+                  record_metrics=metrics.current_recorder() is not None)
+    client = get_worker_client()
+    result = None
+    if client is not None:
+        try:
+            result = client.call("search", **kwargs)
+        except (ConnectionError, EOFError, AuthenticationError) as e:
+            # Not started yet, restarting, died mid-search or holding another key: the app can still do the work itself
+            logger.warning("Pipeline worker unavailable (%s); running the search in-process", type(e).__name__)
+    if result is None:
+        result = search_pipeline(**kwargs)
+    *result, report = result
+    metrics.merge_report(report)
+    return tuple(result)
+
+
+# --- Server ---
+def _handle(conn):
+    # Imported here: the app imports this module before the pipeline is loaded
+    from resume_matcher.resume_extractor import ResumeError
+
+    with conn:
+        try:
+            command, kwargs = conn.recv()
+        except EOFError:
+            return
+        try:
+            result = ("ok", COMMANDS[command](**kwargs))
+        except ResumeError as e:
+            # Written for the user (e.g. a file over the size limit), so passed on as it is
+            result = ("error", str(e))
+        except Exception as e:
+            # Only the type: messages of request errors can carry API URLs with keys in them
+            logger.error("Worker call %r failed: %s", command, type(e).__name__)
+            result = ("error", f"Pipeline worker failed: {type(e).__name__}")
+        try:
+            conn.send(result)
+        except (OSError, EOFError):
+            # The app gave up (timeout or rerun) before the answer was ready
+            pass
+
+
+def serve(address=DEFAULT_ADDRESS, authkey=None, modules=PIPELINE_MODULES):
+    """Warm up, then answer calls until interrupted; each connection is served on its own thread."""
+    # The key is written first so the app can pick it up while the worker warms up
+    authkey = authkey or load_key(create=True)
+    timings = warm_up(modules)
+    logger.info("Pipeline worker warm after %.2fs", sum(timings.values()))
+    with Listener(parse_address(address), authkey=authkey) as listener:
+        logger.info("Pipeline worker listening on %s", address)
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError, AuthenticationError) as e:
+                # One bad or unauthenticated client must not stop the worker
+                logger.warning("Rejected a worker connection: %s", type(e).__name__)
+                continue
+            threading.Thread(target=_handle, args=(conn,), daemon=True).start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-warmed pipeline worker for the JobHunt app.")
+    parser.add_argument("--address", default=os.environ.get("JOBHUNT_WORKER", DEFAULT_ADDRESS),
+                        help="host:port to listen on")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        serve(args.address)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
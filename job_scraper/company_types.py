@@ -0,0 +1,296 @@
+# ================================
+# job_scraper/company_types.py
+# ================================
+# Company -> type ("Recruitment Agency", "Consulting Company", "Business")
+# with canonical company keys, one compiled matcher for every rule list, and
+# a persistent cache that survives restarts and can be corrected by hand:
+#
+#   python -m job_scraper.company_types --set "Acme Talent Pty Ltd" "Business"
+#   python -m job_scraper.company_types --list
+#
+# Several processes (app, worker, batch runs, the CLI above) share the file:
+# saves merge into what is on disk under a file lock, and a cache reloads
+# the file when another process has changed it.
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+import pandas as pd
+
+from optimization_utils import metrics
+
+DATA_DIR = os.environ.get("JOBHUNT_DATA_DIR", os.path.join(os.path.expanduser("~"), ".jobhunt"))
+DEFAULT_CACHE_PATH = os.path.join(DATA_DIR, "company_types.json")
+# How often classify() looks at the file's mtime for changes made by other processes
+RELOAD_CHECK_SECONDS = 1.0
+
+RECRUITMENT_AGENCY = "Recruitment Agency"
+CONSULTING_COMPANY = "Consulting Company"
+BUSINESS = "Business"
+UNKNOWN = "Unknown"
+
+# Known agency/company name overrides
+KNOWN_AGENCIES = [
+    "michael page", "hays", "randstad", "adecco", "manpower", "robert half",
+    "hudson", "kelly services", "peoplebank", "talent international", "aquent",
+    "workpac", "drake", "programmed", "page personnel", "chandler macleod"
+]
+KNOWN_CONSULTING = [
+    "accenture", "deloitte", "kpmg", "ey", "pwc", "capgemini", "cognizant",
+    "infosys", "tcs", "ibm", "bain", "boston consulting group", "mckinsey"
+]
+
+# Keyword-based fallback
+RECRUITMENT_KEYWORDS = [
+    "recruitment", "staffing", "talent", "hiring", "headhunter", "search", "jobs", "placement", "resourcing"
+]
+CONSULTING_KEYWORDS = [
+    "consulting", "consultants", "advisory", "strategy", "solutions", "analytics", "services"
+]
+
+# Checked in this order; the first list with a hit decides the type
+TYPE_RULES = [
+    (RECRUITMENT_AGENCY, KNOWN_AGENCIES),
+    (CONSULTING_COMPANY, KNOWN_CONSULTING),
+    (RECRUITMENT_AGENCY, RECRUITMENT_KEYWORDS),
+    (CONSULTING_COMPANY, CONSULTING_KEYWORDS),
+]
+
+# Bump when TYPE_RULES or company_key change, so "auto" cache entries are re-derived
+RULE_VERSION = 1
+
+LEGAL_SUFFIXES = {"pty", "ltd", "limited", "inc", "incorporated", "llc", "plc", "corp", "corporation", "co"}
+
+
+# --- Keys ---
+@lru_cache(maxsize=8192)
+def company_key(name):
+    """Canonical key: lower-case words without punctuation or trailing legal suffixes.
+
+    "Acme Pty. Ltd." and "ACME PTY LTD" share the key "acme".
+    """
+    words = re.sub(r"[^\w&+]+", " ", (name or "").lower()).split()
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+# --- Matching ---
+def _build_matcher():
+    rank_of = {}
+    for rank, (_, terms) in enumerate(TYPE_RULES):
+        for term in terms:
+            rank_of.setdefault(term, rank)
+    # A lookahead reports every (overlapping) start position in one scan; at a
+    # given position the higher-ranked, then longer, term wins the alternation
+    terms = sorted(rank_of, key=lambda term: (rank_of[term], -len(term)))
+    pattern = re.compile("(?=(" + "|".join(re.escape(term) for term in terms) + "))")
+    return pattern, rank_of
+
+
+_MATCHER, _RANK_OF = _build_matcher()
+
+
+def match_company_type(key):
+    """Rule-based type of a canonical key (substring rules, same precedence as TYPE_RULES)."""
+    best = len(TYPE_RULES)
+    for term in _MATCHER.findall(key):
+        best = min(best, _RANK_OF[term])
+        if best == 0:
+            break
+    return TYPE_RULES[best][0] if best < len(TYPE_RULES) else BUSINESS
+
+
+# --- Persistent cache ---
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock, across processes, on a .lock file next to path."""
+    with open(f"{path}.lock", "a+b") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_entries(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _apply_changes(entries, changes):
+    """Merge this process's changes (key -> entry, or None for forget) into entries.
+
+    An "auto" change never replaces a manual entry made elsewhere.
+    """
+    for key, entry in changes.items():
+        if entry is None:
+            entries.pop(key, None)
+        elif entry["source"] == "manual" or entries.get(key, {}).get("source") != "manual":
+            entries[key] = entry
+    return entries
+
+
+class CompanyTypeCache:
+    """company key -> {"name", "type", "source"} kept in a JSON file.
+
+    Entries with "source": "manual" are hand corrections: they always win and
+    are never overwritten by the rules. "auto" entries are re-derived once
+    RULE_VERSION changes, so rule edits take effect on the next run.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        # Changes not saved yet: key -> entry, or None for a forgotten key
+        self._changes = {}
+        self._stamp = None
+        self._next_check = 0.0
+        self.entries = {}
+        if path:
+            self._stamp = _file_stamp(path)
+            self.entries = _read_entries(path)
+
+    def reload_if_changed(self):
+        """Re-read the file when another process saved it; unsaved changes stay on top."""
+        if not self.path:
+            return
+        with self._lock:
+            stamp = _file_stamp(self.path)
+            if stamp == self._stamp:
+                return
+            self.entries = _apply_changes(_read_entries(self.path), self._changes)
+            self._stamp = stamp
+
+    def classify(self, name):
+        if not name or not isinstance(name, str):
+            return UNKNOWN
+        if self.path and time.monotonic() >= self._next_check:
+            self._next_check = time.monotonic() + RELOAD_CHECK_SECONDS
+            self.reload_if_changed()
+        key = company_key(name)
+        entry = self.entries.get(key)
+        if entry is not None and (entry.get("source") == "manual" or entry.get("rule_version") == RULE_VERSION):
+            metrics.count_cache("company_types", hit=True)
+            return entry["type"]
+        metrics.count_cache("company_types", hit=False)
+        company_type = match_company_type(key)
+        with self._lock:
+            entry = {"name": name, "type": company_type, "source": "auto", "rule_version": RULE_VERSION}
+            self.entries[key] = self._changes[key] = entry
+        return company_type
+
+    def classify_many(self, names):
+        """Types for an iterable of names; each distinct name is classified once."""
+        names = list(names)
+        types = {name: self.classify(name) for name in set(n for n in names if isinstance(n, str))}
+        self.save()
+        return [types.get(name, UNKNOWN) if isinstance(name, str) else UNKNOWN for name in names]
+
+    def classify_column(self, column):
+        """Vectorised path for a DataFrame column: classify the uniques, then map back by code."""
+        codes, uniques = pd.factorize(column, use_na_sentinel=True)
+        types = np.array(self.classify_many(uniques) + [UNKNOWN], dtype=object)
+        # Code -1 (missing) picks the trailing UNKNOWN
+        return pd.Series(types[codes], index=column.index, name=column.name)
+
+    def set_type(self, name, company_type):
+        """Hand correction for a company (by canonical key)."""
+        key = company_key(name)
+        with self._lock:
+            self.entries[key] = self._changes[key] = {"name": name, "type": company_type, "source": "manual"}
+        self.save()
+
+    def forget(self, name):
+        key = company_key(name)
+        with self._lock:
+            self.entries.pop(key, None)
+            self._changes[key] = None
+        self.save()
+
+    def save(self):
+        """Merge the unsaved changes into the file as it is now, under the file lock."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._changes:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with _file_lock(self.path):
+                # Another process may have saved since this one last read the file
+                entries = _apply_changes(_read_entries(self.path), self._changes)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as fh:
+                    json.dump(entries, fh, indent=1, sort_keys=True, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                self._stamp = _file_stamp(self.path)
+            self.entries = entries
+            self._changes = {}
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_company_cache():
+    """Process-wide cache; kept in memory only when JOBHUNT_COMPANY_CACHE=0."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            persist = os.environ.get("JOBHUNT_COMPANY_CACHE", "1") != "0"
+            _default_cache = CompanyTypeCache(DEFAULT_CACHE_PATH if persist else None)
+        return _default_cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or correct the company type cache.")
+    parser.add_argument("--list", action="store_true", help="Print every cached company and its type")
+    parser.add_argument("--set", nargs=2, metavar=("COMPANY", "TYPE"), help="Record a hand correction")
+    parser.add_argument("--forget", metavar="COMPANY", help="Drop a company so the rules decide again")
+    args = parser.parse_args(argv)
+
+    cache = get_company_cache()
+    if args.set:
+        cache.set_type(*args.set)
+    if args.forget:
+        cache.forget(args.forget)
+    if args.list or not (args.set or args.forget):
+        for key, entry in sorted(cache.entries.items()):
+            print(f"{entry['type']:<20} {entry['source']:<7} {entry['name']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
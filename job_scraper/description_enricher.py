@@ -0,0 +1,156 @@
+# ================================
+# job_scraper/description_enricher.py
+# ================================
+# Adzuna only returns the first few hundred characters of each ad. This stage
+# follows every job's Apply Link and swaps in the full description.
+#
+# Apply Links mostly point at the job board's redirector, so each one is
+# resolved first and the per-host limits apply to the site the ad is on.
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from optimization_utils import metrics
+from resume_matcher.job_parser import fetch_job_description, resolve_redirects
+
+logger = logging.getLogger(__name__)
+
+ENRICH_MAX_WORKERS = 8
+PER_HOST_LIMIT = 4
+MAX_HOST_FAILURES = 3
+# Hosts answering with these are not retried for the rest of the run
+BLOCKING_STATUSES = {401, 403, 429}
+
+
+class HostHealth:
+    """Per-host concurrency limit and circuit breaker for one enrichment run.
+
+    A host is skipped once it has failed max_failures times in a row, or at
+    once when it answers 401/403/429; its jobs keep their Adzuna description.
+    """
+
+    def __init__(self, per_host=PER_HOST_LIMIT, max_failures=MAX_HOST_FAILURES):
+        self.per_host = per_host
+        self.max_failures = max_failures
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._failures = {}
+        self._blocked = set()
+
+    def slot(self, host):
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._slots[host]
+
+    def allowed(self, host):
+        with self._lock:
+            return host not in self._blocked
+
+    def record(self, host, ok, status=None):
+        with self._lock:
+            if ok:
+                self._failures[host] = 0
+                return
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if status in BLOCKING_STATUSES or self._failures[host] >= self.max_failures:
+                if host not in self._blocked:
+                    logger.warning("Skipping %s for the rest of this run (last status: %s)", host, status)
+                self._blocked.add(host)
+
+
+def _host(url):
+    return urlsplit(url).netloc.lower()
+
+
+def _call_host(health, url, fetch):
+    """fetch(url) within url's host limits; None when the host is skipped or the call fails."""
+    host = _host(url)
+    if not health.allowed(host):
+        metrics.incr("job_scraper.enrich.skipped")
+        return None
+    with health.slot(host):
+        # Re-checked: the host may have been blocked while this job waited for a slot
+        if not health.allowed(host):
+            metrics.incr("job_scraper.enrich.skipped")
+            return None
+        try:
+            result = fetch(url)
+        except Exception as e:
+            # Any error, not only request errors: one page the parser chokes on must not end the run
+            response = getattr(e, "response", None)
+            health.record(host, ok=False, status=getattr(response, "status_code", None))
+            metrics.incr("job_scraper.enrich.failed")
+            logger.debug("Enrichment call to %s failed: %s", host, type(e).__name__)
+            return None
+    health.record(host, ok=True)
+    return result
+
+
+def _resolve_link(job, health):
+    """The URL the job's Apply Link redirects to, or None when it cannot be followed."""
+    link = job.get("Apply Link") or job.get("Link") or ""
+    if not link.startswith("http"):
+        metrics.incr("job_scraper.enrich.skipped")
+        return None
+    return _call_host(health, link, resolve_redirects)
+
+
+def _enrich_one(job, url, health):
+    """Copy of job with the full description from url, or job itself when that is not possible."""
+    full_text = _call_host(health, url, fetch_job_description)
+    if full_text is None:
+        return job
+
+    if len(full_text) <= len(job.get("Description") or ""):
+        metrics.incr("job_scraper.enrich.unchanged")
+        return job
+
+    # Imported here: job_scraper.job_scraper imports this module
+    from job_scraper.job_scraper import extract_key_requirements
+
+    metrics.incr("job_scraper.enrich.enriched")
+    return dict(job, Description=full_text, Requirements=extract_key_requirements(full_text))
+
+
+def _interleave_hosts(urls):
+    """Indexes of the URLs (None skipped) round-robin across hosts, so one slow host does not hold every worker."""
+    by_host = {}
+    for i, url in enumerate(urls):
+        if url is not None:
+            by_host.setdefault(_host(url), deque()).append(i)
+    queues = deque(by_host.values())
+    order = []
+    while queues:
+        queue = queues.popleft()
+        order.append(queue.popleft())
+        if queue:
+            queues.append(queue)
+    return order
+
+
+def enrich_descriptions(jobs, max_workers=ENRICH_MAX_WORKERS, per_host=PER_HOST_LIMIT,
+                        max_host_failures=MAX_HOST_FAILURES):
+    """Jobs (same order) with their truncated descriptions replaced by the full ad text.
+
+    Apply Links are resolved through their redirects first, then at most
+    max_workers pages are fetched at once and at most per_host from any one
+    final host. Pages go through the shared HTTP cache, are capped in size
+    and only their description element is parsed (see job_parser). A job
+    whose page cannot be fetched or parsed, or is not longer, is returned
+    unchanged and counted as a failure of its host.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return jobs
+    health = HostHealth(per_host, max_host_failures)
+    enriched = list(jobs)
+    with metrics.span("job_scraper.enrich_descriptions") as span, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        urls = list(pool.map(metrics.propagate(lambda job: _resolve_link(job, health)), jobs))
+        order = _interleave_hosts(urls)
+        for i, job in zip(order, pool.map(metrics.propagate(lambda i: _enrich_one(jobs[i], urls[i], health)), order)):
+            enriched[i] = job
+        span.add(jobs=len(jobs))
+    return enriched
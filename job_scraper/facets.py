@@ -0,0 +1,190 @@
+# ================================
+# job_scraper/facets.py
+# ================================
+# Faceted filtering over local job records. Every facet value owns a bitmap
+# (one boolean per job); a filter ORs the bitmaps of the values picked within
+# a facet and ANDs across facets, and the per-value counts shown next to each
+# option come from one bincount over the facet's value codes.
+import math
+from array import array
+
+from optimization_utils import metrics
+from optimization_utils.startup import lazy_module
+
+# Lazy: the app imports this module for its first screen, before there are any jobs to filter
+np = lazy_module("numpy")
+
+NOT_STATED = "Not stated"
+
+SALARY_BANDS = [
+    (0, 80000, "Under $80k"),
+    (80000, 120000, "$80k–$120k"),
+    (120000, 160000, "$120k–$160k"),
+    (160000, math.inf, "$160k+"),
+]
+
+JOB_TYPE_LABELS = {
+    "full_time": "Full-time",
+    "part_time": "Part-time",
+    "contract": "Contract",
+    "permanent": "Permanent",
+}
+
+
+def _salary(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return value
+
+
+def salary_band(job):
+    """Band of the top of the advertised range (or its only end)."""
+    top = _salary(job.get("Salary Max"))
+    if math.isnan(top):
+        top = _salary(job.get("Salary Min"))
+    if math.isnan(top):
+        return NOT_STATED
+    for low, high, label in SALARY_BANDS:
+        if low <= top < high:
+            return label
+    return NOT_STATED
+
+
+def job_type_label(job):
+    raw = job.get("Job Type") or ""
+    return JOB_TYPE_LABELS.get(raw, raw if raw and raw != "N/A" else NOT_STATED)
+
+
+def _text(field, missing=NOT_STATED):
+    def value(job):
+        text = job.get(field)
+        return text if isinstance(text, str) and text.strip() else missing
+    return value
+
+
+FACETS = {
+    "Location": _text("Location"),
+    "Job Type": job_type_label,
+    "Company Type": _text("Source", "Unknown"),
+    "Industry": _text("Industry", "Other"),
+    "Salary Band": salary_band,
+}
+
+
+class FacetIndex:
+    """Facet bitmaps and salary arrays over a growing list of job records.
+
+    Rows are the positions the records were added in, so for jobs_df.to_dict("records")
+    a row is also the jobs_df position (and the match results' index).
+    """
+
+    def __init__(self, jobs=(), facets=None):
+        self.facets = dict(facets or FACETS)
+        self.size = 0
+        self._codes = {facet: array("i") for facet in self.facets}
+        self._values = {facet: [] for facet in self.facets}
+        self._code_of = {facet: {} for facet in self.facets}
+        self._salary_min = array("d")
+        self._salary_max = array("d")
+        self._bitmaps = {}
+        self.add_many(jobs)
+
+    def __len__(self):
+        return self.size
+
+    # --- Building ---
+    def add(self, job):
+        for facet, value_of in self.facets.items():
+            value = value_of(job)
+            code_of = self._code_of[facet]
+            code = code_of.get(value)
+            if code is None:
+                code = code_of[value] = len(self._values[facet])
+                self._values[facet].append(value)
+            self._codes[facet].append(code)
+        self._salary_min.append(_salary(job.get("Salary Min")))
+        self._salary_max.append(_salary(job.get("Salary Max")))
+        self.size += 1
+        # Bitmaps are rebuilt on demand for the new length
+        self._bitmaps.clear()
+
+    def add_many(self, jobs):
+        for job in jobs:
+            self.add(job)
+
+    # --- Bitmaps ---
+    def values(self, facet):
+        return list(self._values[facet])
+
+    def codes(self, facet):
+        return np.frombuffer(self._codes[facet], dtype=np.int32)
+
+    def bitmap(self, facet, value):
+        code = self._code_of[facet].get(value)
+        if code is None:
+            return np.zeros(self.size, dtype=bool)
+        key = (facet, code)
+        if key not in self._bitmaps:
+            self._bitmaps[key] = self.codes(facet) == code
+        return self._bitmaps[key]
+
+    def facet_mask(self, facet, selected):
+        """Rows having any of the selected values (None when nothing is selected)."""
+        if not selected:
+            return None
+        mask = np.zeros(self.size, dtype=bool)
+        for value in selected:
+            mask |= self.bitmap(facet, value)
+        return mask
+
+    def salary_mask(self, salary_min=None, salary_max=None, include_unstated=True):
+        """Rows whose advertised range overlaps [salary_min, salary_max]."""
+        low = np.frombuffer(self._salary_min, dtype=np.float64)
+        high = np.frombuffer(self._salary_max, dtype=np.float64)
+        # A one-sided range is treated as a single figure
+        low = np.where(np.isnan(low), high, low)
+        high = np.where(np.isnan(high), low, high)
+        mask = np.ones(self.size, dtype=bool)
+        if salary_min:
+            mask &= ~(high < salary_min)
+        if salary_max:
+            mask &= ~(low > salary_max)
+        if not include_unstated:
+            mask &= ~np.isnan(low)
+        return mask
+
+    # --- Queries ---
+    def mask(self, selections=None, salary_range=None, exclude=None):
+        """Rows matching every facet selection ({facet: [values]}) and the salary range.
+
+        exclude skips one facet's own selection, which is what its counts need.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for facet, selected in (selections or {}).items():
+            if facet == exclude:
+                continue
+            facet_mask = self.facet_mask(facet, selected)
+            if facet_mask is not None:
+                mask &= facet_mask
+        if salary_range:
+            mask &= self.salary_mask(*salary_range)
+        return mask
+
+    def filter(self, selections=None, salary_range=None):
+        """Row positions matching the selections, in insertion order."""
+        with metrics.span("job_scraper.facets.filter"):
+            return np.flatnonzero(self.mask(selections, salary_range))
+
+    def counts(self, selections=None, salary_range=None):
+        """{facet: {value: count}}: each facet counted under the other facets' selections."""
+        with metrics.span("job_scraper.facets.counts"):
+            counts = {}
+            for facet in self.facets:
+                mask = self.mask(selections, salary_range, exclude=facet)
+                per_code = np.bincount(self.codes(facet)[mask], minlength=len(self._values[facet]))
+                counts[facet] = {
+                    value: int(per_code[code]) for code, value in enumerate(self._values[facet]) if per_code[code]
+                }
+            return counts
@@ -0,0 +1,211 @@
+# ================================
+# job_scraper/job_index.py
+# ================================
+# In-memory inverted index over the accumulated job records, ranked with
+# BM25. Used to narrow a large local corpus (e.g. JobStore.all_jobs()) down
+# to the few hundred best candidates before detailed ATS scoring.
+import math
+import threading
+from array import array
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from job_scraper.job_store import make_job_id
+from job_scraper.job_table import JobTable
+from optimization_utils import metrics
+from resume_matcher.keyword_matcher import tokenize
+
+# Field weights: a term in the title counts three times as much as one in the body
+FIELD_WEIGHTS = {
+    "Job Title": 3.0,
+    "Company": 1.0,
+    "Requirements": 1.5,
+    "Description": 1.0,
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+DEFAULT_TOP_K = 500
+# Long queries (whole resumes) keep only their most discriminative terms
+MAX_QUERY_TERMS = 64
+# Cached per-posting BM25 impacts are recomputed once the average length drifts this much
+IMPACT_TOLERANCE = 0.05
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have in is it its of on or our that the their this to
+was we were will with you your they them who which what when where how all any can may not also into
+about over more other such than then there these those would should could must us
+""".split())
+
+
+def index_terms(text):
+    """Lower-case word tokens worth indexing: no punctuation, stopwords or single letters."""
+    return [
+        token for token in tokenize(text)
+        if token not in STOPWORDS and (len(token) > 1 or token.isdigit() or token in ("c", "r"))
+        and (token[0].isalnum() or token[0] == "_")
+    ]
+
+
+class JobSearchIndex:
+    """Incremental BM25 index over title, company, requirements and description.
+
+    Postings are kept as typed arrays (doc ids and weighted term frequencies)
+    and read through numpy at query time, so adding jobs never rebuilds
+    anything and a query costs one vectorised pass per query term. The
+    length-normalised BM25 part of each posting is cached per term and only
+    recomputed when the term gains postings or the average length drifts.
+
+    With compact (the default) the records themselves are kept in a JobTable,
+    about a quarter of the memory of the dicts, and only the normalised
+    record fields are kept; hits are decoded back into dicts when returned.
+    """
+
+    def __init__(self, field_weights=None, k1=BM25_K1, b=BM25_B, compact=True):
+        self.field_weights = dict(field_weights or FIELD_WEIGHTS)
+        self.k1 = k1
+        self.b = b
+        self.jobs = JobTable() if compact else []
+        self.job_ids = []
+        self._doc_of_id = {}
+        self._deleted = set()
+        self._doc_lengths = array("f")
+        self._total_length = 0.0
+        self._postings = {}
+        self._impacts = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.jobs) - len(self._deleted)
+
+    # --- Building ---
+    def add(self, job, job_id=None, replace=False):
+        """Index one normalised job record; returns False if its id is already indexed (and not replaced)."""
+        job_id = job_id or make_job_id(job)
+        weighted = Counter()
+        for field, weight in self.field_weights.items():
+            for term in index_terms(job.get(field) or ""):
+                weighted[term] += weight
+        length = float(sum(weighted.values()))
+
+        with self._lock:
+            old_doc = self._doc_of_id.get(job_id)
+            if old_doc is not None:
+                if not replace:
+                    return False
+                self._deleted.add(old_doc)
+                self._total_length -= self._doc_lengths[old_doc]
+
+            doc = len(self.jobs)
+            self.jobs.append(job)
+            self.job_ids.append(job_id)
+            self._doc_of_id[job_id] = doc
+            self._doc_lengths.append(length)
+            self._total_length += length
+            for term, tf in weighted.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("i"), array("f"))
+                postings[0].append(doc)
+                postings[1].append(tf)
+        return True
+
+    def add_many(self, jobs, replace=False):
+        """Index many records; returns how many were new (or replaced)."""
+        with metrics.span("job_scraper.job_index.add_many") as span:
+            added = sum(self.add(job, replace=replace) for job in jobs)
+            span.add(jobs=added)
+        return added
+
+    @classmethod
+    def from_store(cls, store, **kwargs):
+        index = cls(**kwargs)
+        index.add_many(store.all_jobs())
+        return index
+
+    # --- Querying ---
+    def _term_impacts(self, term, docs, lengths, avg_length):
+        # Caller holds the lock
+        cached = self._impacts.get(term)
+        if cached is not None and cached[0] == len(docs) and abs(cached[1] - avg_length) <= IMPACT_TOLERANCE * avg_length:
+            return cached[2]
+        tfs = np.frombuffer(self._postings[term][1], dtype=np.float32)
+        norm = self.k1 * (1.0 - self.b + self.b * lengths[docs] / avg_length)
+        impacts = tfs * (self.k1 + 1.0) / (tfs + norm)
+        self._impacts[term] = (len(docs), avg_length, impacts)
+        return impacts
+
+    def _score(self, query_weights):
+        docs_total = len(self.jobs)
+        scores = np.zeros(docs_total, dtype=np.float32)
+        live = docs_total - len(self._deleted)
+        if not live:
+            return scores
+        lengths = np.frombuffer(self._doc_lengths, dtype=np.float32)
+        avg_length = max(self._total_length / live, 1e-9)
+
+        for term, query_weight in query_weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            docs = np.frombuffer(postings[0], dtype=np.int32)
+            idf = math.log(1.0 + (live - len(docs) + 0.5) / (len(docs) + 0.5))
+            # Each doc appears once per term, so plain fancy-index += is safe here
+            scores[docs] += (query_weight * idf) * self._term_impacts(term, docs, lengths, avg_length)
+
+        if self._deleted:
+            scores[list(self._deleted)] = 0.0
+        return scores
+
+    def _select_terms(self, query_weights, max_terms):
+        # Caller holds the lock. Ranked by query weight x idf, like "more like this" queries
+        if len(query_weights) <= max_terms:
+            return query_weights
+        live = max(len(self), 1)
+        ranked = sorted(
+            ((weight * math.log(1.0 + live / (len(self._postings[term][0]) + 0.5)), term)
+             for term, weight in query_weights.items() if term in self._postings),
+            reverse=True,
+        )
+        return {term: query_weights[term] for _, term in ranked[:max_terms]}
+
+    def search_terms(self, query_weights, top_k=DEFAULT_TOP_K, max_terms=MAX_QUERY_TERMS):
+        """[(job, score)] for the top_k documents matching weighted query terms, best first."""
+        with self._lock:
+            scores = self._score(self._select_terms(query_weights, max_terms))
+            hits = np.flatnonzero(scores > 0)
+            if len(hits) > top_k:
+                hits = hits[np.argpartition(-scores[hits], top_k - 1)[:top_k]]
+            hits = hits[np.lexsort((hits, -scores[hits]))]
+            return [(self.jobs[doc], float(scores[doc])) for doc in hits]
+
+    def search(self, query, top_k=DEFAULT_TOP_K):
+        """Best jobs for a free-text query such as a role title."""
+        return self.search_terms(Counter(index_terms(query)), top_k)
+
+    def search_resume(self, resume, top_k=DEFAULT_TOP_K):
+        """Best jobs for a whole resume (text or ResumeProfile).
+
+        Repeated resume terms get a dampened (1 + log tf) weight so a long
+        resume is not dominated by its most frequent words.
+        """
+        text = resume if isinstance(resume, str) else resume.text
+        counts = Counter(index_terms(text))
+        return self.search_terms({term: 1.0 + math.log(tf) for term, tf in counts.items()}, top_k)
+
+
+def candidate_jobs(index, resume=None, query=None, top_k=DEFAULT_TOP_K):
+    """DataFrame of the top_k indexed jobs for a resume and/or a role query, ready for ATS scoring."""
+    with metrics.span("job_scraper.job_index.candidates"):
+        weights = Counter()
+        if query:
+            # The role query is short; weight it like a handful of resume mentions
+            for term in index_terms(query):
+                weights[term] += 3.0
+        if resume is not None:
+            text = resume if isinstance(resume, str) else resume.text
+            for term, tf in Counter(index_terms(text)).items():
+                weights[term] += 1.0 + math.log(tf)
+        hits = index.search_terms(weights, top_k)
+        return pd.DataFrame([job for job, _ in hits])
@@ -2,51 +2,79 @@
 # job_scraper/job_scraper.py
 # ================================
 import re
+import time
+import logging
+import threading
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
 import pandas as pd
 
+from job_scraper.company_types import get_company_cache
+from job_scraper.description_enricher import enrich_descriptions
+from job_scraper.facets import FacetIndex
+from job_scraper.job_store import make_query_key
+from job_scraper.near_duplicates import deduplicate_near_jobs
+from job_scraper.prefetch import get_search_tracker, get_warm_cache, make_search
+from optimization_utils import metrics
+from optimization_utils.http_cache import get_default_cache
+
+logger = logging.getLogger(__name__)
+
 # --- Adzuna API credentials ---
 ADZUNA_APP_ID = "638c0962"
 ADZUNA_APP_KEY = "04681adc21daeda69c41b271627d448a"
+ADZUNA_SEARCH_URL = "https://api.adzuna.com/v1/api/jobs/au/search/{page}"
+
+# --- HTTP fetch settings ---
+JOB_MAX_AGE_DAYS = 15
+REQUEST_TIMEOUT = (5, 20)  # (connect, read) seconds
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 0.5
+# Longest Retry-After worth waiting for; a server asking for more gets an error instead
+MAX_RETRY_AFTER = 10
+
+# --- Local job store ---
+STORE_MAX_STALENESS_SECONDS = 15 * 60
 
 # --- Classify Company Type ---
 def classify_company_type(company_name: str) -> str:
-    if not company_name or not isinstance(company_name, str):
-        return "Unknown"
-
-    name = company_name.lower()
-
-    # Known agency/company name overrides
-    known_agencies = [
-        "michael page", "hays", "randstad", "adecco", "manpower", "robert half",
-        "hudson", "kelly services", "peoplebank", "talent international", "aquent",
-        "workpac", "drake", "programmed", "page personnel", "chandler macleod"
-    ]
-    known_consulting = [
-        "accenture", "deloitte", "kpmg", "ey", "pwc", "capgemini", "cognizant",
-        "infosys", "tcs", "ibm", "bain", "boston consulting group", "mckinsey"
-    ]
-
-    if any(agency in name for agency in known_agencies):
-        return "Recruitment Agency"
-    if any(consultant in name for consultant in known_consulting):
-        return "Consulting Company"
-
-    # Keyword-based fallback
-    recruitment_keywords = [
-        "recruitment", "staffing", "talent", "hiring", "headhunter", "search", "jobs", "placement", "resourcing"
-    ]
-    consulting_keywords = [
-        "consulting", "consultants", "advisory", "strategy", "solutions", "analytics", "services"
-    ]
-
-    if any(word in name for word in recruitment_keywords):
-        return "Recruitment Agency"
-    elif any(word in name for word in consulting_keywords):
-        return "Consulting Company"
-    else:
-        return "Business"
+    # Rules, canonical keys and hand corrections live in company_types
+    return get_company_cache().classify(company_name)
+
+# --- Classify Industry (the app's industry choices) ---
+INDUSTRY_CATEGORIES = {
+    "it jobs": "Technology",
+    "accounting & finance jobs": "Banking and Financial Services",
+    "healthcare & nursing jobs": "Healthcare",
+    "retail jobs": "Retail",
+    "manufacturing jobs": "Manufacturing",
+    "energy, oil & gas jobs": "Mining",
+    "consultancy jobs": "Consulting",
+}
+
+def classify_industry(category_label, company_name=""):
+    """App industry for an Adzuna category label, with company-name hints; other categories keep their label."""
+    name = (company_name or "").lower()
+    if any(word in name for word in ["government", "department of", "council", "commonwealth", "public service"]):
+        return "Government"
+    label = (category_label or "").strip()
+    industry = INDUSTRY_CATEGORIES.get(label.lower())
+    if industry:
+        return industry
+    if any(word in name for word in ["bank", "financial", "insurance", "superannuation"]):
+        return "Banking and Financial Services"
+    if any(word in name for word in ["mining", "minerals", "resources"]):
+        return "Mining"
+    return label[:-5] if label.endswith(" Jobs") else (label or "Other")
+
+def parse_salary(value):
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
 
 # --- Normalize Location to Main City ---
 def normalize_location(location: str) -> str:
@@ -67,13 +95,70 @@ def extract_key_requirements(description):
     lines = [line.strip() for line in description.split("\n") if line.strip()]
     return " ".join(lines[:3])
 
-# --- Get Jobs from Adzuna API ---
-def get_jobs_from_adzuna(role, location, job_type, salary_min, salary_max):
-    base_url = "https://api.adzuna.com/v1/api/jobs/au/search/1"
+# --- Shared keep-alive HTTP session ---
+_session = None
+_session_lock = threading.Lock()
+
+def get_http_session(pool_size=16):
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": "Mozilla/5.0"})
+            _session = session
+        return _session
+
+def get_with_retries(url, params=None, headers=None, session=None, timeout=REQUEST_TIMEOUT,
+                     retries=MAX_RETRIES, backoff=BACKOFF_SECONDS, max_retry_after=MAX_RETRY_AFTER):
+    """GET with a timeout and exponential backoff; honours Retry-After on 429 up to max_retry_after seconds."""
+    session = session or get_http_session()
+    with metrics.span("job_scraper.http_get") as span:
+        for attempt in range(retries + 1):
+            try:
+                response = session.get(url, params=params, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == retries:
+                    raise
+                span.add(retries=1)
+                time.sleep(backoff * 2 ** attempt)
+                continue
+
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt == retries:
+                    response.raise_for_status()
+                retry_after = response.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else backoff * 2 ** attempt
+                if delay > max_retry_after:
+                    # Sleeping that long would hold the search (and its worker thread) hostage
+                    span.add(retry_after_exceeded=1)
+                    response.raise_for_status()
+                span.add(retries=1)
+                time.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            span.add(bytes=len(response.content))
+            return response
+
+def cached_get(url, params=None, source="default", session=None):
+    """GET through the shared on-disk response cache (falls back to a live request)."""
+    def fetch(url, params=None, headers=None):
+        return get_with_retries(url, params=params, headers=headers, session=session)
+
+    cache = get_default_cache()
+    if cache is None:
+        return fetch(url, params=params)
+    return cache.get(url, params=params, source=source, fetch=fetch)
+
+# --- Adzuna request / record helpers ---
+def build_adzuna_params(role, location, job_type, salary_min, salary_max, results_per_page=20, max_days_old=None):
     params = {
         "app_id": ADZUNA_APP_ID,
         "app_key": ADZUNA_APP_KEY,
-        "results_per_page": 20,
+        "results_per_page": results_per_page,
         "what": role,
         "content-type": "application/json",
     }
@@ -90,60 +175,303 @@ def get_jobs_from_adzuna(role, location, job_type, salary_min, salary_max):
     if salary_max:
         params["salary_max"] = salary_max
 
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        data = response.json()
+    if max_days_old:
+        params["max_days_old"] = max_days_old
 
-        jobs = []
-        today = datetime.utcnow()
-        cutoff_date = today - timedelta(days=15)
+    return params
 
-        for job in data.get("results", []):
-            created_str = job.get("created", "")[:10]
-            try:
-                created_date = datetime.strptime(created_str, "%Y-%m-%d")
-            except:
-                continue
+def parse_created_date(job):
+    created_str = job.get("created", "")[:10]
+    try:
+        return datetime.strptime(created_str, "%Y-%m-%d")
+    except ValueError:
+        return None
 
-            if created_date < cutoff_date:
-                continue
+def build_job_record(title, company, published, location, job_type, description, apply_link,
+                     category="", salary_min=None, salary_max=None):
+    """The normalised job record every source is converted to."""
+    return {
+        "Job Title": title,
+        "Company": company,
+        "Published": published,
+        "Location": normalize_location(location),
+        "Job Type": job_type,
+        "Source": classify_company_type(company),
+        "Industry": classify_industry(category, company or ""),
+        "Salary Min": parse_salary(salary_min),
+        "Salary Max": parse_salary(salary_max),
+        "Description": description or "",
+        "Requirements": extract_key_requirements(description),
+        "Apply Link": apply_link or ""
+    }
 
-            description = job.get("description", "")
-            company_name = job.get("company", {}).get("display_name", "Unknown")
-            raw_location = job.get("location", {}).get("display_name", location)
-
-            jobs.append({
-                "Job Title": job.get("title", "Unknown"),
-                "Company": company_name,
-                "Published": created_str,
-                "Location": normalize_location(raw_location),
-                "Job Type": job.get("contract_time", "N/A"),
-                "Source": classify_company_type(company_name),
-                "Description": description,
-                "Requirements": extract_key_requirements(description),
-                "Apply Link": job.get("redirect_url", "")
-            })
+def normalize_adzuna_job(job, location):
+    return build_job_record(
+        title=job.get("title", "Unknown"),
+        company=job.get("company", {}).get("display_name", "Unknown"),
+        published=job.get("created", "")[:10],
+        location=job.get("location", {}).get("display_name", location),
+        job_type=job.get("contract_time", "N/A"),
+        description=job.get("description", ""),
+        apply_link=job.get("redirect_url", ""),
+        category=job.get("category", {}).get("label", ""),
+        salary_min=job.get("salary_min"),
+        salary_max=job.get("salary_max"),
+    )
 
-        return jobs
+# --- Get Jobs from Adzuna API ---
+def fetch_adzuna_jobs(role, location, job_type, salary_min, salary_max, search_url=ADZUNA_SEARCH_URL):
+    """First result page as normalised fresh jobs; raises on request or response errors."""
+    params = build_adzuna_params(role, location, job_type, salary_min, salary_max)
+    response = cached_get(search_url.format(page=1), params=params, source="adzuna")
+    data = response.json()
+
+    jobs = []
+    cutoff_date = datetime.utcnow() - timedelta(days=JOB_MAX_AGE_DAYS)
+    for job in data.get("results", []):
+        created_date = parse_created_date(job)
+        if created_date is None or created_date < cutoff_date:
+            continue
+        jobs.append(normalize_adzuna_job(job, location))
+    return jobs
 
+def get_jobs_from_adzuna(role, location, job_type, salary_min, salary_max):
+    try:
+        return fetch_adzuna_jobs(role, location, job_type, salary_min, salary_max)
     except Exception as e:
-        st.error(f"❌ Adzuna API error: {e}")
+        # Callers (the app and the batch pipeline) report "no jobs found"; the cause goes to the log
+        logger.warning("Adzuna API error: %s", e)
         return []
 
+# --- Get Jobs from Adzuna API, many pages concurrently ---
+def fetch_adzuna_page(page, params, session=None):
+    response = cached_get(ADZUNA_SEARCH_URL.format(page=page), params=params, source="adzuna", session=session)
+    return response.json().get("results", [])
+
+def iter_adzuna_pages(role, location, job_type, salary_min, salary_max,
+                      max_pages=10, results_per_page=50, max_workers=4, max_days_old=None, raise_errors=False):
+    """Yield the normalised fresh jobs of each result page, in page order.
+
+    Up to max_workers pages are in flight at once through a bounded thread
+    pool. Pages are requested newest-first, so the pull stops as soon as a
+    page is short or reaches past the JOB_MAX_AGE_DAYS cutoff.
+
+    A page that cannot be fetched ends the pull quietly, unless raise_errors
+    is set: then its RequestException is raised after the pages before it.
+    """
+    params = build_adzuna_params(role, location, job_type, salary_min, salary_max, results_per_page, max_days_old)
+    params["sort_by"] = "date"
+    cutoff_date = datetime.utcnow() - timedelta(days=JOB_MAX_AGE_DAYS)
+    session = get_http_session(pool_size=max(max_workers, 1))
+
+    fetched = 0
+    fetch_page = metrics.propagate(fetch_adzuna_page)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = deque()
+        next_page = 1
+
+        def submit_next():
+            nonlocal next_page
+            if next_page <= max_pages:
+                pending.append(pool.submit(fetch_page, next_page, params, session))
+                next_page += 1
+
+        for _ in range(max_workers):
+            submit_next()
+
+        try:
+            while pending:
+                try:
+                    results = pending.popleft().result()
+                except requests.RequestException as e:
+                    metrics.incr("job_scraper.page_errors")
+                    logger.warning("Adzuna page fetch failed after %d jobs: %s", fetched, type(e).__name__)
+                    if raise_errors:
+                        raise
+                    break
+
+                page_jobs = []
+                reached_cutoff = False
+                for job in results:
+                    created_date = parse_created_date(job)
+                    if created_date is None:
+                        continue
+                    if created_date < cutoff_date:
+                        reached_cutoff = True
+                        continue
+                    page_jobs.append(normalize_adzuna_job(job, location))
+
+                fetched += len(page_jobs)
+                metrics.incr("job_scraper.pages")
+                metrics.incr("job_scraper.jobs", len(page_jobs))
+                if reached_cutoff or len(results) < results_per_page:
+                    for future in pending:
+                        future.cancel()
+                    pending.clear()
+                else:
+                    submit_next()
+                yield page_jobs
+        finally:
+            for future in pending:
+                future.cancel()
+            get_company_cache().save()
+
+def get_jobs_from_adzuna_paged(role, location, job_type, salary_min, salary_max,
+                               max_pages=10, results_per_page=50, max_workers=4, max_days_old=None):
+    """Pull up to max_pages result pages concurrently; see iter_adzuna_pages."""
+    jobs = []
+    for page_jobs in iter_adzuna_pages(role, location, job_type, salary_min, salary_max,
+                                       max_pages, results_per_page, max_workers, max_days_old):
+        jobs.extend(page_jobs)
+    return jobs
+
 # --- Remove Duplicate Jobs ---
-def deduplicate_jobs(job_list):
-    seen = set()
-    unique_jobs = []
-    for job in job_list:
-        key = (job['Job Title'].lower(), job['Company'].lower(), job['Apply Link'])
-        if key not in seen:
-            seen.add(key)
-            unique_jobs.append(job)
-    return unique_jobs
+def deduplicate_jobs(job_list, near_duplicate_threshold=None):
+    with metrics.span("job_scraper.deduplicate") as span:
+        seen = set()
+        unique_jobs = []
+        for job in job_list:
+            key = (job['Job Title'].lower(), job['Company'].lower(), job['Apply Link'])
+            if key not in seen:
+                seen.add(key)
+                unique_jobs.append(job)
+        if near_duplicate_threshold:
+            # Same role reposted with slightly different wording (e.g. by several agencies)
+            unique_jobs, _ = deduplicate_near_jobs(unique_jobs, threshold=near_duplicate_threshold)
+        span.add(jobs_in=len(job_list), jobs_out=len(unique_jobs))
+        return unique_jobs
+
+# --- Incremental sync into the local job store ---
+def sync_query(store, role, location, job_type, salary_min, salary_max, max_pages=10):
+    """Fetch only postings newer than the last one seen for this query and store them."""
+    query_key = make_query_key(role, location, job_type, salary_min, salary_max)
+    last_published, _ = store.get_query_state(query_key)
+
+    max_days_old = JOB_MAX_AGE_DAYS
+    if last_published:
+        try:
+            days_since = (datetime.utcnow() - datetime.strptime(last_published, "%Y-%m-%d")).days
+            # Include the last seen day again: records only carry the date
+            max_days_old = min(max(days_since + 1, 1), JOB_MAX_AGE_DAYS)
+        except ValueError:
+            pass
+
+    jobs = []
+    try:
+        for page_jobs in iter_adzuna_pages(role, location, job_type, salary_min, salary_max,
+                                           max_pages=max_pages, max_days_old=max_days_old, raise_errors=True):
+            jobs.extend(page_jobs)
+    except requests.RequestException:
+        # Keep what did arrive, but leave the sync state alone: a recorded sync (or a newer
+        # watermark) would skip the pages that failed, so the next call fetches the window again
+        store.upsert_jobs(jobs, query_key=query_key)
+        return jobs
+    store.upsert_jobs(jobs, query_key=query_key)
+    store.record_sync(query_key, jobs)
+    return jobs
+
+def get_jobs_from_store(store, role, location, job_type, salary_min, salary_max,
+                        max_staleness=STORE_MAX_STALENESS_SECONDS, max_pages=10):
+    query_key = make_query_key(role, location, job_type, salary_min, salary_max)
+    _, last_synced = store.get_query_state(query_key)
+    if last_synced is None or time.time() - last_synced > max_staleness:
+        sync_query(store, role, location, job_type, salary_min, salary_max, max_pages=max_pages)
+    return store.jobs_for_query(query_key, max_age_days=JOB_MAX_AGE_DAYS)
 
 # --- Get All Jobs ---
-def get_all_jobs(role, location, industry, job_type, salary_min, salary_max):
-    jobs = get_jobs_from_adzuna(role, location, job_type, salary_min, salary_max)
-    deduped_jobs = deduplicate_jobs(jobs)
-    return pd.DataFrame(deduped_jobs)
+def filter_industry(jobs, industry):
+    if not industry or industry.lower() == "all":
+        return jobs
+    # Adzuna has no industry parameter, so it is applied locally from the job's category
+    return [jobs[i] for i in FacetIndex(jobs).filter({"Industry": [industry]})]
+
+def split_providers(providers):
+    """(whether Adzuna is queried directly, the other providers) for a providers list.
+
+    Adzuna by name keeps its own path (paging, the job store); only the other
+    sources go through the fan-out in job_scraper.providers.
+    """
+    if not providers:
+        return True, []
+    others = [p for p in providers if p != "adzuna"]
+    return len(others) < len(providers), others
+
+def iter_job_batches(role, location, job_type, salary_min, salary_max, max_pages=1, store=None, providers=None):
+    """Raw job records of a search in batches, from whichever sources the arguments pick.
+
+    Adzuna (when providers is empty or names it) is read through store when
+    one is given, else one batch per result page when max_pages > 1. The
+    other providers are queried meanwhile and arrive as one last batch,
+    without the jobs Adzuna already returned (see providers.merge_key).
+    """
+    use_adzuna, others = split_providers(providers)
+    fan_out = None
+    if others:
+        # Imported here: the providers module builds on this one
+        from job_scraper.providers import get_jobs_from_providers, merge_key
+
+        pool = ThreadPoolExecutor(max_workers=1)
+        fan_out = pool.submit(metrics.propagate(get_jobs_from_providers), others, role, location, job_type,
+                              salary_min, salary_max)
+        pool.shutdown(wait=False)
+
+    seen = set()
+    if use_adzuna:
+        if store is not None:
+            batches = [get_jobs_from_store(store, role, location, job_type, salary_min, salary_max,
+                                           max_pages=max(max_pages, 1))]
+        elif max_pages > 1:
+            batches = iter_adzuna_pages(role, location, job_type, salary_min, salary_max, max_pages=max_pages)
+        else:
+            batches = [get_jobs_from_adzuna(role, location, job_type, salary_min, salary_max)]
+        for batch in batches:
+            if fan_out is not None:
+                seen.update(merge_key(job) for job in batch)
+            yield batch
+    if fan_out is not None:
+        yield [job for job in fan_out.result() if merge_key(job) not in seen]
+
+def collect_jobs(role, location, job_type, salary_min, salary_max, industry=None, max_pages=1, store=None,
+                 near_duplicate_threshold=None, full_descriptions=False, providers=None):
+    """Fetched, de-duplicated, industry-filtered (and optionally enriched) job records; no caching."""
+    jobs = [job for batch in iter_job_batches(role, location, job_type, salary_min, salary_max, max_pages, store,
+                                              providers) for job in batch]
+    deduped_jobs = filter_industry(deduplicate_jobs(jobs, near_duplicate_threshold), industry)
+    if full_descriptions:
+        # After dedupe and the industry filter, so every fetched page belongs to a job that is kept
+        deduped_jobs = enrich_descriptions(deduped_jobs)
+    return deduped_jobs
+
+@metrics.timed("job_scraper.get_all_jobs")
+def get_all_jobs(role, location, industry, job_type, salary_min, salary_max, max_pages=1, store=None,
+                 near_duplicate_threshold=None, full_descriptions=False, providers=None):
+    """Normalised, de-duplicated jobs for a search as a DataFrame.
+
+    providers (e.g. ["adzuna", "indeed"]) fans the search out to several
+    sources at once (see job_scraper.providers); otherwise Adzuna is queried
+    directly, or through store when one is given.
+
+    Searches are counted for the prefetcher (see job_scraper.prefetch), and
+    one fetched in the last WARM_TTL_SECONDS, by anyone, is answered from
+    the warm cache without calling any API.
+    """
+    search = make_search(role, location, job_type, salary_min, salary_max, max_pages, near_duplicate_threshold,
+                         full_descriptions, providers)
+    if store is not None or search is None:
+        jobs = collect_jobs(role, location, job_type, salary_min, salary_max, industry, max_pages, store,
+                            near_duplicate_threshold, full_descriptions, providers)
+    else:
+        get_search_tracker().record(search)
+        jobs = get_warm_cache().get(search)
+        if jobs is not None:
+            jobs = filter_industry(jobs, industry)
+        else:
+            jobs = collect_jobs(industry=industry, **search)
+            if jobs and (not industry or industry.lower() == "all"):
+                # Only an unfiltered result can serve every later industry choice; an empty one may be an API error
+                get_warm_cache().put(search, jobs)
+    jobs_df = pd.DataFrame(jobs)
+    if "Company" in jobs_df:
+        # Stored jobs keep the type they were saved with; refresh it so hand corrections apply
+        jobs_df["Source"] = get_company_cache().classify_column(jobs_df["Company"])
+    return jobs_df
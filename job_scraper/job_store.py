@@ -0,0 +1,174 @@
+# ================================
+# job_scraper/job_store.py
+# ================================
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+DATA_DIR = os.environ.get("JOBHUNT_DATA_DIR", os.path.join(os.path.expanduser("~"), ".jobhunt"))
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, "jobs.sqlite3")
+
+# Normalised record key -> column name
+JOB_COLUMNS = {
+    "Job Title": "title",
+    "Company": "company",
+    "Published": "published",
+    "Location": "location",
+    "Job Type": "job_type",
+    "Source": "source",
+    "Industry": "industry",
+    "Salary Min": "salary_min",
+    "Salary Max": "salary_max",
+    "Description": "description",
+    "Requirements": "requirements",
+    "Apply Link": "apply_link",
+}
+
+NUMERIC_COLUMNS = {"salary_min", "salary_max"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT, company TEXT, published TEXT, location TEXT, job_type TEXT,
+    source TEXT, description TEXT, requirements TEXT, apply_link TEXT,
+    fetched_at REAL, industry TEXT, salary_min REAL, salary_max REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_published ON jobs (published);
+CREATE TABLE IF NOT EXISTS queries (
+    query_key TEXT PRIMARY KEY,
+    last_published TEXT,
+    last_synced REAL
+);
+CREATE TABLE IF NOT EXISTS query_jobs (
+    query_key TEXT,
+    job_id TEXT,
+    PRIMARY KEY (query_key, job_id)
+);
+"""
+
+
+# --- Keys ---
+def make_job_id(job):
+    """Stable id for a normalised job record."""
+    raw = "|".join([
+        (job.get("Job Title") or "").strip().lower(),
+        (job.get("Company") or "").strip().lower(),
+        job.get("Apply Link") or "",
+    ])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def make_query_key(role, location, job_type, salary_min, salary_max):
+    return json.dumps([
+        (role or "").strip().lower(),
+        (location or "all").strip().lower(),
+        (job_type or "all").strip().lower(),
+        salary_min or 0,
+        salary_max or 0,
+    ])
+
+
+# --- Store ---
+class JobStore:
+    """SQLite store of normalised job records, with per-query sync state."""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._transaction() as conn:
+            if path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._add_missing_columns(conn)
+
+    @staticmethod
+    def _add_missing_columns(conn):
+        # Stores created before a column was added to JOB_COLUMNS
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for col in JOB_COLUMNS.values():
+            if col not in existing:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} {'REAL' if col in NUMERIC_COLUMNS else 'TEXT'}")
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            with self._conn:
+                yield self._conn
+
+    def close(self):
+        self._conn.close()
+
+    def upsert_jobs(self, jobs, query_key=None):
+        """Insert or refresh records; optionally link them to a query. Returns the count."""
+        now = time.time()
+        rows = []
+        for job in jobs:
+            rows.append(
+                [make_job_id(job)]
+                + [job.get(key, None if col in NUMERIC_COLUMNS else "") for key, col in JOB_COLUMNS.items()]
+                + [now]
+            )
+        columns = ["job_id"] + list(JOB_COLUMNS.values()) + ["fetched_at"]
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{col} = excluded.{col}" for col in columns[1:])
+        with self._transaction() as conn:
+            conn.executemany(
+                f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(job_id) DO UPDATE SET {updates}",
+                rows,
+            )
+            if query_key is not None:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO query_jobs (query_key, job_id) VALUES (?, ?)",
+                    [(query_key, row[0]) for row in rows],
+                )
+        return len(rows)
+
+    def get_query_state(self, query_key):
+        """(last_published, last_synced) for a query, or (None, None) if never synced."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT last_published, last_synced FROM queries WHERE query_key = ?", (query_key,)
+            ).fetchone()
+        return (row["last_published"], row["last_synced"]) if row else (None, None)
+
+    def record_sync(self, query_key, jobs, synced_at=None):
+        synced_at = synced_at or time.time()
+        newest = max((job.get("Published") or "" for job in jobs), default="")
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO queries (query_key, last_published, last_synced) VALUES (?, ?, ?) "
+                "ON CONFLICT(query_key) DO UPDATE SET "
+                "last_published = MAX(COALESCE(queries.last_published, ''), excluded.last_published), "
+                "last_synced = excluded.last_synced",
+                (query_key, newest, synced_at),
+            )
+
+    def jobs_for_query(self, query_key, max_age_days=15):
+        """Records linked to a query and published within max_age_days, newest first."""
+        cutoff = (datetime.utcnow() - timedelta(days=max_age_days)).strftime("%Y-%m-%d")
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT j.* FROM jobs j JOIN query_jobs q ON q.job_id = j.job_id "
+                "WHERE q.query_key = ? AND j.published >= ? ORDER BY j.published DESC",
+                (query_key, cutoff),
+            ).fetchall()
+        return [row_to_job(row) for row in rows]
+
+    def all_jobs(self):
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY published DESC").fetchall()
+        return [row_to_job(row) for row in rows]
+
+
+def row_to_job(row):
+    return {key: row[col] for key, col in JOB_COLUMNS.items()}
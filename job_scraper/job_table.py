@@ -0,0 +1,238 @@
+# ================================
+# job_scraper/job_table.py
+# ================================
+# Compact, columnar storage for normalised job records. Repeated strings
+# (company, location, job type, ...) are interned once per column and kept
+# as int32 codes; descriptions live once in a compressed text pool and
+# rows refer to them by id; Requirements is not stored at all when it is
+# what extract_key_requirements derives from the description anyway.
+#
+# Rows come back as the usual record dicts, built on access, so a JobTable
+# can stand in wherever a long-lived list of records is kept.
+import sys
+import zlib
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from job_scraper.job_store import JOB_COLUMNS
+
+CATEGORICAL_COLUMNS = ("Job Title", "Company", "Published", "Location", "Job Type", "Source", "Industry")
+NUMERIC_COLUMNS = ("Salary Min", "Salary Max")
+# Shorter texts are kept as plain UTF-8: zlib only pays off on longer ones
+MIN_COMPRESS_BYTES = 128
+ZLIB_LEVEL = 1
+
+
+class Categories:
+    """One interned column: an int32 code per row plus the distinct values (code -1 is None)."""
+
+    __slots__ = ("codes", "values", "_code_of")
+
+    def __init__(self):
+        self.codes = array("i")
+        self.values = []
+        self._code_of = {}
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+            return
+        code = self._code_of.get(value)
+        if code is None:
+            code = self._code_of[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, row):
+        code = self.codes[row]
+        return self.values[code] if code >= 0 else None
+
+    def categorical(self):
+        return pd.Categorical.from_codes(np.frombuffer(self.codes, dtype=np.int32), categories=self.values)
+
+    def nbytes(self):
+        return self.codes.itemsize * len(self.codes) + sum(sys.getsizeof(value) for value in self.values)
+
+
+class TextPool:
+    """Append-only strings in one buffer, referenced by id.
+
+    With dedupe, an identical string is stored once and gets the id of its
+    first copy. Texts of MIN_COMPRESS_BYTES or more are zlib-compressed
+    when that makes them smaller.
+    """
+
+    def __init__(self, compress=True, dedupe=True):
+        self.compress = compress
+        self._blob = bytearray()
+        self._ends = array("q")
+        self._packed = array("b")
+        self._ids = {} if dedupe else None
+
+    def __len__(self):
+        return len(self._ends)
+
+    def add(self, text):
+        """Id of text in the pool (-1 for None)."""
+        if text is None:
+            return -1
+        if self._ids is not None:
+            key = hash(text)
+            text_id = self._ids.get(key)
+            # Hashes can collide; only a real duplicate shares the id
+            if text_id is not None and self[text_id] == text:
+                return text_id
+        data = text.encode("utf-8")
+        packed = False
+        if self.compress and len(data) >= MIN_COMPRESS_BYTES:
+            compressed = zlib.compress(data, ZLIB_LEVEL)
+            if len(compressed) < len(data):
+                data, packed = compressed, True
+        self._blob += data
+        self._ends.append(len(self._blob))
+        self._packed.append(packed)
+        text_id = len(self._ends) - 1
+        if self._ids is not None:
+            self._ids.setdefault(key, text_id)
+        return text_id
+
+    def __getitem__(self, text_id):
+        if text_id < 0:
+            return None
+        start = self._ends[text_id - 1] if text_id else 0
+        data = bytes(self._blob[start:self._ends[text_id]])
+        return (zlib.decompress(data) if self._packed[text_id] else data).decode("utf-8")
+
+    def nbytes(self):
+        index = 0 if self._ids is None else sys.getsizeof(self._ids) + 64 * len(self._ids)
+        return len(self._blob) + self._ends.itemsize * len(self._ends) + len(self._packed) + index
+
+
+def _number(value):
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class JobTable:
+    """Columnar list of job records: len(), table[row], iteration and append() like a list of dicts."""
+
+    def __init__(self, jobs=()):
+        self._categories = {column: Categories() for column in CATEGORICAL_COLUMNS}
+        self._numbers = {column: array("d") for column in NUMERIC_COLUMNS}
+        self.texts = TextPool()
+        self._links = TextPool(compress=False, dedupe=False)
+        self._description_ids = array("i")
+        self._link_ids = array("i")
+        # row -> text id, only for rows whose Requirements are not the derived ones
+        self._requirements = {}
+        self.extend(jobs)
+
+    def __len__(self):
+        return len(self._description_ids)
+
+    # --- Building ---
+    def append(self, job):
+        # Imported here: job_scraper.job_scraper imports the modules that use this one
+        from job_scraper.job_scraper import extract_key_requirements
+
+        row = len(self)
+        for column, categories in self._categories.items():
+            categories.append(job.get(column))
+        for column, numbers in self._numbers.items():
+            numbers.append(_number(job.get(column)))
+        description = job.get("Description") or ""
+        self._description_ids.append(self.texts.add(description))
+        self._link_ids.append(self._links.add(job.get("Apply Link") or ""))
+        requirements = job.get("Requirements")
+        if requirements is not None and requirements != extract_key_requirements(description):
+            self._requirements[row] = self.texts.add(requirements)
+
+    def extend(self, jobs):
+        for job in jobs:
+            self.append(job)
+
+    # --- Access ---
+    def description(self, row):
+        return self.texts[self._description_ids[row]]
+
+    def requirements(self, row, description=None):
+        """Stored requirements of the row, else the ones derived from its (given or decoded) description."""
+        from job_scraper.job_scraper import extract_key_requirements
+
+        text_id = self._requirements.get(row)
+        if text_id is not None:
+            return self.texts[text_id]
+        return extract_key_requirements(self.description(row) if description is None else description)
+
+    def record(self, row):
+        """The row as a normalised job record (same keys and order as JobStore rows)."""
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        description = self.description(row)
+        job = {}
+        for key in JOB_COLUMNS:
+            if key in self._categories:
+                job[key] = self._categories[key][row]
+            elif key in self._numbers:
+                value = self._numbers[key][row]
+                job[key] = None if value != value else value
+            elif key == "Description":
+                job[key] = description
+            elif key == "Requirements":
+                job[key] = self.requirements(row, description)
+            elif key == "Apply Link":
+                job[key] = self._links[self._link_ids[row]]
+        return job
+
+    __getitem__ = record
+
+    def __iter__(self):
+        return (self.record(row) for row in range(len(self)))
+
+    def codes(self, column):
+        """int32 codes of an interned column (values(column)[code] is the value)."""
+        return np.frombuffer(self._categories[column].codes, dtype=np.int32)
+
+    def values(self, column):
+        return list(self._categories[column].values)
+
+    def to_frame(self):
+        """DataFrame with category dtype for the interned columns; text columns are decoded."""
+        data = {}
+        for key in JOB_COLUMNS:
+            if key in self._categories:
+                data[key] = self._categories[key].categorical()
+            elif key in self._numbers:
+                data[key] = np.frombuffer(self._numbers[key], dtype=np.float64).copy()
+            elif key == "Description":
+                data[key] = [self.description(row) for row in range(len(self))]
+            elif key == "Requirements":
+                data[key] = [self.requirements(row, description)
+                             for row, description in enumerate(data["Description"])]
+            elif key == "Apply Link":
+                data[key] = [self._links[text_id] for text_id in self._link_ids]
+        return pd.DataFrame(data, columns=list(JOB_COLUMNS))
+
+    def nbytes(self):
+        """Approximate memory held by the table's data."""
+        return (
+            sum(categories.nbytes() for categories in self._categories.values())
+            + sum(numbers.itemsize * len(numbers) for numbers in self._numbers.values())
+            + self.texts.nbytes() + self._links.nbytes()
+            + 4 * (len(self._description_ids) + len(self._link_ids))
+            + 100 * len(self._requirements)
+        )
+
+
+def compact_frame(jobs_df):
+    """jobs_df with its repeated-value columns stored as pandas categoricals (in place; returned)."""
+    for column in CATEGORICAL_COLUMNS:
+        if column in jobs_df and not isinstance(jobs_df[column].dtype, pd.CategoricalDtype):
+            jobs_df[column] = jobs_df[column].astype("category")
+    return jobs_df
@@ -0,0 +1,187 @@
+# ================================
+# job_scraper/near_duplicates.py
+# ================================
+import re
+import zlib
+import numpy as np
+
+NEAR_DUPLICATE_THRESHOLD = 0.8
+NUM_PERM = 128
+SHINGLE_SIZE = 3
+# Postings with fewer distinct shingles than this never match: short or empty
+# descriptions say too little to tell two openings apart
+MIN_SHINGLES = 8
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+# --- Shingles and signatures ---
+def shingle_hashes(text, shingle_size=SHINGLE_SIZE):
+    """32-bit hashes of the word n-gram shingles of a text."""
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    if len(words) < shingle_size:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+class MinHasher:
+    """num_perm multiply-shift hash functions; a signature is the per-function minimum."""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        if not len(hashes):
+            return None
+        with np.errstate(over="ignore"):
+            values = (hashes[:, None] * self.a + self.b) >> np.uint64(32)
+        return values.min(axis=0).astype(np.uint32)
+
+
+def choose_bands(threshold, num_perm=NUM_PERM, false_negative_weight=0.8):
+    """(bands, rows) minimising the weighted LSH false positive / false negative areas.
+
+    Candidate pairs are verified on the full signature afterwards, so missed
+    pairs are weighted above extra candidates by default.
+    """
+    below = np.linspace(0.0, threshold, 101)
+    above = np.linspace(threshold, 1.0, 101)
+    best, best_error = None, None
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        false_pos = np.mean(1 - (1 - below ** rows) ** bands) * threshold
+        false_neg = np.mean((1 - above ** rows) ** bands) * (1 - threshold)
+        error = (1 - false_negative_weight) * false_pos + false_negative_weight * false_neg
+        if best_error is None or error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def job_text(job):
+    # Company and location are part of the text, so the same role at another employer or office stays apart
+    return " ".join(str(job.get(field) or "") for field in ("Job Title", "Company", "Location", "Description"))
+
+
+def job_signature(hasher, job, shingle_size=SHINGLE_SIZE, min_shingles=MIN_SHINGLES):
+    """MinHash signature of a job, or None when it has too few shingles to compare."""
+    hashes = shingle_hashes(job_text(job), shingle_size)
+    if len(hashes) < min_shingles:
+        return None
+    return hasher.signature(hashes)
+
+
+# --- Clustering ---
+def cluster_near_duplicates(jobs, threshold=NEAR_DUPLICATE_THRESHOLD, num_perm=NUM_PERM,
+                            shingle_size=SHINGLE_SIZE, seed=1, min_shingles=MIN_SHINGLES):
+    """Group jobs whose title/company/location/description shingle sets have Jaccard similarity >= threshold.
+
+    Signatures are bucketed per LSH band, so only jobs sharing a band are
+    compared and the cost stays roughly linear in the number of postings.
+    Jobs with fewer than min_shingles shingles are left in clusters of their own.
+    Returns a list of clusters (lists of indices into jobs, in input order).
+    """
+    hasher = MinHasher(num_perm, seed)
+    signatures = [job_signature(hasher, job, shingle_size, min_shingles) for job in jobs]
+    bands, rows = choose_bands(threshold, num_perm)
+
+    parent = list(range(len(jobs)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        buckets = {}
+        for idx, sig in enumerate(signatures):
+            if sig is not None:
+                buckets.setdefault(sig[band * rows:(band + 1) * rows].tobytes(), []).append(idx)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            # One exemplar per cluster already present in this bucket
+            exemplars = []
+            for idx in members:
+                for exemplar in exemplars:
+                    root_a, root_b = find(exemplar), find(idx)
+                    if root_a == root_b:
+                        break
+                    # Verify the candidate pair on the full signature
+                    if np.mean(signatures[exemplar] == signatures[idx]) >= threshold:
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+                        break
+                else:
+                    exemplars.append(idx)
+
+    clusters = {}
+    for idx in range(len(jobs)):
+        clusters.setdefault(find(idx), []).append(idx)
+    return list(clusters.values())
+
+
+class NearDuplicateIndex:
+    """Incremental variant for streaming: add() jobs one at a time.
+
+    Keeps only the signature and band keys of the first posting of each
+    cluster, so later copies are recognised without holding the jobs.
+    """
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE, seed=1,
+                 min_shingles=MIN_SHINGLES):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands, self.rows = choose_bands(threshold, num_perm)
+        self.buckets = [{} for _ in range(self.bands)]
+        self.signatures = []
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def add(self, job):
+        """Return the cluster id of an earlier near-duplicate, or None if this job is new."""
+        sig = job_signature(self.hasher, job, self.shingle_size, self.min_shingles)
+        if sig is None:
+            return None
+        keys = [sig[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+        checked = set()
+        for band, key in enumerate(keys):
+            for cluster_id in self.buckets[band].get(key, ()):
+                if cluster_id in checked:
+                    continue
+                checked.add(cluster_id)
+                if np.mean(self.signatures[cluster_id] == sig) >= self.threshold:
+                    return cluster_id
+
+        cluster_id = len(self.signatures)
+        self.signatures.append(sig)
+        for band, key in enumerate(keys):
+            self.buckets[band].setdefault(key, []).append(cluster_id)
+        return None
+
+
+def pick_representative(jobs, members):
+    # The posting with the most detail wins; ties keep the earliest
+    return max(members, key=lambda idx: (len(jobs[idx].get("Description") or ""), -idx))
+
+
+def deduplicate_near_jobs(jobs, threshold=NEAR_DUPLICATE_THRESHOLD, **kwargs):
+    """Return (representatives, clusters): one job per cluster plus each cluster's member jobs."""
+    clusters = cluster_near_duplicates(jobs, threshold, **kwargs)
+    representatives = []
+    memberships = []
+    for members in clusters:
+        representatives.append(jobs[pick_representative(jobs, members)])
+        memberships.append([jobs[idx] for idx in members])
+    return representatives, memberships
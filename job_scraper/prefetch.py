@@ -0,0 +1,308 @@
+# ================================
+# job_scraper/prefetch.py
+# ================================
+# Keeps popular searches warm. get_all_jobs reports every search here and
+# answers from the warm cache when it can; a background scheduler re-runs
+# the most popular searches on a jittered schedule, within a daily request
+# budget, so they never go cold between users. Searches asked for only once,
+# or that keep coming back empty, are not prefetched.
+#
+# The scheduler is started by the app (start_prefetcher); set
+# JOBHUNT_PREFETCH=0 to keep it off.
+import os
+import json
+import time
+import random
+import logging
+import threading
+from collections import deque
+
+from job_scraper.job_table import JobTable
+from optimization_utils import metrics
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_TOP_N = 5
+PREFETCH_INTERVAL_SECONDS = 10 * 60
+# Each wait is the interval +/- this share, so workers started together drift apart
+PREFETCH_JITTER = 0.2
+# Adzuna's default quota is 250 calls a day; prefetching may use this many
+# requests of it (API calls plus, with full_descriptions, ad page fetches)
+# and leaves the rest to searches users run
+PREFETCH_CALLS_PER_DAY = int(os.environ.get("JOBHUNT_PREFETCH_CALLS_PER_DAY", "100"))
+# Upper bound on the ads in one result page; each is a fetch when descriptions are enriched
+ENRICH_FETCHES_PER_PAGE = 50
+# Decayed request count a search needs before it is prefetched: asked for more than once lately
+PREFETCH_MIN_SCORE = 1.5
+# A search that comes back empty waits interval * 2**n (n empty rounds in a row), up to this
+EMPTY_BACKOFF_MAX_SECONDS = 24 * 60 * 60
+WARM_TTL_SECONDS = 15 * 60
+POPULARITY_HALF_LIFE_SECONDS = 6 * 60 * 60
+MAX_TRACKED_SEARCHES = 500
+MAX_WARM_SEARCHES = 50
+
+
+# --- Searches ---
+def make_search(role, location, job_type, salary_min, salary_max, max_pages=1, near_duplicate_threshold=None,
+                full_descriptions=False, providers=None):
+    """The get_all_jobs arguments that decide its (pre industry filter) result, or None if not cacheable."""
+    if providers and not all(isinstance(p, str) for p in providers):
+        # Ad hoc provider instances (e.g. pointed at stand-in servers) are never shared
+        return None
+    return {
+        "role": (role or "").strip(),
+        "location": location or "All",
+        "job_type": job_type or "All",
+        "salary_min": salary_min or 0,
+        "salary_max": salary_max or 0,
+        "max_pages": max_pages,
+        "near_duplicate_threshold": near_duplicate_threshold,
+        "full_descriptions": bool(full_descriptions),
+        "providers": sorted(providers) if providers else None,
+    }
+
+
+def search_key(search):
+    # Case-insensitive on the free-text parts, like make_query_key
+    return json.dumps(
+        dict(search, role=search["role"].lower(), location=search["location"].lower(),
+             job_type=search["job_type"].lower()),
+        sort_keys=True,
+    )
+
+
+def _result_pages(search):
+    # Adzuna is paged directly (see job_scraper.split_providers); every other provider is one call
+    providers = search["providers"] or ["adzuna"]
+    others = [p for p in providers if p != "adzuna"]
+    return len(others) + (max(search["max_pages"], 1) if len(others) < len(providers) else 0)
+
+
+def estimated_calls(search):
+    """Requests one run of the search costs at most: API calls plus ad page fetches."""
+    pages = _result_pages(search)
+    if search["full_descriptions"]:
+        return pages + pages * ENRICH_FETCHES_PER_PAGE
+    return pages
+
+
+def actual_calls(search, jobs):
+    """Requests a run that returned jobs cost (enriched ads are counted one by one)."""
+    pages = _result_pages(search)
+    return pages + (len(jobs) if search["full_descriptions"] else 0)
+
+
+# --- Popularity ---
+class SearchTracker:
+    """Request counts per search that halve every half_life seconds."""
+
+    def __init__(self, half_life=POPULARITY_HALF_LIFE_SECONDS, max_searches=MAX_TRACKED_SEARCHES):
+        self.half_life = half_life
+        self.max_searches = max_searches
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def _score(self, entry, now):
+        score, updated, _ = entry
+        return score * 0.5 ** ((now - updated) / self.half_life)
+
+    def record(self, search, now=None):
+        now = now or time.time()
+        key = search_key(search)
+        with self._lock:
+            entry = self._entries.get(key)
+            score = self._score(entry, now) if entry else 0.0
+            self._entries[key] = (score + 1.0, now, search)
+            if len(self._entries) > self.max_searches:
+                coldest = min(self._entries, key=lambda k: self._score(self._entries[k], now))
+                del self._entries[coldest]
+
+    def top(self, n, min_score=0.0, now=None):
+        """The n most popular searches scoring at least min_score, most popular first."""
+        now = now or time.time()
+        with self._lock:
+            scored = [(self._score(entry, now), entry[2]) for entry in self._entries.values()]
+        ranked = sorted((item for item in scored if item[0] >= min_score), key=lambda item: item[0], reverse=True)
+        return [search for _, search in ranked[:n]]
+
+
+# --- Warm results ---
+class WarmCache:
+    """Fetched job lists per search, served for ttl seconds after they were fetched.
+
+    Entries are kept as JobTables and decoded into fresh record dicts on every
+    hit, so callers may change what they get back.
+    """
+
+    def __init__(self, ttl=WARM_TTL_SECONDS, max_searches=MAX_WARM_SEARCHES):
+        self.ttl = ttl
+        self.max_searches = max_searches
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, search):
+        with self._lock:
+            entry = self._entries.get(search_key(search))
+        hit = entry is not None and time.time() - entry[1] < self.ttl
+        metrics.count_cache("warm_searches", hit)
+        return list(entry[0]) if hit else None
+
+    def age(self, search):
+        """Seconds since the search was last fetched, or None."""
+        with self._lock:
+            entry = self._entries.get(search_key(search))
+        return time.time() - entry[1] if entry else None
+
+    def put(self, search, jobs):
+        with self._lock:
+            self._entries[search_key(search)] = (JobTable(jobs), time.time())
+            if len(self._entries) > self.max_searches:
+                del self._entries[min(self._entries, key=lambda k: self._entries[k][1])]
+
+
+class CallBudget:
+    """At most calls requests in any rolling window of window seconds (a day by default)."""
+
+    def __init__(self, calls=PREFETCH_CALLS_PER_DAY, window=24 * 60 * 60):
+        self.calls = calls
+        self.window = window
+        self._lock = threading.Lock()
+        self._spent = deque()
+
+    def try_spend(self, calls, now=None):
+        now = now or time.time()
+        with self._lock:
+            while self._spent and now - self._spent[0] >= self.window:
+                self._spent.popleft()
+            if len(self._spent) + calls > self.calls:
+                return False
+            self._spent.extend([now] * calls)
+            return True
+
+    def refund(self, calls):
+        """Give back calls from the latest spend, when a run cost less than its estimate."""
+        with self._lock:
+            for _ in range(min(calls, len(self._spent))):
+                self._spent.pop()
+
+
+# --- Scheduler ---
+class PrefetchScheduler:
+    """Re-fetches the top_n searches before their warm results expire.
+
+    fetch(**search) returns the job list for a search (job_scraper.collect_jobs
+    in the app). Only searches scoring at least min_score are considered. Each
+    run is charged to the budget at its estimate and refunded down to what it
+    cost; a search that does not fit in what is left is served live instead.
+    A search that returns no jobs is backed off exponentially.
+    """
+
+    def __init__(self, tracker, warm, fetch, top_n=PREFETCH_TOP_N, interval=PREFETCH_INTERVAL_SECONDS,
+                 jitter=PREFETCH_JITTER, budget=None, rng=None, min_score=PREFETCH_MIN_SCORE,
+                 max_backoff=EMPTY_BACKOFF_MAX_SECONDS):
+        self.tracker = tracker
+        self.warm = warm
+        self.fetch = fetch
+        self.top_n = top_n
+        self.interval = interval
+        self.jitter = jitter
+        self.budget = budget or CallBudget()
+        self.rng = rng or random.Random()
+        self.min_score = min_score
+        self.max_backoff = max_backoff
+        # search key -> (empty rounds in a row, time before which it is not fetched again)
+        self._empty = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def next_delay(self):
+        return self.interval * (1.0 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def refresh_once(self):
+        """One round; returns how many searches were re-fetched."""
+        refreshed = 0
+        now = time.time()
+        with metrics.span("job_scraper.prefetch.refresh") as span:
+            searches = self.tracker.top(self.top_n, self.min_score, now)
+            keys = [search_key(search) for search in searches]
+            # Searches that left the top lose their backoff state with their place
+            self._empty = {key: state for key, state in self._empty.items() if key in keys}
+            for search, key in zip(searches, keys):
+                if key in self._empty and now < self._empty[key][1]:
+                    span.add(backed_off=1)
+                    continue
+                age = self.warm.age(search)
+                # Still warm at the latest possible next round: leave it
+                if age is not None and age + self.interval * (1.0 + self.jitter) < self.warm.ttl:
+                    continue
+                estimate = estimated_calls(search)
+                if not self.budget.try_spend(estimate):
+                    span.add(over_budget=1)
+                    logger.info("Prefetch budget spent; %s waits for the next round", search["role"])
+                    continue
+                try:
+                    jobs = self.fetch(**search)
+                except Exception as e:
+                    span.add(errors=1)
+                    # Only the type: messages of request errors can carry API URLs with keys in them
+                    logger.warning("Prefetch of %r failed: %s", search["role"], type(e).__name__)
+                    continue
+                self.budget.refund(estimate - min(actual_calls(search, jobs or []), estimate))
+                if jobs:
+                    self._empty.pop(key, None)
+                    self.warm.put(search, jobs)
+                    refreshed += 1
+                else:
+                    empty_rounds = self._empty.get(key, (0, 0.0))[0] + 1
+                    delay = min(self.interval * 2 ** empty_rounds, self.max_backoff)
+                    self._empty[key] = (empty_rounds, now + delay)
+            span.add(searches=refreshed)
+        return refreshed
+
+    def _run(self):
+        # The first round comes after a short jittered delay rather than a full interval
+        delay = self.rng.uniform(0, self.interval * self.jitter)
+        while not self._stop.wait(delay):
+            self.refresh_once()
+            delay = self.next_delay()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="job-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+# --- Process-wide instances ---
+_tracker = SearchTracker()
+_warm_cache = WarmCache()
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_search_tracker():
+    return _tracker
+
+
+def get_warm_cache():
+    return _warm_cache
+
+
+def start_prefetcher():
+    """Start the process-wide scheduler once (no-op when JOBHUNT_PREFETCH=0); returns it or None."""
+    global _scheduler
+    if os.environ.get("JOBHUNT_PREFETCH", "1") == "0":
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            # Imported here: job_scraper.job_scraper imports this module
+            from job_scraper.job_scraper import collect_jobs
+
+            _scheduler = PrefetchScheduler(_tracker, _warm_cache, collect_jobs)
+        return _scheduler.start()
@@ -0,0 +1,433 @@
+# ================================
+# job_scraper/providers.py
+# ================================
+# Job sources behind one interface. Each provider turns a search into the
+# normalised job records built by build_job_record; the fan-out runs every
+# enabled provider at once under asyncio, each behind its own rate limiter,
+# timeout and circuit breaker, and merges results as providers finish.
+#
+# Adzuna always runs. Indeed (through ScraperAPI) needs SCRAPER_API_KEY and
+# Browse AI needs BROWSE_AI_API_KEY plus BROWSE_AI_ROBOT_ID.
+import os
+import re
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import urlencode, urljoin
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from job_scraper.company_types import company_key, get_company_cache
+from job_scraper.job_scraper import (
+    ADZUNA_SEARCH_URL, JOB_MAX_AGE_DAYS, REQUEST_TIMEOUT, build_job_record, cached_get, fetch_adzuna_jobs,
+    get_http_session, get_with_retries,
+)
+from optimization_utils import metrics
+from resume_matcher.job_parser import HTML_PARSER
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_API_URL = "https://api.scraperapi.com/"
+INDEED_BASE_URL = "https://au.indeed.com"
+BROWSE_AI_API_URL = "https://api.browse.ai/v2"
+
+INDEED_JOB_TYPES = {"full-time": "fulltime", "part-time": "parttime", "contract": "contract", "temporary": "temporary"}
+JOB_TYPE_WORDS = {"full time": "full_time", "part time": "part_time", "contract": "contract",
+                  "temporary": "contract", "permanent": "permanent"}
+INDEED_CARD_CLASS = "job_seen_beacon"
+PROVIDER_WORKERS = 32
+
+
+# --- Guards ---
+class RateLimiter:
+    """Token bucket: on average `rate` calls per second, bursts of up to `burst`.
+
+    Callers reserve a token up front and sleep for it outside the lock, so
+    the limiter works across threads and event loops (each asyncio.run()
+    gets a new loop, while providers live for the whole process).
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token; returns how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """Stops calling a provider after max_failures failures in a row.
+
+    After reset_after seconds one trial call is let through ("half open");
+    it closes the breaker on success and re-opens it on failure.
+    """
+
+    def __init__(self, max_failures=3, reset_after=60.0):
+        self.max_failures = max_failures
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened_at >= self.reset_after else "open"
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self._opened_at < self.reset_after:
+                return False
+            self._trial = True
+            return True
+
+    def record(self, ok):
+        with self._lock:
+            self._trial = False
+            if ok:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._failures >= self.max_failures or self._opened_at is not None:
+                self._opened_at = time.monotonic()
+
+
+# --- Providers ---
+class JobProvider:
+    """A job source. Subclasses implement search() (blocking; raises on failure)."""
+
+    name = "provider"
+    rate = 1.0
+    burst = 2
+    timeout = 30.0
+
+    def __init__(self, rate=None, burst=None, timeout=None, max_failures=3, reset_after=60.0):
+        self.timeout = timeout or self.timeout
+        self.limiter = RateLimiter(rate or self.rate, burst or self.burst)
+        self.breaker = CircuitBreaker(max_failures, reset_after)
+
+    @property
+    def enabled(self):
+        return True
+
+    def search(self, role, location, job_type, salary_min, salary_max):
+        raise NotImplementedError
+
+
+class AdzunaProvider(JobProvider):
+    name = "adzuna"
+    # Adzuna's free tier allows 25 calls a minute
+    rate = 25 / 60
+    burst = 5
+
+    def __init__(self, search_url=ADZUNA_SEARCH_URL, **kwargs):
+        super().__init__(**kwargs)
+        self.search_url = search_url
+
+    def search(self, role, location, job_type, salary_min, salary_max):
+        return fetch_adzuna_jobs(role, location, job_type, salary_min, salary_max, search_url=self.search_url)
+
+
+def _posted_date(text, today=None):
+    """Date for Indeed's "Posted 3 days ago" / "Just posted" labels ("" when unknown)."""
+    today = today or datetime.utcnow()
+    text = (text or "").lower()
+    if "just posted" in text or "today" in text:
+        return today.strftime("%Y-%m-%d")
+    days = re.search(r"(\d+)\+?\s*days?\s+ago", text)
+    if not days:
+        return ""
+    return (today - timedelta(days=int(days.group(1)))).strftime("%Y-%m-%d")
+
+
+def _salary_range(text):
+    """(min, max) of an annual salary snippet such as "$120,000 – $140,000 a year"."""
+    if "year" not in (text or "").lower():
+        return None, None
+    amounts = [float(amount.replace(",", "")) for amount in re.findall(r"\$\s*([\d,]+(?:\.\d+)?)", text)]
+    if not amounts:
+        return None, None
+    return min(amounts), max(amounts)
+
+
+def parse_indeed_html(markup, location="", base_url=INDEED_BASE_URL):
+    """Normalised jobs from an Indeed search results page.
+
+    Only the job cards are turned into a tree: the scripts and page chrome
+    before the first card are skipped and a SoupStrainer drops the rest.
+    """
+    first_card = markup.find(INDEED_CARD_CLASS)
+    if first_card < 0:
+        return []
+    cards = SoupStrainer("div", class_=re.compile(rf"(?:^|\s){INDEED_CARD_CLASS}(?:\s|$)"))
+    soup = BeautifulSoup(markup[markup.rfind("<", 0, first_card):], HTML_PARSER, parse_only=cards)
+    jobs = []
+    for card in soup.find_all("div", class_=INDEED_CARD_CLASS):
+        heading = card.find("h2", class_="jobTitle")
+        link = card.find("a", class_="jcs-JobTitle") or (heading.find("a") if heading else None)
+        if heading is None or link is None:
+            continue
+        title = heading.find("span", title=True)
+        # One pass over the card's data-testid nodes instead of one CSS query per field
+        by_testid = {}
+        for node in card.find_all(attrs={"data-testid": True}):
+            by_testid.setdefault(node["data-testid"], []).append(node.get_text(" ", strip=True))
+        snippet = card.find("div", class_="job-snippet")
+        attributes = " | ".join(by_testid.get("attribute_snippet_testid", []))
+        salary_min, salary_max = _salary_range(attributes)
+        job_type = next((kind for words, kind in JOB_TYPE_WORDS.items() if words in attributes.lower()), "N/A")
+        jobs.append(build_job_record(
+            title=title["title"] if title else heading.get_text(" ", strip=True),
+            company=(by_testid.get("company-name") or ["Unknown"])[0],
+            published=_posted_date((by_testid.get("myJobsStateDate") or [""])[0]),
+            location=(by_testid.get("text-location") or [location])[0],
+            job_type=job_type,
+            description=(snippet.get_text("\n", strip=True) if snippet
+                         else "\n".join(by_testid.get("jobsnippet_footer", []))),
+            apply_link=urljoin(base_url, link.get("href", "")),
+            salary_min=salary_min,
+            salary_max=salary_max,
+        ))
+    return jobs
+
+
+class IndeedProvider(JobProvider):
+    """indeed.com.au search results, fetched through ScraperAPI."""
+
+    name = "indeed"
+    rate = 1.0
+    burst = 2
+    # ScraperAPI retries blocked pages on its side and can take up to a minute
+    timeout = 70.0
+
+    def __init__(self, api_key=None, api_url=SCRAPER_API_URL, base_url=INDEED_BASE_URL, **kwargs):
+        super().__init__(**kwargs)
+        self.api_key = api_key or os.environ.get("SCRAPER_API_KEY", "")
+        self.api_url = api_url
+        self.base_url = base_url
+
+    @property
+    def enabled(self):
+        return bool(self.api_key)
+
+    def search(self, role, location, job_type, salary_min, salary_max):
+        query = {"q": role, "fromage": JOB_MAX_AGE_DAYS}
+        if location and location.lower() != "all":
+            query["l"] = location
+        if job_type and job_type.lower() in INDEED_JOB_TYPES:
+            query["jt"] = INDEED_JOB_TYPES[job_type.lower()]
+        target = f"{self.base_url}/jobs?{urlencode(query)}"
+        response = cached_get(self.api_url, params={"api_key": self.api_key, "url": target, "country_code": "au"},
+                              source="indeed")
+        jobs = parse_indeed_html(response.text, location, self.base_url)
+        # Indeed only filters salary loosely; apply the range to the jobs that state one
+        return [job for job in jobs
+                if not (salary_min and job["Salary Max"] is not None and job["Salary Max"] < salary_min)
+                and not (salary_max and job["Salary Min"] is not None and job["Salary Min"] > salary_max)]
+
+
+class BrowseAIProvider(JobProvider):
+    """Jobs captured by a trained Browse AI robot.
+
+    The robot is expected to take "role" and "location" input parameters
+    and to capture one list of jobs; FIELDS maps its column names (the
+    first one present wins) to the job record.
+    """
+
+    name = "browseai"
+    rate = 0.2
+    burst = 1
+    # A robot task runs a real browser; a few minutes is normal
+    timeout = 300.0
+    poll_interval = 5.0
+
+    FIELDS = {
+        "title": ("Job Title", "Title", "Position"),
+        "company": ("Company", "Company Name", "Employer"),
+        "location": ("Location",),
+        "published": ("Published", "Posted", "Date"),
+        "job_type": ("Job Type", "Work Type"),
+        "description": ("Description", "Summary", "Snippet"),
+        "apply_link": ("Apply Link", "Link", "URL"),
+        "salary": ("Salary",),
+    }
+
+    def __init__(self, api_key=None, robot_id=None, api_url=BROWSE_AI_API_URL, poll_interval=None, **kwargs):
+        super().__init__(**kwargs)
+        self.api_key = api_key or os.environ.get("BROWSE_AI_API_KEY", "")
+        self.robot_id = robot_id or os.environ.get("BROWSE_AI_ROBOT_ID", "")
+        self.api_url = api_url.rstrip("/")
+        self.poll_interval = poll_interval if poll_interval is not None else self.poll_interval
+
+    @property
+    def enabled(self):
+        return bool(self.api_key and self.robot_id)
+
+    def _field(self, row, field):
+        return next((row[column] for column in self.FIELDS[field] if row.get(column)), "")
+
+    def normalize(self, row, location):
+        salary_min, salary_max = _salary_range(self._field(row, "salary"))
+        posted = self._field(row, "published")
+        return build_job_record(
+            title=self._field(row, "title") or "Unknown",
+            company=self._field(row, "company") or "Unknown",
+            published=posted[:10] if re.match(r"\d{4}-\d{2}-\d{2}", posted) else _posted_date(posted),
+            location=self._field(row, "location") or location,
+            job_type=self._field(row, "job_type") or "N/A",
+            description=self._field(row, "description"),
+            apply_link=self._field(row, "apply_link"),
+            salary_min=salary_min,
+            salary_max=salary_max,
+        )
+
+    def search(self, role, location, job_type, salary_min, salary_max):
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        tasks_url = f"{self.api_url}/robots/{self.robot_id}/tasks"
+        response = get_http_session().post(
+            tasks_url, json={"inputParameters": {"role": role, "location": location}},
+            headers=headers, timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        task = response.json()["result"]
+
+        # Polled here rather than left to the fan-out timeout, which cannot stop this thread
+        deadline = time.monotonic() + self.timeout
+        while task.get("status") not in ("successful", "failed"):
+            if time.monotonic() + self.poll_interval > deadline:
+                raise TimeoutError(f"Browse AI task {task.get('id')} still {task.get('status')}")
+            time.sleep(self.poll_interval)
+            task = get_with_retries(f"{tasks_url}/{task['id']}", headers=headers).json()["result"]
+        if task["status"] == "failed":
+            raise RuntimeError(f"Browse AI task {task.get('id')} failed: {task.get('userFriendlyError')}")
+
+        captured = task.get("capturedLists") or {}
+        rows = next(iter(captured.values()), [])
+        return [self.normalize(row, location) for row in rows]
+
+
+PROVIDERS = {
+    "adzuna": AdzunaProvider,
+    "indeed": IndeedProvider,
+    "browseai": BrowseAIProvider,
+}
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(name):
+    """Process-wide provider instance, so rate limits and breakers span searches."""
+    with _providers_lock:
+        if name not in _providers:
+            _providers[name] = PROVIDERS[name]()
+        return _providers[name]
+
+
+def available_providers():
+    """Names of the providers that are configured (have their API keys)."""
+    return [name for name in PROVIDERS if get_provider(name).enabled]
+
+
+# --- Fan-out ---
+# Not the event loop's default executor: asyncio.run() waits for that one on exit,
+# so a search that timed out would still hold up the caller
+_executor = ThreadPoolExecutor(max_workers=PROVIDER_WORKERS, thread_name_prefix="job-provider")
+
+
+def merge_key(job):
+    """Same role at the same company and place, whichever source listed it."""
+    title = " ".join(str(job.get("Job Title") or "").lower().split())
+    return title, company_key(job.get("Company") or ""), str(job.get("Location") or "").lower()
+
+
+async def _run_provider(provider, query):
+    """(provider, jobs, error) for one provider; failures never escape the fan-out."""
+    if not provider.breaker.allow():
+        metrics.incr(f"job_scraper.providers.{provider.name}.skipped")
+        return provider, [], "circuit open"
+    await provider.limiter.acquire()
+    with metrics.span(f"job_scraper.providers.{provider.name}") as span:
+        try:
+            # Blocking HTTP (and the shared response cache) runs in a worker thread
+            search = asyncio.get_running_loop().run_in_executor(_executor, metrics.propagate(provider.search), *query)
+            jobs = await asyncio.wait_for(search, provider.timeout)
+        except Exception as e:
+            provider.breaker.record(ok=False)
+            span.add(failures=1)
+            # Not the exception text: request URLs carry API keys
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            logger.warning("%s search failed: %s", provider.name, status or type(e).__name__)
+            return provider, [], e
+        provider.breaker.record(ok=True)
+        span.add(jobs=len(jobs))
+    return provider, jobs, None
+
+
+def _resolve(providers):
+    return [get_provider(p) if isinstance(p, str) else p for p in providers]
+
+
+async def stream_provider_jobs(providers, role, location, job_type, salary_min, salary_max):
+    """Async generator of (provider name, new jobs, error) as each provider finishes.
+
+    Jobs another provider already returned (same merge_key) are dropped, so
+    the batches together form one de-duplicated result set.
+    """
+    query = (role, location, job_type, salary_min, salary_max)
+    tasks = [asyncio.ensure_future(_run_provider(provider, query))
+             for provider in _resolve(providers) if provider.enabled]
+    seen = set()
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            provider, jobs, error = await next_done
+            fresh = []
+            for job in jobs:
+                key = merge_key(job)
+                if key not in seen:
+                    seen.add(key)
+                    fresh.append(job)
+            yield provider.name, fresh, error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def collect_provider_jobs(providers, role, location, job_type, salary_min, salary_max):
+    jobs = []
+    async for _, fresh, _ in stream_provider_jobs(providers, role, location, job_type, salary_min, salary_max):
+        jobs.extend(fresh)
+    return jobs
+
+
+def get_jobs_from_providers(providers, role, location, job_type, salary_min, salary_max):
+    """Merged jobs of every given provider (names or instances), queried concurrently."""
+    with metrics.span("job_scraper.providers") as span:
+        jobs = asyncio.run(collect_provider_jobs(providers, role, location, job_type, salary_min, salary_max))
+        span.add(jobs=len(jobs))
+    # Worker threads classified new companies; persist them once per fan-out
+    get_company_cache().save()
+    return jobs
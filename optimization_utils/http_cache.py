@@ -0,0 +1,228 @@
+# ================================
+# optimization_utils/http_cache.py
+# ================================
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from optimization_utils import metrics
+
+DATA_DIR = os.environ.get("JOBHUNT_DATA_DIR", os.path.join(os.path.expanduser("~"), ".jobhunt"))
+DEFAULT_CACHE_PATH = os.path.join(DATA_DIR, "http_cache.sqlite3")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+# Freshness per source, in seconds
+SOURCE_TTLS = {
+    "adzuna": 15 * 60,
+    "job_description": 24 * 3600,
+    "default": 3600,
+}
+
+# Credentials never become part of the cache key
+IGNORED_KEY_PARAMS = {"app_id", "app_key", "api_key"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    cache_key TEXT PRIMARY KEY,
+    url TEXT, source TEXT, status INTEGER, headers TEXT, body BLOB,
+    size INTEGER, etag TEXT, last_modified TEXT,
+    stored_at REAL, last_access REAL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access);
+"""
+
+
+def normalize_url(url, params=None):
+    """Lower-case scheme/host, merge params into the query and sort it."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=False)
+    if params:
+        query += [(k, str(v)) for k, v in params.items() if v is not None and v != ""]
+    query = sorted((k, v) for k, v in query if k not in IGNORED_KEY_PARAMS)
+    path = parts.path or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def default_fetch(url, params=None, headers=None):
+    return requests.get(url, params=params, headers=headers, timeout=(5, 20))
+
+
+class CachedResponse:
+    """The parts of requests.Response callers here rely on."""
+
+    def __init__(self, url, status_code, headers, content, from_cache):
+        self.url = url
+        self.status_code = status_code
+        # Cached headers come back from JSON as a plain dict with whatever case the server used
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.from_cache = from_cache
+
+    @property
+    def encoding(self):
+        """The Content-Type charset; UTF-8 when the server names none."""
+        if "charset" not in self.headers.get("Content-Type", "").lower():
+            return "utf-8"
+        return get_encoding_from_headers(self.headers) or "utf-8"
+
+    @property
+    def text(self):
+        try:
+            return self.content.decode(self.encoding, errors="replace")
+        except LookupError:
+            # A charset Python does not know
+            return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for {self.url}", response=self)
+
+
+class HttpCache:
+    """SQLite-backed GET cache shared across processes and restarts.
+
+    Fresh entries (younger than the source TTL) are served directly. Stale
+    entries with an ETag or Last-Modified are revalidated with a conditional
+    request; a 304 refreshes them without re-downloading the body. The total
+    body size is capped and the least recently used entries are evicted.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES, ttls=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(SOURCE_TTLS, **(ttls or {}))
+        self.counters = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0}
+        self.source_counters = {}
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    # --- Counters ---
+    def _count(self, source, name):
+        metrics.incr(f"cache.http.{name}")
+        with self._lock:
+            self.counters[name] += 1
+            per_source = self.source_counters.setdefault(source, {"hits": 0, "misses": 0, "revalidated": 0})
+            per_source[name] += 1
+
+    def stats(self):
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            lookups = self.counters["hits"] + self.counters["misses"] + self.counters["revalidated"]
+            served = self.counters["hits"] + self.counters["revalidated"]
+            return dict(
+                self.counters,
+                entries=row[0],
+                bytes=row[1],
+                hit_rate=round(served / lookups, 3) if lookups else 0.0,
+                sources={source: dict(c) for source, c in self.source_counters.items()},
+            )
+
+    # --- Lookup ---
+    def get(self, url, params=None, source="default", fetch=default_fetch):
+        key_url = normalize_url(url, params)
+        cache_key = hashlib.sha1(key_url.encode("utf-8")).hexdigest()
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, etag, last_modified, stored_at FROM responses WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+
+        if row is not None:
+            status, headers, body, etag, last_modified, stored_at = row
+            if now - stored_at < self.ttls.get(source, self.ttls["default"]):
+                self._touch(cache_key, now, refresh=False)
+                self._count(source, "hits")
+                return CachedResponse(url, status, json.loads(headers), body, from_cache=True)
+
+            conditional = {}
+            if etag:
+                conditional["If-None-Match"] = etag
+            if last_modified:
+                conditional["If-Modified-Since"] = last_modified
+            if conditional:
+                response = fetch(url, params=params, headers=conditional)
+                if response.status_code == 304:
+                    self._touch(cache_key, now, refresh=True)
+                    self._count(source, "revalidated")
+                    return CachedResponse(url, status, json.loads(headers), body, from_cache=True)
+                return self._store(cache_key, key_url, source, response, now)
+
+        response = fetch(url, params=params)
+        return self._store(cache_key, key_url, source, response, now)
+
+    def _touch(self, cache_key, now, refresh):
+        with self._lock, self._conn:
+            if refresh:
+                self._conn.execute(
+                    "UPDATE responses SET last_access = ?, stored_at = ? WHERE cache_key = ?", (now, now, cache_key)
+                )
+            else:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE cache_key = ?", (now, cache_key))
+
+    def _store(self, cache_key, key_url, source, response, now):
+        self._count(source, "misses")
+        response.raise_for_status()
+        content = response.content
+        headers = {k: v for k, v in response.headers.items() if k.lower() in ("content-type", "etag", "last-modified")}
+        if response.status_code == 200 and len(content) <= self.max_bytes:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (cache_key, key_url, source, response.status_code, json.dumps(headers), content,
+                     len(content), response.headers.get("ETag"), response.headers.get("Last-Modified"), now, now),
+                )
+                self._evict()
+        return CachedResponse(response.url or key_url, response.status_code, headers, content, from_cache=False)
+
+    def _evict(self):
+        # Caller holds the lock and transaction
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for cache_key, size in self._conn.execute(
+            "SELECT cache_key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE cache_key = ?", (cache_key,))
+            self.counters["evictions"] += 1
+            metrics.incr("cache.http.evictions")
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """Process-wide cache; None when JOBHUNT_HTTP_CACHE=0."""
+    global _default_cache
+    if os.environ.get("JOBHUNT_HTTP_CACHE", "1") == "0":
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache()
+        return _default_cache
@@ -0,0 +1,290 @@
+# ================================
+# optimization_utils/metrics.py
+# ================================
+# Lightweight per-stage instrumentation: timed spans, counters and cache hit
+# rates, exported as a JSON run report or a Prometheus text file.
+#
+# A run records into its own Recorder:
+#
+#   with metrics.recording(Recorder()) as recorder:
+#       ...                      # spans and counters of this context only
+#   report = metrics.run_report(recorder)
+#
+# The recorder is held in a context variable, so concurrent runs (app
+# sessions, worker calls) never mix; thread pools pass it on with
+# propagate(). Outside any recording() block the process-wide recorder is
+# used, which is off by default (set JOBHUNT_METRICS=1 or call enable()).
+# With nothing recording, span() hands back a shared no-op object and
+# incr() / timed() return after a single lookup, so instrumented code pays
+# next to nothing.
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+from datetime import datetime
+
+PROMETHEUS_PREFIX = "jobhunt"
+
+
+class Recorder:
+    """Spans and counters of one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans = {}
+        self.counters = {}
+        self.started_at = time.time()
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+            self.counters.clear()
+            self.started_at = time.time()
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_span(self, name, seconds, count=1, max_seconds=None):
+        max_seconds = seconds if max_seconds is None else max_seconds
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                self.spans[name] = {"count": count, "total_seconds": seconds, "max_seconds": max_seconds}
+            else:
+                stats["count"] += count
+                stats["total_seconds"] += seconds
+                stats["max_seconds"] = max(stats["max_seconds"], max_seconds)
+
+    def merge(self, report):
+        """Add another run report (e.g. one returned by the pipeline worker) to this recorder."""
+        for name, stats in report["spans"].items():
+            self.record_span(name, stats["total_seconds"], stats["count"], stats["max_seconds"])
+        for name, value in report["counters"].items():
+            self.incr(name, value)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(stats) for name, stats in self.spans.items()}, dict(self.counters), self.started_at
+
+
+_enabled = os.environ.get("JOBHUNT_METRICS", "0") == "1"
+_process_recorder = Recorder()
+_current = contextvars.ContextVar("jobhunt_metrics_recorder", default=None)
+
+
+def enable(flag=True):
+    """Turn the process-wide recorder on or off (command line tools; sessions use recording())."""
+    global _enabled
+    _enabled = bool(flag)
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Forget everything the process-wide recorder holds."""
+    _process_recorder.reset()
+
+
+def current_recorder():
+    """The recorder this context records into, or None when nothing is recorded."""
+    recorder = _current.get()
+    if recorder is not None:
+        return recorder
+    return _process_recorder if _enabled else None
+
+
+@contextmanager
+def recording(recorder):
+    """Record everything in this context into recorder; None leaves recording as it is."""
+    if recorder is None:
+        yield None
+        return
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
+
+
+def propagate(fn):
+    """fn, made to record into the caller's recorder when a pool thread runs it."""
+    recorder = _current.get()
+    if recorder is None:
+        return fn
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _current.set(recorder)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return wrapper
+
+
+def merge_report(report):
+    """Add a run report recorded elsewhere to the current recorder, if any."""
+    recorder = current_recorder()
+    if recorder is not None and report:
+        recorder.merge(report)
+
+
+# --- Recording ---
+def incr(name, value=1):
+    recorder = current_recorder()
+    if recorder is not None:
+        recorder.incr(name, value)
+
+
+class Span:
+    """Times a with-block; add() attaches counts such as rows or bytes to the stage."""
+
+    __slots__ = ("name", "start", "recorder")
+
+    def __init__(self, name, recorder):
+        self.name = name
+        self.start = None
+        self.recorder = recorder
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder.record_span(self.name, time.perf_counter() - self.start)
+        if exc_type is not None:
+            self.recorder.incr(f"{self.name}.errors")
+        return False
+
+    def add(self, **counts):
+        for key, value in counts.items():
+            self.recorder.incr(f"{self.name}.{key}", value)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def add(self, **counts):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    recorder = current_recorder()
+    return Span(name, recorder) if recorder is not None else _NULL_SPAN
+
+
+def timed(name):
+    """Decorator form of span() for whole functions."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            recorder = current_recorder()
+            if recorder is None:
+                return fn(*args, **kwargs)
+            with Span(name, recorder):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count_cache(cache, hit):
+    """Counts a lookup in one of the caches as cache.<cache>.hits / .misses."""
+    incr(f"cache.{cache}.{'hits' if hit else 'misses'}")
+
+
+# --- Reports ---
+def cache_hit_rates(counters):
+    """Hit rate per cache from its cache.<name>.* counters (revalidations count as hits)."""
+    caches = {}
+    for name, value in counters.items():
+        parts = name.split(".")
+        if len(parts) == 3 and parts[0] == "cache":
+            caches.setdefault(parts[1], {})[parts[2]] = value
+    rates = {}
+    for cache, counts in caches.items():
+        served = counts.get("hits", 0) + counts.get("revalidated", 0)
+        lookups = served + counts.get("misses", 0)
+        rates[cache] = round(served / lookups, 3) if lookups else 0.0
+    return rates
+
+
+def run_report(recorder=None):
+    """Snapshot of a recorder (by default the current one) since it was created or reset."""
+    recorder = recorder or current_recorder() or _process_recorder
+    spans, counters, started_at = recorder.snapshot()
+    for stats in spans.values():
+        stats["mean_seconds"] = stats["total_seconds"] / stats["count"]
+        for key in ("total_seconds", "max_seconds", "mean_seconds"):
+            stats[key] = round(stats[key], 6)
+    return {
+        "started": datetime.fromtimestamp(started_at).isoformat(timespec="seconds"),
+        "elapsed_seconds": round(time.time() - started_at, 3),
+        "enabled": recorder is not _process_recorder or _enabled,
+        "spans": dict(sorted(spans.items())),
+        "counters": dict(sorted(counters.items())),
+        "cache_hit_rates": cache_hit_rates(counters),
+    }
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(report=None):
+    """Prometheus text exposition of a run report."""
+    report = report or run_report()
+    p = PROMETHEUS_PREFIX
+    lines = [
+        f"# HELP {p}_stage_seconds_total Time spent in each instrumented stage.",
+        f"# TYPE {p}_stage_seconds_total counter",
+    ]
+    lines += [f'{p}_stage_seconds_total{{stage="{_label(name)}"}} {stats["total_seconds"]}'
+              for name, stats in report["spans"].items()]
+    lines += [f"# HELP {p}_stage_calls_total Number of times each stage ran.",
+              f"# TYPE {p}_stage_calls_total counter"]
+    lines += [f'{p}_stage_calls_total{{stage="{_label(name)}"}} {stats["count"]}'
+              for name, stats in report["spans"].items()]
+    lines += [f"# HELP {p}_stage_max_seconds Slowest single run of each stage.",
+              f"# TYPE {p}_stage_max_seconds gauge"]
+    lines += [f'{p}_stage_max_seconds{{stage="{_label(name)}"}} {stats["max_seconds"]}'
+              for name, stats in report["spans"].items()]
+    lines += [f"# HELP {p}_events_total Counted items, bytes, errors and cache lookups.",
+              f"# TYPE {p}_events_total counter"]
+    lines += [f'{p}_events_total{{name="{_label(name)}"}} {value}' for name, value in report["counters"].items()]
+    lines += [f"# HELP {p}_cache_hit_ratio Share of lookups served from each cache.",
+              f"# TYPE {p}_cache_hit_ratio gauge"]
+    lines += [f'{p}_cache_hit_ratio{{cache="{_label(name)}"}} {rate}'
+              for name, rate in report["cache_hit_rates"].items()]
+    return "\n".join(lines) + "\n"
+
+
+def write_json_report(path, report=None):
+    report = report or run_report()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    return report
+
+
+def write_prometheus(path, report=None):
+    # Written to a temp file first so a scraper never reads a half-written file
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        fh.write(to_prometheus(report))
+    os.replace(tmp_path, path)
@@ -14,10 +14,6 @@ def compute_ats_scores_batch(resume_text, jobs_df):
     return match_resume_to_jobs(resume_text, jobs_df)
 
 def export_to_excel_in_memory(df):
-    from io import BytesIO
-    import pandas as pd
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Matched Jobs')
-    output.seek(0)
-    return output.read()
+    # openpyxl write-only mode; xlsxwriter is not a project dependency
+    from excel_exporter.export_excel import export_to_excel
+    return export_to_excel(df, sheet_name='Matched Jobs').read()
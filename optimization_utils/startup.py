@@ -0,0 +1,222 @@
+# ================================
+# optimization_utils/startup.py
+# ================================
+# Cold-start helpers. The app only imports what its first screen needs and
+# preload() pulls the heavy pipeline modules (pandas, scipy, requests/bs4,
+# PyMuPDF, ...) in on a background thread while the user fills in the form,
+# so the first Run does not pay for them.
+#
+#   python -m optimization_utils.startup --report       # cold import time per module
+#   python -m optimization_utils.startup --precompile   # write bytecode (e.g. at image build)
+#
+# Set JOBHUNT_PRELOAD=0 to keep the background imports off.
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import threading
+import importlib
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PROJECT_PACKAGES = (
+    "batch_pipeline", "cover_letter_generator", "excel_exporter", "frontend_ui", "job_scraper",
+    "optimization_utils", "resume_matcher",
+)
+
+# What the app process itself needs once results are on screen (tables, cover letters, exports)
+UI_MODULES = (
+    "pandas",
+    "job_scraper.job_table",
+    "job_scraper.job_scraper",
+    "cover_letter_generator.cover_letter",
+    "excel_exporter.export_excel",
+)
+# Everything a search runs: the above plus resume extraction, fetching and scoring
+PIPELINE_MODULES = UI_MODULES + (
+    "job_scraper.prefetch",
+    "resume_matcher.resume_extractor",
+    "resume_matcher.resume_profile",
+    "resume_matcher.match_resume",
+    "fitz",
+    "pdfplumber",
+    "docx2txt",
+)
+REPORT_TOP_N = 5
+
+
+# --- Lazy modules ---
+class LazyModule:
+    """Stand-in for `import name` that imports the module on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+def lazy_module(name):
+    """The module itself when it is already imported, else a LazyModule for it."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+# --- Warm-up ---
+def _warm_artifacts():
+    # Keyword matchers that are otherwise built on a first request
+    from resume_matcher.keyword_matcher import get_matcher
+    from resume_matcher.resume_parser import ALL_KEYWORDS
+
+    get_matcher(sorted(ALL_KEYWORDS))
+
+
+def warm_up(modules=PIPELINE_MODULES):
+    """Import modules (and build the shared keyword matchers); returns {module: seconds}.
+
+    A module that fails to import is logged and skipped: it fails again, with
+    its real error, where the pipeline uses it.
+    """
+    timings = {}
+    for module in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.warning("Preloading %s failed: %s", module, e)
+            continue
+        timings[module] = round(time.perf_counter() - start, 4)
+    if "resume_matcher.resume_profile" in timings:
+        start = time.perf_counter()
+        _warm_artifacts()
+        timings["keyword matchers"] = round(time.perf_counter() - start, 4)
+    logger.info("Warm-up took %.2fs", sum(timings.values()))
+    return timings
+
+
+_preload_thread = None
+_preload_lock = threading.Lock()
+
+
+def preload(modules=PIPELINE_MODULES):
+    """Start warm_up(modules) on a daemon thread once per process; returns the thread or None."""
+    global _preload_thread
+    if os.environ.get("JOBHUNT_PRELOAD", "1") == "0":
+        return None
+    with _preload_lock:
+        if _preload_thread is None:
+            _preload_thread = threading.Thread(target=warm_up, args=(modules,), name="jobhunt-preload", daemon=True)
+            _preload_thread.start()
+        return _preload_thread
+
+
+# --- Import-time report ---
+def parse_importtime(stderr):
+    """(depth, self_seconds, cumulative_seconds, module) rows from `python -X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        # One space after the bar, then two per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, int(self_us) / 1e6, int(cumulative_us) / 1e6, name.strip()))
+    return rows
+
+
+def cold_import(modules, python=sys.executable):
+    """Import modules in a fresh interpreter; returns (wall seconds, parsed -X importtime rows)."""
+    code = "; ".join(f"import {module}" for module in modules)
+    start = time.perf_counter()
+    proc = subprocess.run([python, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT, capture_output=True,
+                          text=True, check=False)
+    seconds = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{proc.stderr[-2000:]}")
+    return seconds, parse_importtime(proc.stderr)
+
+
+def _own_rows(rows, module):
+    # Rows come children first, so a module's imports are the ones just before its top-level row
+    for end in range(len(rows) - 1, -1, -1):
+        if rows[end][0] == 0 and rows[end][3] == module:
+            start = end
+            while start > 0 and rows[start - 1][0] > 0:
+                start -= 1
+            return rows[start:end + 1]
+    return []
+
+
+def import_report(modules=PIPELINE_MODULES, top_n=REPORT_TOP_N, python=sys.executable):
+    """Cold import cost of each module on its own and of all of them together.
+
+    Each module's row lists its top_n most expensive direct imports, which is
+    usually enough to see which dependency a regression came in with.
+    """
+    report = {"modules": {}}
+    for module in modules:
+        seconds, rows = cold_import([module], python)
+        own = _own_rows(rows, module)
+        children = sorted((row for row in own[:-1] if row[0] == 1), key=lambda row: row[2], reverse=True)
+        report["modules"][module] = {
+            "import_seconds": round(own[-1][2], 4) if own else 0.0,
+            "process_seconds": round(seconds, 4),
+            "slowest": {row[3]: round(row[2], 4) for row in children[:top_n]},
+        }
+    seconds, rows = cold_import(modules, python)
+    report["all"] = {
+        "import_seconds": round(sum(row[2] for row in rows if row[0] == 0 and row[3] in modules), 4),
+        "process_seconds": round(seconds, 4),
+    }
+    return report
+
+
+def format_import_report(report):
+    lines = [f"{'module':<40} {'import':>8} {'process':>8}  slowest imports"]
+    for module, stats in report["modules"].items():
+        slowest = ", ".join(f"{name} {seconds:.3f}" for name, seconds in stats["slowest"].items())
+        lines.append(f"{module:<40} {stats['import_seconds']:>8.3f} {stats['process_seconds']:>8.3f}  {slowest}")
+    lines.append(f"{'(all together)':<40} {report['all']['import_seconds']:>8.3f} "
+                 f"{report['all']['process_seconds']:>8.3f}")
+    return "\n".join(lines)
+
+
+# --- Bytecode ---
+def precompile(root=PROJECT_ROOT, packages=PROJECT_PACKAGES):
+    """Write .pyc files for the project packages; False when any module failed to compile."""
+    import compileall
+
+    # A list, so a failure in one package does not skip the others
+    return all([compileall.compile_dir(os.path.join(root, package), quiet=1) for package in packages])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start report and helpers.")
+    parser.add_argument("--report", action="store_true", help="Print the cold import time of each pipeline module")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    parser.add_argument("--module", dest="modules", action="append", help="Report on this module (repeatable)")
+    parser.add_argument("--precompile", action="store_true", help="Compile the project's bytecode up front")
+    args = parser.parse_args(argv)
+
+    if args.precompile and not precompile():
+        return 1
+    if args.report or not args.precompile:
+        report = import_report(tuple(args.modules) if args.modules else PIPELINE_MODULES)
+        print(format_import_report(report))
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+                fh.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
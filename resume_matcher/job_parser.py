@@ -1,5 +1,12 @@
+import re
+import functools
+import importlib.util
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from optimization_utils import metrics
+from optimization_utils.http_cache import CachedResponse, get_default_cache
+from resume_matcher.keyword_matcher import get_matcher
 
 # === Expanded Functional Keywords ===
 FUNCTIONAL_KEYWORDS = [
@@ -92,23 +99,121 @@ CERTIFICATION_KEYWORDS = [
 
 ALL_KEYWORDS = set(
     kw.lower() for kw in (
-        BUSINESS_KEYWORDS + FUNCTIONAL_KEYWORDS + TECHNICAL_KEYWORDS + EDUCATION_KEYWORDS + CERTIFICATION_KEYWORDS
+        FUNCTIONAL_KEYWORDS + TECHNICAL_KEYWORDS + SOFT_SKILL_KEYWORDS + EDUCATION_KEYWORDS + CERTIFICATION_KEYWORDS
     )
 )
+ALL_KEYWORDS_MATCHER = get_matcher(sorted(ALL_KEYWORDS))
+
+
+# === Job page fetching and parsing ===
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+STREAM_CHUNK_BYTES = 64 * 1024
+# Apply Links resolved to the ad's own site (redirect targets do not change between runs)
+RESOLVED_URL_CACHE_SIZE = 4096
+# Markup handed to the parser, counted from the description's start tag
+MAX_PARSE_CHARS = 256 * 1024
+
+# Elements that hold the description, most specific first
+DESCRIPTION_TARGETS = [
+    ("div", "class", "job-description"),
+    ("div", "id", "job-description"),
+    ("section", "class", "adp-body"),  # Adzuna's own ad pages
+]
+
+# lxml is several times faster than the pure-Python parser when it is installed
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+
+def is_html(content_type):
+    content_type = (content_type or "").lower()
+    return not content_type or "html" in content_type or content_type.startswith("text/")
+
+
+def fetch_page(url, params=None, headers=None, max_bytes=MAX_PAGE_BYTES):
+    """GET with a timeout. The body is streamed and cut off at max_bytes; non-HTML bodies are not read."""
+    headers = {"User-Agent": "Mozilla/5.0", **(headers or {})}
+    with requests.get(url, params=params, headers=headers, timeout=(5, 20), stream=True) as response:
+        content = b""
+        if response.status_code == 200 and is_html(response.headers.get("Content-Type")):
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(STREAM_CHUNK_BYTES):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= max_bytes:
+                    break
+            content = b"".join(chunks)[:max_bytes]
+        return CachedResponse(response.url or url, response.status_code, response.headers, content, from_cache=False)
+
+
+@functools.lru_cache(maxsize=RESOLVED_URL_CACHE_SIZE)
+def resolve_redirects(url):
+    """The URL a GET of url ends at after HTTP redirects, found with a HEAD request."""
+    with requests.head(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=(5, 10), allow_redirects=True) as response:
+        return response.url or url
+
+
+def _target_pattern(tag, attr, value):
+    # Start tag of the target element, so parsing can begin right there
+    return re.compile(
+        rf"<{tag}\b[^>]*\b{attr}\s*=\s*[\"']?[^\"'>]*\b{re.escape(value)}\b", re.IGNORECASE
+    )
+
+
+_TARGET_PATTERNS = [
+    # The attribute is matched as one whitespace-separated word of its value ("x job-description y")
+    (tag, {attr: re.compile(rf"(?:^|\s){re.escape(value)}(?:\s|$)")}, _target_pattern(tag, attr, value))
+    for tag, attr, value in DESCRIPTION_TARGETS
+]
+
+
+def _find_start_tag(pattern, markup):
+    """Offset of the first match that is not inside a <script> block, or None."""
+    lower = None
+    for found in pattern.finditer(markup):
+        lower = lower or markup.lower()
+        if lower.rfind("<script", 0, found.start()) <= lower.rfind("</script", 0, found.start()):
+            return found.start()
+    return None
+
+
+def _element_lines(elements):
+    lines = []
+    seen = set()
+    for element in elements:
+        text = element.get_text(separator=" ", strip=True)
+        if text and text not in seen:
+            lines.append(text)
+            seen.add(text)
+    return lines
+
+
+def parse_description_html(markup):
+    """Description text of a job page, one paragraph or list item per line.
+
+    Only the target element is turned into a tree: the markup before its start
+    tag is skipped and a SoupStrainer drops everything outside it. Pages
+    without a known target fall back to their paragraphs and list items.
+    """
+    for tag, attrs, pattern in _TARGET_PATTERNS:
+        start = _find_start_tag(pattern, markup)
+        if start is None:
+            continue
+        soup = BeautifulSoup(markup[start:start + MAX_PARSE_CHARS], HTML_PARSER, parse_only=SoupStrainer(tag, attrs=attrs))
+        target = soup.find(tag, attrs=attrs)
+        if target is not None:
+            return "\n".join(_element_lines(target.find_all(["p", "li"])) or [target.get_text("\n", strip=True)])
+
+    soup = BeautifulSoup(markup[:MAX_PARSE_CHARS], HTML_PARSER, parse_only=SoupStrainer(["p", "li"]))
+    return "\n".join(_element_lines(soup.find_all(["p", "li"])))
 
 
+@metrics.timed("resume_matcher.fetch_job_description")
 def fetch_job_description(url):
-    headers = {"User-Agent": "Mozilla/5.0"}
-    response = requests.get(url, headers=headers)
+    cache = get_default_cache()
+    response = cache.get(url, source="job_description", fetch=fetch_page) if cache else fetch_page(url)
     response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
-    desc_div = soup.find("div", class_="job-description") or soup.find("div", id="job-description")
-    if not desc_div:
-        # fallback: return whole page text
-        return soup.get_text(separator="\n")
-    paragraphs = desc_div.find_all(["p", "li"])
-    lines = [p.get_text(separator=" ", strip=True) for p in paragraphs if p.get_text(strip=True)]
-    return "\n".join(lines)
+    return parse_description_html(response.text)
 
 def extract_key_requirements(job_desc_text):
     lines = job_desc_text.splitlines()
@@ -118,8 +223,7 @@ def extract_key_requirements(job_desc_text):
         clean_line = line.strip()
         if len(clean_line) < 10:
             continue
-        lower_line = clean_line.lower()
-        if any(k in lower_line for k in ALL_KEYWORDS):
+        if ALL_KEYWORDS_MATCHER.contains_any(clean_line):
             if clean_line not in seen:
                 requirements.append(f"• {clean_line}")
                 seen.add(clean_line)
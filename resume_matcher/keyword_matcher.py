@@ -0,0 +1,132 @@
+# ================================
+# resume_matcher/keyword_matcher.py
+# ================================
+import re
+from functools import lru_cache
+
+# Words, plus single symbol characters so "c#", "c++" and "ci/cd" tokenize consistently.
+# TOKEN_PATTERN and tokenize are part of the scoring fingerprint (match_resume.SCORING_INPUTS)
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+_END = object()
+
+
+def tokenize(text):
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class KeywordMatcher:
+    """Token trie built once per keyword set.
+
+    Text is tokenized a single time and every whole-word / whole-phrase hit is
+    found in one left-to-right pass, so short keywords like "r" or "go" no
+    longer match inside other words.
+    """
+
+    def __init__(self, keywords):
+        self.root = {}
+        self.keywords = []
+        for keyword in keywords:
+            tokens = tokenize(keyword)
+            if not tokens:
+                continue
+            node = self.root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            hits = node.setdefault(_END, [])
+            if keyword not in hits:
+                hits.append(keyword)
+                self.keywords.append(keyword)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def match_tokens(self, tokens):
+        """Yield (token_index, keyword) for every hit in an already tokenized text."""
+        root = self.root
+        n = len(tokens)
+        for start in range(n):
+            node = root.get(tokens[start])
+            pos = start + 1
+            while node is not None:
+                hits = node.get(_END)
+                if hits:
+                    for keyword in hits:
+                        yield start, keyword
+                if pos >= n:
+                    break
+                node = node.get(tokens[pos])
+                pos += 1
+
+    def iter_matches(self, text):
+        return self.match_tokens(tokenize(text))
+
+    def find_all(self, text):
+        """All keyword hits in text order, repeats included."""
+        return [keyword for _, keyword in self.iter_matches(text)]
+
+    def keywords_in(self, text):
+        return {keyword for _, keyword in self.iter_matches(text)}
+
+    def contains_any(self, text):
+        for _ in self.iter_matches(text):
+            return True
+        return False
+
+
+class PhraseIndex:
+    """Hash lookup of token n-grams; same hits as KeywordMatcher.
+
+    Cheaper to build than the trie for very large vocabularies of long
+    phrases (e.g. every requirement line of thousands of jobs), at the cost
+    of one lookup per candidate phrase length per token when scanning.
+    """
+
+    def __init__(self, keywords):
+        self.phrases = {}
+        self.keywords = []
+        for keyword in keywords:
+            tokens = tuple(tokenize(keyword))
+            if not tokens:
+                continue
+            hits = self.phrases.setdefault(tokens, [])
+            if keyword not in hits:
+                hits.append(keyword)
+                self.keywords.append(keyword)
+        # Only try the phrase lengths that actually start with a given token
+        lengths = {}
+        for tokens in self.phrases:
+            lengths.setdefault(tokens[0], set()).add(len(tokens))
+        self.lengths = {first: sorted(found) for first, found in lengths.items()}
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def match_tokens(self, tokens):
+        phrases = self.phrases
+        n = len(tokens)
+        for start in range(n):
+            for length in self.lengths.get(tokens[start], ()):
+                if start + length > n:
+                    break
+                hits = phrases.get(tuple(tokens[start:start + length]))
+                if hits:
+                    for keyword in hits:
+                        yield start, keyword
+
+    iter_matches = KeywordMatcher.iter_matches
+    find_all = KeywordMatcher.find_all
+    keywords_in = KeywordMatcher.keywords_in
+    contains_any = KeywordMatcher.contains_any
+
+
+@lru_cache(maxsize=64)
+def _build_matcher(keywords):
+    return KeywordMatcher(keywords)
+
+
+def get_matcher(keywords):
+    """Shared matcher for a static keyword list; built on first use only."""
+    return _build_matcher(tuple(keywords))
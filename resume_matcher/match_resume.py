@@ -1,16 +1,26 @@
 # ================================
 # resume_matcher/match_resume.py
 # ================================
-import re
+import hashlib
+import numpy as np
 import pandas as pd
 
-def extract_name(resume_text):
-    lines = [line.strip() for line in resume_text.split('\n') if line.strip()]
-    for line in lines[:10]:
-        # Check if line looks like a name: 2-4 words, each starting with uppercase
-        if 2 <= len(line.split()) <= 4 and all(w[0].isupper() for w in line.split() if w[0].isalpha()):
-            return line
-    return "Applicant"
+from optimization_utils import metrics
+from resume_matcher import keyword_matcher, resume_profile
+from resume_matcher.resume_profile import ResumeProfile, as_profile, guess_name
+from resume_matcher.score_cache import get_score_cache
+from resume_matcher.sparse_scoring import JobRequirementIndex, score_matrix, split_requirement, top_k_indices, top_k_per_row
+
+# Bump for scoring changes the fingerprint (see SCORING_VERSION below) cannot
+# see: anything the fingerprinted functions call that is not listed there
+SCORING_REVISION = 1
+
+def extract_name(resume):
+    if isinstance(resume, ResumeProfile):
+        return resume.name or "Applicant"
+    lines = [line.strip() for line in resume.split('\n') if line.strip()]
+    # Check if a top line looks like a name: 2-4 words, each starting with uppercase
+    return guess_name(lines) or "Applicant"
 
 def extract_key_requirements(job_text):
     # Extract key sentences or bullets from job text heuristically
@@ -24,21 +34,20 @@ def extract_key_requirements(job_text):
     # But here just return extracted first 10
     return filtered[:15]
 
-def extract_strengths(resume_text, key_requirements):
-    resume_text_lower = resume_text.lower()
+def extract_strengths(resume, key_requirements):
+    """Requirements covered by the resume (text or ResumeProfile)."""
+    profile = as_profile(resume)
     strengths = []
     for req in key_requirements:
-        # Match ignoring case, but look for important keywords only
-        # Also handle partial match for phrases split by commas or 'or'
-        req_parts = re.split(r",| or ", req.lower())
-        if any(part.strip() in resume_text_lower for part in req_parts):
+        # Handle partial match for phrases split by commas or 'or' (whole-word, case-insensitive)
+        if any(profile.contains_phrase(part) for part in split_requirement(req)):
             strengths.append(req.strip())
     return strengths
 
-def identify_improvements(key_requirements, strengths, resume_text):
+def identify_improvements(key_requirements, strengths, resume):
     improvements = [req for req in key_requirements if req not in strengths]
     # Additional custom improvement: ArchiMate mention
-    if "archimate" not in resume_text.lower():
+    if "archimate" not in as_profile(resume).lower:
         improvements.append("Familiarity with ArchiMate is advantageous but not currently mentioned in resume.")
     return improvements
 
@@ -74,40 +83,172 @@ def generate_summary(ats_score, key_reqs, strengths, improvements):
         summary_lines.append("No major areas for improvement identified.")
     return "\n".join(summary_lines)
 
-def match_resume_to_jobs(resume_text, jobs_df):
-    results = []
-    for _, job in jobs_df.iterrows():
-        job_text = job.get("Description") or job.get("description") or ""
-        # Compose full job text with title and company for better extraction
-        job_text_full = f"{job.get('Job Title', '')} at {job.get('Company', '')}. {job_text}"
-
-        key_reqs = extract_key_requirements(job_text_full)
-        strengths = extract_strengths(resume_text, key_reqs)
-        improvements = identify_improvements(key_reqs, strengths, resume_text)
-        ats_score = calculate_ats_score(key_reqs, strengths)
-        summary = generate_summary(ats_score, key_reqs, strengths, improvements)
-        applicant_name = extract_name(resume_text)
-
-        results.append({
-            "Job Title": job.get("Job Title") or job.get("title", ""),
-            "Company": job.get("Company") or job.get("company", ""),
-            "Location": job.get("Location") or job.get("location", ""),
-            "Date Published": job.get("Date Published") or job.get("date", ""),
-            "Published By": job.get("Published By") or job.get("publisher", ""),
-            "Link": job.get("Link") or job.get("link", ""),
-            "Key Requirements": format_bullets(key_reqs),
-            "Score (ATS)": f"{ats_score}%",
-            "Resume Strengths": format_bullets(strengths),
-            "Improvement Areas": format_bullets(improvements),
-            "Summary": format_bullets(summary.split("\n")),
-            "Applicant": applicant_name
-        })
-
-    df = pd.DataFrame(results)
+def compose_job_text(job):
+    job_text = job.get("Description") or job.get("description") or ""
+    # Compose full job text with title and company for better extraction
+    return f"{job.get('Job Title', '')} at {job.get('Company', '')}. {job_text}"
+
+def job_content_hash(job):
+    # Exactly the text scoring reads, so any change that could move the score changes the hash
+    return hashlib.sha1(compose_job_text(job).encode("utf-8")).hexdigest()
+
+def score_columns(resume, key_reqs, strengths):
+    """The columns of a match row that depend on both resume and job (what the score memo keeps)."""
+    improvements = identify_improvements(key_reqs, strengths, resume)
+    ats_score = calculate_ats_score(key_reqs, strengths)
+    summary = generate_summary(ats_score, key_reqs, strengths, improvements)
+    return {
+        "Key Requirements": format_bullets(key_reqs),
+        "Score (ATS)": f"{ats_score}%",
+        "Resume Strengths": format_bullets(strengths),
+        "Improvement Areas": format_bullets(improvements),
+        "Summary": format_bullets(summary.split("\n")),
+    }
+
+def _fingerprint_parts(obj):
+    # Bytecode, constants and names, but not line numbers: comments and moved code do not count
+    if hasattr(obj, "__code__"):
+        obj = obj.__code__
+    elif hasattr(obj, "func"):  # cached_property
+        obj = obj.func.__code__
+    elif hasattr(obj, "pattern"):
+        return [repr(obj.pattern)]
+    elif isinstance(obj, frozenset):  # set literals: repr order varies with hash seed
+        return [repr(sorted(obj, key=repr))]
+    elif not hasattr(obj, "co_code"):
+        return [repr(obj)]
+    parts = [obj.co_code.hex(), repr(obj.co_names)]
+    for const in obj.co_consts:
+        parts += _fingerprint_parts(const)
+    return parts
+
+def scoring_fingerprint(objects):
+    """Short hash of the code and constants that decide the scored columns."""
+    digest = hashlib.sha1()
+    for obj in objects:
+        digest.update("\n".join(_fingerprint_parts(obj)).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+# Memoised scores (score_cache) are served only under the same version, so any
+# edit to these, in this module or the ones that own them, drops the memo
+SCORING_INPUTS = [
+    compose_job_text, extract_key_requirements, extract_strengths, identify_improvements, calculate_ats_score,
+    format_bullets, generate_summary, score_columns, split_requirement,
+    ResumeProfile.__init__, ResumeProfile.__dict__["ngrams"], ResumeProfile.contains_phrase, as_profile,
+    resume_profile.NGRAM_SIZE, keyword_matcher.tokenize, keyword_matcher.TOKEN_PATTERN,
+]
+SCORING_VERSION = f"{SCORING_REVISION}-{scoring_fingerprint(SCORING_INPUTS)}"
+
+def match_row(job, scored, applicant_name):
+    return {
+        "Job Title": job.get("Job Title") or job.get("title", ""),
+        "Company": job.get("Company") or job.get("company", ""),
+        "Location": job.get("Location") or job.get("location", ""),
+        "Date Published": job.get("Date Published") or job.get("Published") or job.get("date", ""),
+        "Published By": job.get("Published By") or job.get("publisher", ""),
+        "Link": job.get("Link") or job.get("Apply Link") or job.get("link", ""),
+        **scored,
+        "Applicant": applicant_name
+    }
+
+def build_match_row(job, resume, key_reqs, strengths, applicant_name):
+    return match_row(job, score_columns(resume, key_reqs, strengths), applicant_name)
+
+def sort_by_score(df):
     df["Score (ATS)"] = df["Score (ATS)"].str.rstrip('%').astype(float)
-    df = df.sort_values(by="Score (ATS)", ascending=False)
+    df = df.sort_values(by="Score (ATS)", ascending=False, kind="stable")
     df["Score (ATS)"] = df["Score (ATS)"].astype(str) + "%"
     return df
 
+def match_resume_to_jobs(resume, jobs_df, score_cache=None):
+    """Match rows for every job, best score first; the index is the job's row in jobs_df.
+
+    Pairs already in the score memo (score_cache, by default the process-wide
+    one from get_score_cache) are not scored again: after a new scrape only
+    the new or changed jobs cost any work.
+    """
+    with metrics.span("resume_matcher.match_resume_to_jobs") as span:
+        profile = as_profile(resume)
+        applicant_name = extract_name(profile)
+        cache = get_score_cache() if score_cache is None else score_cache
+        jobs = jobs_df.to_dict("records")
+        job_hashes = [job_content_hash(job) for job in jobs] if cache is not None else [None] * len(jobs)
+        memo = cache.get_many(profile.fingerprint, job_hashes) if cache is not None else {}
+
+        results = []
+        fresh = {}
+        scored_count = 0
+        for job, job_hash in zip(jobs, job_hashes):
+            scored = memo.get(job_hash) or fresh.get(job_hash)
+            if scored is None:
+                key_reqs = extract_key_requirements(compose_job_text(job))
+                scored = score_columns(profile, key_reqs, extract_strengths(profile, key_reqs))
+                scored_count += 1
+                if job_hash is not None:
+                    fresh[job_hash] = scored
+            results.append(match_row(job, scored, applicant_name))
+        if fresh:
+            cache.put_many(profile.fingerprint, fresh)
+        span.add(jobs=len(results), scored=scored_count)
+
+        return sort_by_score(pd.DataFrame(results))
+
+@metrics.timed("resume_matcher.build_requirement_index")
+def build_requirement_index(jobs_df):
+    """Encode the key requirements of every job once; reusable across resumes."""
+    jobs = jobs_df.to_dict("records")
+    return jobs, JobRequirementIndex(extract_key_requirements(compose_job_text(job)) for job in jobs)
+
+@metrics.timed("resume_matcher.match_resume_to_jobs_batch")
+def match_resume_to_jobs_batch(resume, jobs_df, top_k=50, requirement_index=None):
+    """Batch mode of match_resume_to_jobs.
+
+    All ATS scores come from one sparse product over the encoded jobs; the
+    explanation columns are only built for the top_k rows (None = all rows).
+    """
+    profile = as_profile(resume)
+    jobs, index = requirement_index or build_requirement_index(jobs_df)
+    scores, req_hits = index.score(profile)
+    applicant_name = extract_name(profile)
+
+    results = []
+    for job_id in top_k_indices(scores, top_k):
+        strengths = index.strengths_for(job_id, req_hits)
+        results.append(build_match_row(jobs[job_id], profile, index.key_reqs[job_id], strengths, applicant_name))
+
+    return sort_by_score(pd.DataFrame(results))
+
+@metrics.timed("resume_matcher.match_resumes_to_jobs")
+def match_resumes_to_jobs(resumes, jobs_df, top_k=10, chunk_size=128, requirement_index=None):
+    """Score N resumes against M jobs with the job side encoded once.
+
+    Returns (scores, rankings): the N x M ATS score matrix and a DataFrame
+    with the top_k jobs of every resume. "Candidate Rank" is the resume's
+    position among all resumes for that job.
+    """
+    profiles = [as_profile(resume) for resume in resumes]
+    jobs, index = requirement_index or build_requirement_index(jobs_df)
+    scores = score_matrix(index, profiles, chunk_size)
+
+    # 1-based rank of each resume within every job column
+    candidate_ranks = np.empty(scores.shape, dtype=np.int64)
+    order = np.argsort(-scores, axis=0, kind="stable")
+    np.put_along_axis(candidate_ranks, order, np.arange(1, scores.shape[0] + 1)[:, None], axis=0)
 
+    rankings = []
+    for resume_id, job_ids in enumerate(top_k_per_row(scores, top_k)):
+        applicant_name = extract_name(profiles[resume_id])
+        for rank, job_id in enumerate(job_ids, start=1):
+            job = jobs[job_id]
+            rankings.append({
+                "Resume": resume_id,
+                "Applicant": applicant_name,
+                "Job": int(job_id),
+                "Job Title": job.get("Job Title") or job.get("title", ""),
+                "Company": job.get("Company") or job.get("company", ""),
+                "Score (ATS)": f"{round(float(scores[resume_id, job_id]), 1)}%",
+                "Job Rank": rank,
+                "Candidate Rank": int(candidate_ranks[resume_id, job_id]),
+            })
 
+    return scores, pd.DataFrame(rankings)
@@ -0,0 +1,176 @@
+# ================================
+# resume_matcher/resume_extractor.py
+# ================================
+# Extracted resume text is cached by file content hash in memory and, since
+# resumes hold personal data, in a small owner-only directory on disk whose
+# oldest files are removed. Set JOBHUNT_RESUME_TEXT_CACHE=0 to keep extracted
+# text in memory only.
+import os
+import time
+import hashlib
+import threading
+from io import BytesIO
+from collections import OrderedDict
+
+from optimization_utils import metrics
+
+DATA_DIR = os.environ.get("JOBHUNT_DATA_DIR", os.path.join(os.path.expanduser("~"), ".jobhunt"))
+TEXT_CACHE_DIR = os.path.join(DATA_DIR, "resume_text")
+
+MAX_RESUME_BYTES = 20 * 1024 * 1024
+MAX_RESUME_PAGES = 50
+MEMORY_CACHE_SIZE = 64
+DISK_CACHE_SIZE = 32
+DISK_CACHE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+_memory_cache = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+
+class ResumeError(ValueError):
+    """A resume that cannot be read; the message is meant for the user."""
+
+
+# --- File helpers ---
+def read_file_bytes(file):
+    """Bytes of an uploaded file, a path, or raw bytes."""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if isinstance(file, str):
+        with open(file, "rb") as fh:
+            return fh.read()
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    file.seek(0)
+    return file.read()
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# --- PDF extraction ---
+def extract_pdf_text_fast(data, max_pages=MAX_RESUME_PAGES):
+    # Serial: PyMuPDF is not thread-safe, and at MAX_RESUME_PAGES pages worker
+    # processes cost more to start than they save
+    import fitz
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return " ".join(doc[i].get_text() for i in range(min(doc.page_count, max_pages)))
+
+
+def extract_pdf_text_plumber(data, max_pages=MAX_RESUME_PAGES):
+    import pdfplumber
+    with pdfplumber.open(BytesIO(data)) as pdf:
+        texts = (page.extract_text() for page in pdf.pages[:max_pages])
+        return " ".join(text for text in texts if text)
+
+
+def extract_pdf_text(data, max_pages=MAX_RESUME_PAGES):
+    """PyMuPDF first; pdfplumber only when it fails or finds no text."""
+    try:
+        text = extract_pdf_text_fast(data, max_pages)
+    except Exception:
+        text = ""
+    if text.strip():
+        return text
+    return extract_pdf_text_plumber(data, max_pages)
+
+
+def extract_docx_text(data):
+    import docx2txt
+    return docx2txt.process(BytesIO(data))
+
+
+# --- Cache ---
+def disk_cache_enabled():
+    return os.environ.get("JOBHUNT_RESUME_TEXT_CACHE", "1") != "0"
+
+
+def _cache_get(key):
+    with _memory_cache_lock:
+        if key in _memory_cache:
+            _memory_cache.move_to_end(key)
+            return _memory_cache[key]
+    if not disk_cache_enabled():
+        return None
+    path = os.path.join(TEXT_CACHE_DIR, f"{key}.txt")
+    try:
+        with open(path, encoding="utf-8") as fh:
+            text = fh.read()
+        # The mtime doubles as the last use, for _prune_disk_cache
+        os.utime(path)
+    except OSError:
+        return None
+    _cache_put(key, text, persist=False)
+    return text
+
+
+def _prune_disk_cache(max_files=DISK_CACHE_SIZE, max_age=DISK_CACHE_MAX_AGE_SECONDS):
+    """Remove cached texts unused for max_age seconds, then the least recently used beyond max_files."""
+    entries = []
+    for entry in os.scandir(TEXT_CACHE_DIR):
+        if entry.name.endswith(".txt"):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
+    entries.sort(reverse=True)
+    now = time.time()
+    for rank, (mtime, path) in enumerate(entries):
+        if rank >= max_files or now - mtime > max_age:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _cache_put(key, text, persist=True):
+    with _memory_cache_lock:
+        _memory_cache[key] = text
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    if persist and disk_cache_enabled():
+        try:
+            os.makedirs(TEXT_CACHE_DIR, mode=0o700, exist_ok=True)
+            tmp_path = os.path.join(TEXT_CACHE_DIR, f"{key}.{os.getpid()}.tmp")
+            # Readable by this user only
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(text)
+            os.replace(tmp_path, os.path.join(TEXT_CACHE_DIR, f"{key}.txt"))
+            _prune_disk_cache()
+        except OSError:
+            pass
+
+
+# --- Main entry point ---
+def extract_resume_text(file, filename=None, max_pages=MAX_RESUME_PAGES, max_bytes=MAX_RESUME_BYTES):
+    """Plain text of a .pdf or .docx resume, cached by file content hash.
+
+    Raises ResumeError for a file larger than max_bytes.
+    """
+    name = (filename or getattr(file, "name", "") or (file if isinstance(file, str) else "")).lower()
+    with metrics.span("resume_matcher.extract_resume_text") as span:
+        data = read_file_bytes(file)
+        span.add(bytes=len(data))
+        if len(data) > max_bytes:
+            raise ResumeError(f"The resume file is {len(data) / 2 ** 20:.1f} MB; the limit is "
+                              f"{max_bytes / 2 ** 20:.0f} MB.")
+
+        if name.endswith(".pdf"):
+            kind = "pdf"
+        elif name.endswith(".docx"):
+            kind = "docx"
+        else:
+            return ""
+
+        key = f"{content_hash(data)}-{kind}-{max_pages}"
+        text = _cache_get(key)
+        metrics.count_cache("resume_text", hit=text is not None)
+        if text is not None:
+            return text
+
+        text = extract_pdf_text(data, max_pages) if kind == "pdf" else extract_docx_text(data)
+        _cache_put(key, text)
+        return text
@@ -1,5 +1,8 @@
 import re
 
+from optimization_utils import metrics
+from resume_matcher.keyword_matcher import get_matcher
+
 # === Expanded Functional Keywords ===
 FUNCTIONAL_KEYWORDS = [
     "data modeling", "data governance", "metadata", "mdm", "master data management",
@@ -110,12 +113,19 @@ def split_into_sentences(text):
 
 def find_skill_sentences(text, keywords, max_sentences=15):
     sentences = split_into_sentences(text)
+    matcher = get_matcher(keywords)
+    # One pass per sentence, then keep the keyword-major ordering of results
+    sentences_by_keyword = {}
+    for idx, sent in enumerate(sentences):
+        for keyword in matcher.keywords_in(sent):
+            sentences_by_keyword.setdefault(keyword, []).append(idx)
+
     found = []
     seen = set()
     for keyword in keywords:
-        key_lower = keyword.lower()
-        for sent in sentences:
-            if key_lower in sent.lower() and sent not in seen:
+        for idx in sentences_by_keyword.get(keyword, ()):
+            sent = sentences[idx]
+            if sent not in seen:
                 found.append(sent)
                 seen.add(sent)
                 if len(found) >= max_sentences:
@@ -127,6 +137,7 @@ def format_as_bullets(sentences):
         return ["• Not Found"]
     return [f"• {sentence.strip()}" for sentence in sentences]
 
+@metrics.timed("resume_matcher.parse_resume")
 def parse_resume(resume_text):
     name = extract_name(resume_text)
 
@@ -0,0 +1,84 @@
+# ================================
+# resume_matcher/resume_profile.py
+# ================================
+import hashlib
+from functools import cached_property
+
+from resume_matcher.keyword_matcher import get_matcher, tokenize
+
+# NGRAM_SIZE, __init__, ngrams and contains_phrase decide strength matching and
+# are part of the scoring fingerprint (match_resume.SCORING_INPUTS); a scoring
+# change elsewhere in here needs match_resume.SCORING_REVISION bumped
+NGRAM_SIZE = 3
+
+
+def guess_name(lines):
+    """First of the top lines that looks like a name: 2-4 words, each capitalised."""
+    for line in lines[:10]:
+        words = line.split()
+        if 2 <= len(words) <= 4 and all(w[0].isupper() for w in words if w[0].isalpha()):
+            return line
+    return None
+
+
+class ResumeProfile:
+    """Everything the matchers need from one resume, computed once.
+
+    Matching and cover-letter functions accept either a profile or raw text;
+    passing the profile keeps per-job work proportional to the job, not the
+    resume.
+    """
+
+    def __init__(self, resume_text):
+        self.text = resume_text or ""
+        self.lower = self.text.lower()
+        self.tokens = tokenize(self.text)
+        self.token_set = set(self.tokens)
+        self.lines = [line.strip() for line in self.text.split('\n') if line.strip()]
+        self.name = guess_name(self.lines)
+
+        # token -> start positions, for exact phrase lookups of any length
+        self.positions = {}
+        for pos, token in enumerate(self.tokens):
+            self.positions.setdefault(token, []).append(pos)
+
+        # token -> ids of the (bullet-stripped) lines containing it
+        self.bullet_lines = [line.lstrip("• ") for line in self.lines]
+        self.line_index = {}
+        for line_id, line in enumerate(self.bullet_lines):
+            for token in set(tokenize(line)):
+                self.line_index.setdefault(token, []).append(line_id)
+
+    @cached_property
+    def ngrams(self):
+        """All token n-grams up to NGRAM_SIZE."""
+        tokens = self.tokens
+        return {
+            tuple(tokens[i:i + n])
+            for n in range(1, NGRAM_SIZE + 1)
+            for i in range(len(tokens) - n + 1)
+        }
+
+    @cached_property
+    def keyword_hits(self):
+        """Taxonomy keywords (resume_parser lists) present in the resume."""
+        from resume_matcher.resume_parser import ALL_KEYWORDS
+        return get_matcher(sorted(ALL_KEYWORDS)).keywords_in(self.text)
+
+    @cached_property
+    def fingerprint(self):
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+    def contains_phrase(self, phrase):
+        """Whole-word, case-insensitive phrase test (same rule as KeywordMatcher)."""
+        tokens = tokenize(phrase)
+        if not tokens:
+            return False
+        if len(tokens) <= NGRAM_SIZE:
+            return tuple(tokens) in self.ngrams
+        length = len(tokens)
+        return any(self.tokens[pos:pos + length] == tokens for pos in self.positions.get(tokens[0], ()))
+
+
+def as_profile(resume):
+    return resume if isinstance(resume, ResumeProfile) else ResumeProfile(resume)
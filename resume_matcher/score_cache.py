@@ -0,0 +1,139 @@
+# ================================
+# resume_matcher/score_cache.py
+# ================================
+# Persistent memo of match scores. An entry is keyed by the resume's content
+# hash and the job's content hash and stamped with the scoring version, so a
+# new scrape only scores the jobs it added, and an edited resume or job is
+# scored afresh. Entries of another SCORING_VERSION (see match_resume; it is
+# derived from the scoring code) are never served and are dropped when the
+# cache is opened.
+#
+# Set JOBHUNT_SCORE_CACHE=0 to score everything every time.
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from optimization_utils import metrics
+
+DATA_DIR = os.environ.get("JOBHUNT_DATA_DIR", os.path.join(os.path.expanduser("~"), ".jobhunt"))
+DEFAULT_CACHE_PATH = os.path.join(DATA_DIR, "scores.sqlite3")
+DEFAULT_MAX_ENTRIES = 200000
+# Job hashes per SELECT; well under SQLite's bound parameter limit
+LOOKUP_CHUNK = 500
+# Eviction trims the table to this share of max_entries, so it is counted
+# once per that many new rows rather than on every put
+EVICT_LOW_WATER = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    resume_hash TEXT,
+    job_hash TEXT,
+    version TEXT,
+    result TEXT,
+    last_access REAL,
+    PRIMARY KEY (resume_hash, job_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_scores_last_access ON scores (last_access);
+"""
+
+
+class ScoreCache:
+    """(resume hash, job hash) -> the scored columns of a match row, in SQLite.
+
+    Holds at most max_entries pairs (about, when several processes share
+    the file); the least recently used go first.
+    """
+
+    def __init__(self, version, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.version = version
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            # Scores from other scoring logic would be wrong now
+            self._conn.execute("DELETE FROM scores WHERE version != ?", (version,))
+            # Upper bound on the rows, raised by every put; the table is only counted once it passes max_entries
+            self._rows = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def get_many(self, resume_hash, job_hashes):
+        """{job hash: scored columns} for the pairs in the cache."""
+        wanted = list(dict.fromkeys(job_hashes))
+        found = {}
+        with self._lock:
+            for start in range(0, len(wanted), LOOKUP_CHUNK):
+                chunk = wanted[start:start + LOOKUP_CHUNK]
+                found.update(self._conn.execute(
+                    f"SELECT job_hash, result FROM scores WHERE resume_hash = ? AND version = ? "
+                    f"AND job_hash IN ({', '.join('?' for _ in chunk)})",
+                    [resume_hash, self.version, *chunk],
+                ).fetchall())
+        if found:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "UPDATE scores SET last_access = ? WHERE resume_hash = ? AND job_hash = ?",
+                    [(time.time(), resume_hash, job_hash) for job_hash in found],
+                )
+        metrics.incr("cache.scores.hits", len(found))
+        metrics.incr("cache.scores.misses", len(wanted) - len(found))
+        return {job_hash: json.loads(result) for job_hash, result in found.items()}
+
+    def put_many(self, resume_hash, scored):
+        """Store {job hash: scored columns} for one resume."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?)",
+                [(resume_hash, job_hash, self.version, json.dumps(columns), now)
+                 for job_hash, columns in scored.items()],
+            )
+            # Replaced pairs are counted too, so this may overestimate
+            self._rows += len(scored)
+            if self._rows > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        # Caller holds the lock and transaction
+        rows = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        excess = rows - int(self.max_entries * EVICT_LOW_WATER) if rows > self.max_entries else 0
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM scores WHERE rowid IN (SELECT rowid FROM scores ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+            metrics.incr("cache.scores.evictions", excess)
+        self._rows = rows - excess
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM scores")
+            self._rows = 0
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_score_cache():
+    """Process-wide cache; None when JOBHUNT_SCORE_CACHE=0."""
+    global _default_cache
+    if os.environ.get("JOBHUNT_SCORE_CACHE", "1") == "0":
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            # Imported here: match_resume imports this module
+            from resume_matcher.match_resume import SCORING_VERSION
+
+            _default_cache = ScoreCache(SCORING_VERSION)
+        return _default_cache
@@ -0,0 +1,144 @@
+# ================================
+# resume_matcher/sparse_scoring.py
+# ================================
+import re
+import numpy as np
+from scipy import sparse
+
+from resume_matcher.keyword_matcher import PhraseIndex, tokenize
+
+
+def split_requirement(req):
+    # Same partial-match rule as match_resume.extract_strengths: split on commas or 'or'.
+    # Part of the scoring fingerprint (match_resume.SCORING_INPUTS): editing it drops memoised scores
+    return [part.strip() for part in re.split(r",| or ", req.lower()) if part.strip()]
+
+
+class JobRequirementIndex:
+    """Sparse encoding of the key requirements of many jobs.
+
+    job_reqs   (jobs x requirements)  - which requirement rows belong to which job
+    req_parts  (requirements x parts) - which phrase parts make up each requirement
+
+    A resume becomes one indicator vector over the part vocabulary, so every
+    job's ATS score comes out of two sparse products.
+    """
+
+    def __init__(self, key_reqs_per_job):
+        self.key_reqs = [list(reqs) for reqs in key_reqs_per_job]
+
+        part_ids = {}
+        req_rows, req_cols = [], []
+        job_rows, job_cols = [], []
+        req_offsets = [0]
+        req_id = 0
+        for job_id, reqs in enumerate(self.key_reqs):
+            for req in reqs:
+                for part in split_requirement(req):
+                    req_rows.append(req_id)
+                    req_cols.append(part_ids.setdefault(part, len(part_ids)))
+                job_rows.append(job_id)
+                job_cols.append(req_id)
+                req_id += 1
+            req_offsets.append(req_id)
+
+        self.parts = list(part_ids)
+        self.part_ids = part_ids
+        self.req_parts = sparse.csr_matrix(
+            (np.ones(len(req_rows), dtype=np.float32), (req_rows, req_cols)),
+            shape=(req_id, len(part_ids)),
+        )
+        self.job_reqs = sparse.csr_matrix(
+            (np.ones(len(job_rows), dtype=np.float32), (job_rows, job_cols)),
+            shape=(len(self.key_reqs), req_id),
+        )
+        self.req_offsets = req_offsets
+        self.req_counts = np.diff(req_offsets)
+        self.matcher = PhraseIndex(self.parts)
+
+    def __len__(self):
+        return len(self.key_reqs)
+
+    def resume_part_ids(self, resume):
+        """Part ids present in a resume (text or ResumeProfile, whose tokens are reused)."""
+        tokens = resume.tokens if hasattr(resume, "tokens") else tokenize(resume)
+        return list({self.part_ids[part] for _, part in self.matcher.match_tokens(tokens)})
+
+    def resume_vector(self, resume):
+        """Indicator vector over the part vocabulary for one resume."""
+        vector = np.zeros(len(self.parts), dtype=np.float32)
+        vector[self.resume_part_ids(resume)] = 1.0
+        return vector
+
+    def resume_matrix(self, resumes):
+        """Sparse (resumes x parts) indicator matrix; each resume is scanned once."""
+        rows, cols = [], []
+        n_resumes = 0
+        for row, resume in enumerate(resumes):
+            part_ids = self.resume_part_ids(resume)
+            rows.extend([row] * len(part_ids))
+            cols.extend(part_ids)
+            n_resumes = row + 1
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(n_resumes, len(self.parts)),
+        )
+
+    def score(self, resume):
+        """Return (ats_scores, requirement_hit_mask) for one resume against every job."""
+        req_hits = self.req_parts.dot(self.resume_vector(resume)) > 0
+        strengths = self.job_reqs.dot(req_hits.astype(np.float32))
+        scores = np.zeros(len(self.key_reqs), dtype=np.float64)
+        nonzero = self.req_counts > 0
+        scores[nonzero] = strengths[nonzero] / self.req_counts[nonzero] * 100
+        return scores, req_hits
+
+    def strengths_for(self, job_id, req_hits):
+        """Requirement strings of one job that the resume covers."""
+        start = self.req_offsets[job_id]
+        return [req.strip() for i, req in enumerate(self.key_reqs[job_id]) if req_hits[start + i]]
+
+
+def top_k_indices(scores, top_k=None):
+    """Indices of the best scores, highest first; ties keep job order."""
+    order = np.argsort(-scores, kind="stable")
+    return order if top_k is None else order[:top_k]
+
+
+def iter_score_blocks(index, resume_matrix, chunk_size=128):
+    """Yield (first_row, scores) blocks of the resumes x jobs ATS score matrix.
+
+    Only chunk_size resumes are expanded against the requirement rows at a
+    time, which bounds the memory of the intermediate products.
+    """
+    part_reqs = index.req_parts.T.tocsr()
+    req_jobs = index.job_reqs.T.tocsr()
+    counts = np.maximum(index.req_counts, 1).astype(np.float32)
+    for start in range(0, resume_matrix.shape[0], chunk_size):
+        req_hits = resume_matrix[start:start + chunk_size].dot(part_reqs)
+        req_hits.data = (req_hits.data > 0).astype(np.float32)
+        strengths = req_hits.dot(req_jobs).toarray()
+        yield start, strengths / counts * 100
+
+
+def score_matrix(index, resumes, chunk_size=128):
+    """Dense (resumes x jobs) float32 matrix of ATS scores."""
+    resume_matrix = index.resume_matrix(resumes)
+    scores = np.zeros((resume_matrix.shape[0], len(index)), dtype=np.float32)
+    for start, block in iter_score_blocks(index, resume_matrix, chunk_size):
+        scores[start:start + block.shape[0]] = block
+    return scores
+
+
+def top_k_per_row(scores, top_k):
+    """Column indices of the top_k scores of every row, best first; ties keep job order."""
+    top_k = min(top_k, scores.shape[1])
+    if top_k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.intp)
+    # argpartition only finds the k-th best score; which of the jobs tied with it
+    # it keeps is arbitrary, so take every job at or above it and order by index
+    kth = -np.partition(-scores, top_k - 1, axis=1)[:, top_k - 1]
+    rows, cols = np.nonzero(scores >= kth[:, None])
+    order = np.lexsort((cols, -scores[rows, cols], rows))
+    starts = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=scores.shape[0]))[:-1]))
+    return cols[order][starts[:, None] + np.arange(top_k)]